@@ -0,0 +1,72 @@
+"""
+bench_concat.py
+
+Time spent concatenating, and peak traced memory, when accumulating 300
+synthetic schools x 50 rows by growing a frame with pd.concat on every
+chunk (the old download_utils pattern) versus collecting the chunks and
+concatenating once (download_utils._concat)
+
+usage: python -m benchmarks.bench_concat
+"""
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from collegebaseball import download_utils
+
+
+_SCHOOLS = 300
+_ROWS = 50
+_COLS = 60
+
+
+def _chunk(school_id):
+    rng = np.random.default_rng(school_id)
+    df = pd.DataFrame(rng.integers(0, 100, (_ROWS, _COLS)).astype('int16'),
+                      columns=[f'''c{i}''' for i in range(_COLS)])
+    df['name'] = pd.array([f'''player {i}''' for i in range(_ROWS)],
+                          dtype='string')
+    df['school_id'] = school_id
+    return df
+
+
+def _grow(chunks):
+    res = pd.DataFrame()
+    for chunk in chunks:
+        res = pd.concat([res, chunk])
+    return res
+
+
+def _collect(chunks):
+    frames = []
+    for chunk in chunks:
+        frames.append(chunk)
+    return download_utils._concat(frames)
+
+
+def _measure(fn):
+    chunks = [_chunk(i) for i in range(_SCHOOLS)]
+    start = time.perf_counter()
+    res = fn(chunks)
+    elapsed = time.perf_counter() - start
+    del chunks, res
+    # chunks are produced one at a time during a real download
+    tracemalloc.start()
+    res = fn(_chunk(i) for i in range(_SCHOOLS))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return res, elapsed, peak
+
+
+def main():
+    grown, grow_time, grow_peak = _measure(_grow)
+    collected, collect_time, collect_peak = _measure(_collect)
+    pd.testing.assert_frame_equal(grown, collected)
+    size = collected.memory_usage(deep=True).sum()
+    print(f'''output frame: {size / 2**20:.1f} MiB''')
+    print(f'''concat per chunk: {grow_time:.3f}s, peak {grow_peak / 2**20:.1f} MiB''')
+    print(f'''concat once:      {collect_time:.3f}s, peak {collect_peak / 2**20:.1f} MiB''')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+bench_game_logs.py
+
+Times the game-by-game parsing behind ncaa_player_game_logs and
+ncaa_team_game_logs on the saved pages in tests/fixtures/html: the
+per-cell lxml loop each scraper used to carry against the shared
+ncaa_parser.game_log_cells reader. The raw game log frames built from
+both are checked to be identical before timing
+
+Both readers walk the same lxml tree, so the time to build it (the tree
+build line) is spent by either one, and old time / tree build is the
+most any reader on that tree could gain over the old loop
+
+usage: python -m benchmarks.bench_game_logs
+"""
+import os
+import timeit
+import pandas as pd
+from collegebaseball import ncaa_parser, ncaa_utils, schemas
+from collegebaseball import ncaa_scraper as ncaa
+
+
+_FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'tests',
+                         'fixtures', 'html')
+_NUMBER = 20
+_REPEAT = 7
+
+
+def _old_game_log_frame(text, schema, season_id, school_id, player_id=None):
+    """
+    the game log loop ncaa_player_game_logs and ncaa_team_game_logs each
+     ran before game_log_cells
+    """
+    game_rows = ncaa_parser.game_log_rows(text)
+    buffer = schema.buffer(len(game_rows))
+    prev_game_id = 0
+    for val in game_rows:
+        row = []
+        for i in val:
+            if ncaa_parser.is_tag(i):
+                a = ncaa_parser.first_link(i)
+                if a is not None:
+                    last = ncaa_parser.links(i)[-1]
+                    if 'box_score' in last.get('href'):
+                        score = ncaa_parser.element_string(a).strip()
+                        game_id = a.get('href').split('/')[-2]
+                    elif 'team' in last.get('href'):
+                        opponent_id = last.get('href').split('/')[2]
+                        opponent_name, field = ncaa_utils._parse_opponent_info(
+                            ncaa_parser.element_text(last).strip())
+                    elif 'game/index' in last.get('href'):
+                        game_id = last.get('href').split(
+                            '/')[-1].split('?')[0]
+                        score = ncaa_parser.element_string(a).strip()
+                    else:
+                        opponent_name, field = ncaa_utils._parse_opponent_info(
+                            ncaa_parser.element_text(i).strip())
+                        opponent_id = '-'
+                elif i.get('data-order') is not None:
+                    row.append(i.get('data-order'))
+                elif '/' in ncaa_parser.element_string(i):
+                    date = ncaa_parser.element_string(i)
+                elif ncaa_parser.element_text(i).strip() == '-':
+                    score = '-'
+                    game_id = '-'
+                else:
+                    opponent_name, field = ncaa_utils._parse_opponent_info(
+                        ncaa_parser.element_text(i).strip())
+                    opponent_id = '-'
+        runs_scored, runs_allowed, run_diff, result, ip, extras = ncaa_utils._parse_score(
+            score)
+        if buffer.fits(row) and ((game_id != prev_game_id) or (result == 'cancelled')):
+            prev_game_id = game_id
+            meta = (date, field, season_id, opponent_id, opponent_name, ip,
+                    extras, runs_scored, runs_allowed, run_diff, result,
+                    game_id, school_id)
+            if player_id is not None:
+                meta += (player_id,)
+            buffer.append(row, meta)
+    return pd.DataFrame(buffer.columns())
+
+
+def _old_game_log_cells(text):
+    """
+    the reading part of the old loop alone: every cell of every game row
+    """
+    res = []
+    for val in ncaa_parser.game_log_rows(text):
+        row = []
+        for i in val:
+            if ncaa_parser.is_tag(i):
+                a = ncaa_parser.first_link(i)
+                if a is not None:
+                    last = ncaa_parser.links(i)[-1]
+                    row.append((last.get('href'), a.get('href'),
+                                ncaa_parser.element_string(a),
+                                ncaa_parser.element_text(last)))
+                elif i.get('data-order') is not None:
+                    row.append(i.get('data-order'))
+                else:
+                    row.append((ncaa_parser.element_string(i),
+                                ncaa_parser.element_text(i)))
+        res.append(row)
+    return res
+
+
+_CASES = [
+    ('player game logs', 'player_game_logs_batting.html',
+     ('player_game_logs', 'batting', 2022), 2486499),
+    ('team game logs', 'team_game_logs_pitching.html',
+     ('team_game_logs', 'pitching', 2021), None),
+]
+
+
+def _best(fn):
+    return min(timeit.repeat(fn, number=_NUMBER, repeat=_REPEAT)) / _NUMBER
+
+
+def main():
+    for label, fixture, key, player_id in _CASES:
+        with open(os.path.join(_FIXTURES, fixture)) as f:
+            text = f.read()
+        schema = schemas.get_schema(*key)
+        args = (schema, 15860, 167, player_id)
+        pd.testing.assert_frame_equal(_old_game_log_frame(text, *args),
+                                      ncaa._game_log_frame(text, *args))
+        tree = _best(lambda: ncaa_parser.parse_document(text))
+        old_time = _best(lambda: _old_game_log_cells(text))
+        print(f'''{label:<17} {'tree build':<14} {tree * 1000:6.2f} ms, '''
+              f'''readers on the tree gain at most '''
+              f'''{old_time / tree:.1f}x on parse''')
+        timings = [
+            ('parse', old_time,
+             _best(lambda: ncaa_parser.game_log_cells(text))),
+            ('parse + frame', _best(lambda: _old_game_log_frame(text, *args)),
+             _best(lambda: ncaa._game_log_frame(text, *args)))]
+        for stage, old_time, new_time in timings:
+            print(f'''{label:<17} {stage:<14} per-cell lxml: '''
+                  f'''{old_time * 1000:6.2f} ms  game_log_cells: '''
+                  f'''{new_time * 1000:5.2f} ms  '''
+                  f'''({old_time / new_time:.1f}x)''')
+
+
+if __name__ == '__main__':
+    main()
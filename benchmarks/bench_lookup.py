@@ -0,0 +1,80 @@
+"""
+bench_lookup.py
+
+Measures lookup_school throughput with a cold table read on every call
+(the behaviour before guts cached its tables) and with the guts cache,
+then the throughput of a mixed workload of season, school and player
+lookups served by lookup.LookupIndex
+
+usage: python -m benchmarks.bench_lookup
+"""
+import random
+import timeit
+from collegebaseball import guts, lookup
+
+
+_NUMBER = 2000
+_SCHOOLS = ['Cornell', 'Texas', 'Vanderbilt', 'Lincoln Memorial']
+_MIXED = 1_000_000
+
+
+def _lookup_all():
+    for school in _SCHOOLS:
+        lookup.lookup_school(school)
+
+
+def _lookup_all_uncached():
+    for school in _SCHOOLS:
+        guts.clear_cache()
+        lookup.lookup_school(school)
+
+
+def _mixed_workload(n):
+    """
+    n (function, argument tuple) pairs drawn from the bundled tables
+    """
+    rng = random.Random(0)
+    schools = guts.get_schools_table()
+    rosters = guts.get_rosters_table().sample(5000, random_state=0)
+    seasons = guts.get_seasons_table()
+    players = guts.get_players_history_table().sample(5000, random_state=0)
+    choices = [
+        (lookup.lookup_school, [(x,) for x in schools['ncaa_name']]),
+        (lookup.lookup_school_reverse, [(int(x),) for x in
+                                        schools['school_id']]),
+        (lookup.lookup_season_ids, [(int(x),) for x in seasons['season']]),
+        (lookup.lookup_season_id_reverse, [(int(x),) for x in
+                                           seasons['season_id']]),
+        (lookup.lookup_seasons_played, [(int(x),) for x in
+                                        players['stats_player_seq']]),
+        (lookup.lookup_player_reverse, [
+            (int(seq), int(season)) for seq, season in
+            zip(rosters['stats_player_seq'], rosters['season'])])]
+    res = []
+    for _ in range(n):
+        fn, args = rng.choice(choices)
+        res.append((fn, rng.choice(args)))
+    return res
+
+
+def main():
+    calls = _NUMBER * len(_SCHOOLS)
+    uncached = timeit.timeit(_lookup_all_uncached, number=_NUMBER // 10)
+    cached = timeit.timeit(_lookup_all, number=_NUMBER)
+    print(f'''uncached: {calls / 10 / uncached:,.0f} lookup_school calls/sec''')
+    print(f'''cached:   {calls / cached:,.0f} lookup_school calls/sec''')
+
+    workload = _mixed_workload(_MIXED)
+    for fn, args in workload[:1000]:
+        fn(*args)  # build the indexes outside the timed loop
+
+    def run():
+        for fn, args in workload:
+            fn(*args)
+
+    elapsed = timeit.timeit(run, number=1)
+    print(f'''indexed:  {_MIXED / elapsed:,.0f} mixed lookups/sec''')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+bench_metrics.py
+
+Times metrics.add_batting_metrics on a synthetic 500k-row batting frame
+and metrics.add_pitching_metrics on a 150k-row pitching frame (roughly
+every pitcher in every division and season), against the per-row linear
+weights lookups they replaced (extrapolated from a small sample, since
+the full row-wise runs take far too long)
+
+usage: python -m benchmarks.bench_metrics
+"""
+import time
+import numpy as np
+import pandas as pd
+from collegebaseball import metrics
+
+
+_ROWS = 500_000
+_PITCHING_ROWS = 150_000
+_SAMPLE = 2_000
+
+
+def _synthetic_batting(n, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {'name': ['player'] * n}
+    for col in ['BB', 'SF', 'SH', 'HBP', 'K']:
+        data[col] = rng.integers(0, 30, n).astype('int16')
+    data['AB'] = rng.integers(1, 250, n).astype('int16')
+    data['H'] = (data['AB'] // 3).astype('int16')
+    data['2B'] = (data['H'] // 5).astype('int16')
+    data['3B'] = (data['H'] // 20).astype('int16')
+    data['HR'] = (data['H'] // 8).astype('int16')
+    data['IBB'] = (data['BB'] // 10).astype('int16')
+    data['season'] = rng.integers(2013, 2024, n).astype('int16')
+    data['division'] = rng.integers(1, 4, n).astype('int8')
+    return pd.DataFrame(data)
+
+
+def _synthetic_pitching(n, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {'name': ['player'] * n}
+    for col in ['H', 'HR-A', '3B-A', '2B-A', 'BB', 'IBB', 'HB', 'SFA', 'SHA',
+                'SO', 'pitches', 'App', 'GO', 'FO']:
+        data[col] = rng.integers(0, 30, n).astype('int16')
+    data['BF'] = rng.integers(0, 300, n).astype('int16')
+    data['IP'] = np.round(rng.integers(0, 90, n)
+                          + rng.integers(0, 3, n) / 10, 4)
+    data['season'] = rng.integers(2013, 2024, n).astype('int16')
+    data['division'] = rng.integers(1, 4, n).astype('int8')
+    return pd.DataFrame(data)
+
+
+def _row_fip(row):
+    if row['IP-adj'] > 0:
+        return metrics.calculate_fip_manual(
+            row['HR-A'], row['BB'], row['HB'], row['SO'], row['IP-adj'],
+            row['season'], row['division'])
+    return 0.00
+
+
+def _row_woba(row):
+    return metrics.calculate_woba_manual(
+        row['PA'], row['BB'], row['HBP'], row['1B'], row['2B'], row['3B'],
+        row['HR'], row['season'], row['division'])
+
+
+def main():
+    df = _synthetic_batting(_ROWS)
+    start = time.perf_counter()
+    metrics.add_batting_metrics(df)
+    vectorized = time.perf_counter() - start
+
+    sample = metrics.add_batting_metrics(_synthetic_batting(_SAMPLE))
+    start = time.perf_counter()
+    sample.apply(_row_woba, axis=1)
+    row_wise = (time.perf_counter() - start) * (_ROWS / _SAMPLE)
+
+    print(f'''vectorized add_batting_metrics, {_ROWS:,} rows: {vectorized:.2f}s''')
+    print(f'''row-wise wOBA alone, extrapolated to {_ROWS:,} rows: {row_wise:.1f}s''')
+
+    df = _synthetic_pitching(_PITCHING_ROWS)
+    start = time.perf_counter()
+    metrics.add_pitching_metrics(df)
+    vectorized = time.perf_counter() - start
+
+    sample = metrics.add_pitching_metrics(_synthetic_pitching(_SAMPLE))
+    start = time.perf_counter()
+    sample.apply(_row_fip, axis=1)
+    row_wise = (time.perf_counter() - start) * (_PITCHING_ROWS / _SAMPLE)
+
+    print(f'''vectorized add_pitching_metrics, {_PITCHING_ROWS:,} rows: {vectorized:.2f}s''')
+    print(f'''row-wise FIP alone, extrapolated to {_PITCHING_ROWS:,} rows: {row_wise:.1f}s''')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+bench_parser.py
+
+Measures table extraction over the saved stats.ncaa.org pages in
+tests/fixtures/html: the BeautifulSoup traversal ncaa_scraper used to do
+against ncaa_parser's lxml extraction. Both produce the same values,
+which is checked before timing
+
+usage: python -m benchmarks.bench_parser
+"""
+import os
+import timeit
+from bs4 import BeautifulSoup, Tag
+from collegebaseball import ncaa_parser
+
+
+_FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'tests',
+                         'fixtures', 'html')
+_NUMBER = 50
+
+
+def _old_stat_grid(text, section, player_links, last):
+    soup = BeautifulSoup(text, features='lxml')
+    if len(soup.find_all(name='table', id='stat_grid')) < 1:
+        return None
+    if last:
+        table = soup.find_all(name='table', id='stat_grid')[-1]
+    else:
+        table = soup.find(name='table', id='stat_grid')
+    headers = [x for x in table.thead.tr.stripped_strings]
+    rows = []
+    for i in getattr(table, section).find_all('tr'):
+        row = []
+        for j in i.find_all('td'):
+            if 'data-order' in j.attrs:
+                row.append(j.attrs['data-order'])
+            else:
+                if player_links and j.find('a') is not None:
+                    if 'href' in j.a.attrs:
+                        row.append(
+                            int(j.a.attrs['href'].split('&')[-1].split('=')[-1]))
+                    else:
+                        row.append('-')
+                row.append(j.string)
+        rows.append(row)
+    return headers, rows
+
+
+def _old_career_table(text):
+    soup = BeautifulSoup(text, features='lxml')
+    table = soup.find_all('table')[2]
+    headers = []
+    for val in table.find_all('th'):
+        headers.append(val.string.strip())
+    rows = []
+    row = []
+    for val in table.find_all('td'):
+        if 'data-order' in val.attrs:
+            row.append(val['data-order'])
+        elif val.a is not None:
+            row.append(val.a.attrs['href'].split('/')[2])
+        elif val.text.strip() != 'Career' and 'width' not in val.attrs:
+            if row != []:
+                rows.append(row)
+            row = []
+            row.append(val.text.strip())
+        else:
+            if val.text.strip() != 'Career':
+                row.append(val.text.strip())
+    return headers, rows, row
+
+
+def _has_no_id(tag):
+    return tag.name == 'tr' and not tag.has_attr('id')
+
+
+def _old_game_log(text):
+    """
+    the raw values the game log scrapers read off each cell
+    """
+    soup = BeautifulSoup(text, features='lxml')
+    table = soup.find_all('table')[3]
+    res = []
+    for val in table.find_all(_has_no_id)[3:]:
+        row = []
+        for i in val.children:
+            if isinstance(i, Tag):
+                if i.a:
+                    last = i.find_all('a')[-1]
+                    row.append((last.get('href'), i.a.string, last.text))
+                elif 'data-order' in i.attrs:
+                    row.append(i.get('data-order'))
+                else:
+                    row.append((i.string, i.text))
+        res.append(row)
+    return res
+
+
+def _new_game_log(text):
+    res = []
+    for val in ncaa_parser.game_log_rows(text):
+        row = []
+        for i in val:
+            if ncaa_parser.is_tag(i):
+                a = ncaa_parser.first_link(i)
+                if a is not None:
+                    last = ncaa_parser.links(i)[-1]
+                    row.append((last.get('href'),
+                                ncaa_parser.element_string(a),
+                                ncaa_parser.element_text(last)))
+                elif i.get('data-order') is not None:
+                    row.append(i.get('data-order'))
+                else:
+                    row.append((ncaa_parser.element_string(i),
+                                ncaa_parser.element_text(i)))
+        res.append(row)
+    return res
+
+
+_CASES = [
+    ('team stats', 'team_stats_batting.html',
+     lambda t: _old_stat_grid(t, 'tbody', True, True),
+     lambda t: ncaa_parser.stat_grid(t, 'tbody', player_links=True)),
+    ('team totals', 'team_stats_pitching.html',
+     lambda t: _old_stat_grid(t, 'tfoot', False, False),
+     lambda t: ncaa_parser.stat_grid(t, 'tfoot', last=False)),
+    ('career', 'career_batting.html',
+     _old_career_table, ncaa_parser.career_table),
+    ('player game logs', 'player_game_logs_batting.html',
+     _old_game_log, _new_game_log),
+    ('team game logs', 'team_game_logs_pitching.html',
+     _old_game_log, _new_game_log),
+]
+
+
+def main():
+    for label, fixture, old, new in _CASES:
+        with open(os.path.join(_FIXTURES, fixture)) as f:
+            text = f.read()
+        assert old(text) == new(text), label
+        old_time = timeit.timeit(lambda: old(text), number=_NUMBER) / _NUMBER
+        new_time = timeit.timeit(lambda: new(text), number=_NUMBER) / _NUMBER
+        print(f'''{label:<17} BeautifulSoup: {old_time * 1000:6.2f} ms  '''
+              f'''lxml: {new_time * 1000:5.2f} ms  '''
+              f'''({old_time / new_time:.1f}x)''')
+
+
+if __name__ == '__main__':
+    main()
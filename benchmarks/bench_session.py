@@ -0,0 +1,71 @@
+"""
+bench_session.py
+
+Measures request throughput against a local stand-in HTTP server for
+a fresh requests.Session per call (the old ncaa_scraper behaviour)
+versus the shared keep-alive session, serially and from a thread pool
+
+usage: python -m benchmarks.bench_session
+"""
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+from requests import Session
+from collegebaseball import ncaa_scraper as ncaa
+
+
+_REQUESTS = 500
+_THREADS = 8
+_BODY = b'<table id="stat_grid"></table>' * 500
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(_BODY)))
+        self.end_headers()
+        self.wfile.write(_BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def _fresh_session_get(url):
+    with Session() as s:
+        return s.get(url, headers=ncaa._HEADERS)
+
+
+def _run(fn, url, threads):
+    start = time.perf_counter()
+    if threads == 1:
+        for _ in range(_REQUESTS):
+            fn(url)
+    else:
+        with ThreadPoolExecutor(threads) as pool:
+            list(pool.map(fn, [url] * _REQUESTS))
+    return _REQUESTS / (time.perf_counter() - start)
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'''http://127.0.0.1:{server.server_address[1]}/team/167/stats'''
+    ncaa.set_session(ncaa.create_session(pool_size=_THREADS))
+    try:
+        for threads in [1, _THREADS]:
+            fresh = _run(_fresh_session_get, url, threads)
+            shared = _run(ncaa._get, url, threads)
+            print(f'''{threads} thread(s): fresh session {fresh:,.0f} req/s, '''
+                  f'''shared session {shared:,.0f} req/s''')
+    finally:
+        server.shutdown()
+        server.server_close()
+        ncaa.set_session(None)
+
+
+if __name__ == '__main__':
+    main()
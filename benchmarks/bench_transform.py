@@ -0,0 +1,175 @@
+"""
+bench_transform.py
+
+Times ncaa_utils._transform_stats on a synthetic 100k-row raw game log
+frame (strings as parsed off the page, with dashes, blanks and thousands
+separators) against the replace-everything implementation it replaced,
+with the peak memory traced during each
+
+usage: python -m benchmarks.bench_transform
+"""
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from collegebaseball import ncaa_utils
+
+
+_ROWS = 100_000
+_STATS = ['R', 'AB', 'H', '2B', '3B', 'TB', 'HR', 'RBI', 'BB', 'HBP', 'SF',
+          'SH', 'K', 'DP', 'CS', 'Picked', 'SB', 'IBB', 'GDP', 'RBI2out']
+
+
+def _raw_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {}
+    for col in _STATS:
+        values = rng.integers(0, 10, n).astype(str).astype(object)
+        values[rng.random(n) < 0.1] = '-'
+        values[rng.random(n) < 0.05] = ''
+        data[col] = values
+    data['Pitches'] = [f'''{x:,}''' for x in rng.integers(0, 2000, n)]
+    data['IP'] = [f'''{x}.{y}''' for x, y in zip(rng.integers(0, 9, n),
+                                                   rng.integers(0, 3, n))]
+    data['Player'] = [f'''Last{i % 997}, First{i % 13}''' for i in range(n)]
+    data['date'] = [f'''{m:02d}/{d:02d}/2022''' for m, d in
+                    zip(rng.integers(2, 7, n), rng.integers(1, 29, n))]
+    data['field'] = rng.choice(['home', 'away', 'neutral'], n).astype(object)
+    data['season_id'] = ['15860'] * n
+    data['opponent_id'] = rng.integers(100, 30000, n).astype(str).astype(object)
+    data['opponent_name'] = rng.choice(['Texas', 'Cornell', 'Emory'], n).astype(object)
+    data['innings_played'] = ['9'] * n
+    data['extras'] = ['False'] * n
+    data['runs_scored'] = rng.integers(0, 15, n)
+    data['runs_allowed'] = rng.integers(0, 15, n)
+    data['result'] = rng.choice(['win', 'loss'], n).astype(object)
+    data['game_id'] = rng.integers(10**6, 5 * 10**6, n).astype(str).astype(object)
+    data['school_id'] = [167] * n
+    data['stats_player_seq'] = rng.integers(2 * 10**6, 3 * 10**6, n)
+    data['season'] = [2022] * n
+    data['division'] = [1] * n
+    return pd.DataFrame(data)
+
+
+def _old_eliminate_dashes(df):
+    """
+    A helper function to replace the weird dashes the NCAA uses with 0.00
+
+    Args:
+        df (DataFrame):
+    Returns:
+        Dataframe with dashes replaced by 0.00 (not a copy!)
+    """
+    formats = ['None', '<NA>', '', ' ', '-', '--', '---']
+    for i in formats:
+        df.replace(i, 0.00, inplace=True)
+    return df
+
+
+def _old_transform_stats(df):
+    """
+    A helper function to transform raw data obtained with get_career_stats
+    Args:
+        df: DataFrame output from get_career_stats function
+    Returns:
+        DataFrame
+    """
+    df = _old_eliminate_dashes(df)
+    cols = df.columns
+    if 'Player' in cols:
+        df.rename(columns={'Player': 'name'}, inplace=True)
+        cols = df.columns
+    if 'name' in cols:
+        df.loc[:, 'name'] = df.loc[:, 'name'].apply(ncaa_utils._format_names)
+        df.loc[:, 'name'] = df.loc[:, 'name'].astype('string')
+    if 'Team' in cols:
+        df = df.rename(columns={'Team': 'school_id'}, inplace=False)
+        cols = df.columns
+    # need to do this after name formatting, which relies on commas
+    df = df.replace(',', '', regex=True)
+    df = df.fillna(value=0.00, inplace=False)
+    # we're going to calculate OBP/BA/SLG ourselves
+    # G and RBI2out are unreliable
+    drops = ['OBPct', 'BA', 'SlgPct', 'RBI2out', 'G']
+    for i in drops:
+        if i in cols:
+            df = df.drop(columns=[i], inplace=False)
+    data_types = {
+        'int8': ['division', 'innings_played'],
+        'int32': ['opponent_id', 'season_id', 'school_id', 'game_id'],
+        'int16': ['runs_scored', 'runs_allowed', 'run_difference',
+                  'season', 'GP', 'GS', 'BB', 'Jersey', 'DP', 'H', 'DP' 'R',
+                  'ER', 'SO', 'TB', '2B', '3B', 'HR', 'RBI', 'R', 'AB', 'HBP',
+                  'SF', 'K', 'SH', 'Picked', 'SB', 'IBB', 'CS', 'OPP DP',
+                  'SHO', 'BF', 'P-OAB', '3B-A', '2B-A', 'Bk', 'HR-A', 'WP',
+                  'IBB', 'Inh Run', 'Inh Run Score', 'SHA', 'SFA', 'GO',
+                  'FO', 'W', 'L', 'HB', 'SV', 'KL', 'pickoffs', 'OrdAppeared',
+                  'App', 'GDP', 'PO', 'A', 'TC', 'E', 'CI', 'PB',
+                  'SBA', 'CSB', 'IDP', 'TP'],
+        'bool': ['extras'],
+        'float': ['ERA', 'IP'],
+        'string': ['Yr', 'Pos', 'date', 'Year', 'school', 'opponent_name', 'school_name']
+    }
+    for i in data_types.keys():
+        for j in data_types[i]:
+            if j in cols:
+                df[j] = df[j].astype(i)
+    # keeping as 64 byte to leave space for new potential player uuids
+    if 'stats_player_seq' in cols:
+        df.loc[:, 'stats_player_seq'] = df.stats_player_seq.astype('string')
+        df.loc[:, 'stats_player_seq'] = df.stats_player_seq.str.replace(
+            r'\D+', '')
+        df.loc[:, 'stats_player_seq'] = df.stats_player_seq.astype('int64')
+    if 'date' in cols:
+        df.loc[:, 'date'] = df.loc[:, 'date'].astype('string')
+        df.loc[:, 'season'] = df.loc[:, 'date'].str[-4:]
+        df.loc[:, 'season'] = df.loc[:, 'season'].astype('int32')
+    if 'Year' in cols:
+        df.loc[:, 'Year'] = df.loc[:, 'Year'].astype('string')
+        df.loc[:, 'season'] = df.loc[:, 'Year'].str[:4]
+        df.loc[:, 'season'] = df.loc[:, 'season'].astype('int32')
+        df.drop(columns=['Year'], inplace=True)
+    if 'Pos' in cols:
+        df = df.rename(columns={'Pos': 'pos'}, inplace=False)
+        cols = df.columns
+    if 'Pitches' in cols:
+        df = df.rename(columns={'Pitches': 'pitches'}, inplace=False)
+        df.loc[:, 'pitches'] = df.loc[:, 'pitches'].astype('string')
+        df.loc[:, 'pitches'] = df.loc[:, 'pitches'].astype('float')
+        df.loc[:, 'pitches'] = df.loc[:, 'pitches'].astype('int32')
+    if 'ERA' in cols:
+        df.loc[:, 'ERA'] = df.loc[:, 'ERA'].round(4)
+    if 'IP' in cols:
+        df.loc[:, 'IP'] = df.loc[:, 'IP'].round(4)
+    # drops duplicated columns (stats.ncaa.org sometimes has this issue)
+    df = df.loc[:, ~df.columns.duplicated()]
+    return df
+
+
+def _measure(fn, df):
+    """
+    wall time of an untraced run, then the peak traced memory of another
+    """
+    start = time.perf_counter()
+    fn(df.copy())
+    elapsed = time.perf_counter() - start
+    raw = df.copy()
+    tracemalloc.start()
+    fn(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main():
+    df = _raw_frame(_ROWS)
+    raw = df.memory_usage(deep=True).sum() / 2**20
+    print(f'''{_ROWS:,} raw rows ({raw:.0f} MiB)''')
+    for label, fn in [('replace-everything', _old_transform_stats),
+                      ('columnar', ncaa_utils._transform_stats)]:
+        elapsed, peak = _measure(fn, df)
+        print(f'''{label:<18} {elapsed:6.2f}s  peak {peak:6.0f} MiB''')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""
+test_stages.py
+
+pytest-benchmark suite of every scraper stage, run offline against the
+recorded pages in tests/fixtures/html (a replay.Cassette). Benchmarks are
+grouped by stage so a regression shows up in the stage that caused it:
+
+    parse      page text -> cells (ncaa_parser, read_html, BeautifulSoup)
+    frame      cells -> raw DataFrame, as the scrapers build it
+    transform  ncaa_utils._transform_stats
+    metrics    metrics.add_batting_metrics / add_pitching_metrics
+    scraper    the public function end to end, request answered from disk
+
+usage:
+    python -m pytest benchmarks/test_stages.py --benchmark-autosave
+    python -m pytest benchmarks/test_stages.py --benchmark-compare \
+        --benchmark-compare-fail=min:10%
+"""
+import os
+import pandas as pd
+import pytest
+from collegebaseball import boydsworld_scraper, metrics, ncaa_parser
+from collegebaseball import ncaa_utils, replay, schemas
+from collegebaseball import ncaa_scraper as ncaa
+
+pytest.importorskip('pytest_benchmark')
+
+
+_FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'tests',
+                         'fixtures', 'html')
+_CASSETTE = replay.Cassette(_FIXTURES)
+_ROUNDS = 20
+
+# recorded file -> (scraper, args)
+_STATS = {'team_stats_batting.html': (167, 2022, 'batting'),
+          'team_stats_pitching.html': (167, 2022, 'pitching')}
+_GAME_LOGS = {
+    'player_game_logs_batting.html': (('player_game_logs', 'batting', 2022),
+                                      2347964),
+    'team_game_logs_pitching.html': (('team_game_logs', 'pitching', 2021),
+                                     None)}
+_SCRAPERS = [
+    ('stats', ncaa.ncaa_team_stats, (167, 2022, 'batting')),
+    ('totals', ncaa.ncaa_team_totals, (167, 2022, 'pitching')),
+    ('career', ncaa.ncaa_career_stats, (1416690, 'batting')),
+    ('player_game_logs', ncaa.ncaa_player_game_logs,
+     (2347964, 2022, 'batting')),
+    ('team_game_logs', ncaa.ncaa_team_game_logs, (167, 2021, 'pitching')),
+    ('roster', ncaa.ncaa_team_season_roster, (167, 2022)),
+    ('boydsworld', boydsworld_scraper.boydsworld_team_results,
+     ('Cornell', 2019))]
+
+
+def _text(name):
+    entry = [e for e in _CASSETTE.entries() if e['file'] == name][0]
+    return _CASSETTE.body(entry).decode(entry['encoding'])
+
+
+def _stats_frame(name):
+    """
+    the raw player frame _team_stats_frame hands to _transform_stats
+    """
+    season, variant = _STATS[name][1:]
+    page = ncaa_parser.parse_document(_text(name))
+    headers, rows = ncaa_parser.stat_grid(page, 'tbody', player_links=True)
+    headers.insert(headers.index('Player'), 'stats_player_seq')
+    if season == 2022 and variant == 'batting':
+        headers.remove('RBI2out')
+    rows = [row[:-1] if len(row) > len(headers) else row for row in rows]
+    df = pd.DataFrame(rows, columns=headers)
+    df['season'] = season
+    df['division'] = 1
+    return df
+
+
+def _game_log_frame(name):
+    """
+    the raw game log _game_logs hands to _transform_stats
+    """
+    key, player_id = _GAME_LOGS[name]
+    df = ncaa._game_log_frame(_text(name), schemas.get_schema(*key), 15860,
+                              167, player_id)
+    df['season'] = key[2]
+    df['division'] = 1
+    return df.loc[df.field.isin(['away', 'home', 'neutral'])]
+
+
+def _raw_frames():
+    frames = [(name, _stats_frame(name)) for name in _STATS]
+    frames += [(name, _game_log_frame(name)) for name in _GAME_LOGS]
+    return frames
+
+
+_RAW = _raw_frames()
+
+
+@ pytest.fixture()
+def generate_cassette():
+    previous = (ncaa.set_cache(_CASSETTE),
+                boydsworld_scraper.set_cache(_CASSETTE))
+    yield _CASSETTE
+    ncaa.set_cache(previous[0])
+    boydsworld_scraper.set_cache(previous[1])
+
+
+@ pytest.mark.benchmark(group='parse')
+@ pytest.mark.parametrize('name', list(_STATS))
+def test_parse_stat_grid(benchmark, name):
+    text = _text(name)
+
+    def parse():
+        page = ncaa_parser.parse_document(text)
+        return (ncaa_parser.stat_grid(page, 'tbody', player_links=True),
+                ncaa_parser.stat_grid(page, 'tfoot', last=False))
+    body, foot = benchmark(parse)
+    assert len(body[1]) > 0
+    assert len(foot[1]) == 2
+
+
+@ pytest.mark.benchmark(group='parse')
+def test_parse_career_table(benchmark):
+    text = _text('career_batting.html')
+    headers, rows, row = benchmark(ncaa_parser.career_table, text)
+    assert len(rows) > 0
+
+
+@ pytest.mark.benchmark(group='parse')
+@ pytest.mark.parametrize('name', list(_GAME_LOGS))
+def test_parse_game_log_cells(benchmark, name):
+    text = _text(name)
+    assert len(benchmark(ncaa_parser.game_log_cells, text)) > 0
+
+
+@ pytest.mark.benchmark(group='parse')
+def test_parse_roster(benchmark, generate_cassette):
+    # the roster is read inside the scraper, so this includes its frame
+    assert len(benchmark(ncaa.ncaa_team_season_roster, 167, 2022)) > 0
+
+
+@ pytest.mark.benchmark(group='parse')
+def test_parse_boydsworld(benchmark, generate_cassette):
+    assert len(benchmark(boydsworld_scraper._get_data, 'Cornell', 2019)) > 0
+
+
+@ pytest.mark.benchmark(group='frame')
+@ pytest.mark.parametrize('name', list(_STATS))
+def test_frame_stats(benchmark, name):
+    assert len(benchmark(_stats_frame, name)) > 0
+
+
+@ pytest.mark.benchmark(group='frame')
+@ pytest.mark.parametrize('name', list(_GAME_LOGS))
+def test_frame_game_logs(benchmark, name):
+    key, player_id = _GAME_LOGS[name]
+    text = _text(name)
+    schema = schemas.get_schema(*key)
+    df = benchmark(ncaa._game_log_frame, text, schema, 15860, 167,
+                   player_id)
+    assert len(df) > 0
+
+
+@ pytest.mark.benchmark(group='transform')
+@ pytest.mark.parametrize('name, raw', _RAW, ids=[name for name, _ in _RAW])
+def test_transform_stats(benchmark, name, raw):
+    assert len(benchmark(ncaa_utils._transform_stats, raw)) > 0
+
+
+@ pytest.mark.benchmark(group='metrics')
+@ pytest.mark.parametrize('name, raw', _RAW, ids=[name for name, _ in _RAW])
+def test_metrics(benchmark, name, raw):
+    df = ncaa_utils._transform_stats(raw)
+    if 'batting' in name:
+        add = metrics.add_batting_metrics
+    else:
+        df = df.loc[df.IP > 0]
+        add = metrics.add_pitching_metrics
+    # the metrics add columns in place, so each round gets a fresh copy
+    res = benchmark.pedantic(add, setup=lambda: ((df.copy(),), {}),
+                             rounds=_ROUNDS)
+    assert len(res) > 0
+
+
+@ pytest.mark.benchmark(group='scraper')
+@ pytest.mark.parametrize('label, scraper, args', _SCRAPERS,
+                          ids=[label for label, _, _ in _SCRAPERS])
+def test_scraper(benchmark, generate_cassette, label, scraper, args):
+    assert len(benchmark(scraper, *args)) > 0
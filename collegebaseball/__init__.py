@@ -1,27 +1,11 @@
-from .ncaa_scraper import ncaa_team_season_roster, ncaa_team_roster, \
-    ncaa_career_stats, ncaa_team_stats, ncaa_team_totals, \
-    ncaa_team_game_logs, ncaa_player_game_logs, ncaa_team_results
-from .lookup import lookup_season_ids, lookup_season_reverse, \
-    lookup_season_id, lookup_seasons_played, lookup_school, \
-    lookup_player, _lookup_season_info, _lookup_school_info, \
-    _lookup_season_basic, lookup_season_id_reverse, \
-    lookup_player_reverse, lookup_school_reverse
-from .metrics import calculate_woba_manual, calculate_wraa_manual, calculate_wrc_manual, \
-    add_batting_metrics, add_pitching_metrics
-from .boydsworld_scraper import boydsworld_team_results
-from .win_pct import calculate_actual_win_pct, calculate_pythagenpat_win_pct
-from .guts import get_player_lu_path, get_player_lu_table, \
-    get_linear_weights_path, get_linear_weights_table, \
-    get_players_history_path, get_players_history_table, \
-    get_schools_path, get_schools_table, \
-    get_seasons_path, get_seasons_table, \
-    get_rosters_path, get_rosters_table, \
-    get_season_linear_weights
-from .download_utils import download_rosters, \
-    download_player_game_logs, download_season_rosters, \
-    download_team_results, download_team_stats, \
-    download_team_totals
+"""
+collegebaseball
 
+Public names are resolved lazily (PEP 562), so `import collegebaseball`
+does not pull in pandas, BeautifulSoup, requests or tqdm until a function
+that needs them is first used
+"""
+import importlib
 import sys
 import warnings
 
@@ -30,3 +14,72 @@ if not sys.warnoptions:
 
 __version__ = '1.3.0-alpha'
 __author__ = 'Nathan Blumenfeld'
+
+# public name -> submodule it lives in
+_EXPORTS = {
+    'ncaa_scraper': [
+        'ncaa_team_season_roster', 'ncaa_team_roster', 'ncaa_career_stats',
+        'ncaa_team_stats', 'ncaa_team_totals', 'ncaa_team_game_logs',
+        'ncaa_player_game_logs', 'ncaa_team_results',
+        'ncaa_team_stats_and_totals'],
+    'lookup': [
+        'lookup_season_ids', 'lookup_season_reverse', 'lookup_season_id',
+        'lookup_seasons_played', 'lookup_school', 'lookup_player',
+        '_lookup_season_info', '_lookup_school_info', '_lookup_season_basic',
+        'lookup_season_id_reverse', 'lookup_player_reverse',
+        'lookup_school_reverse', 'lookup_schools_reverse',
+        'lookup_players_reverse', 'lookup_seasons'],
+    'metrics': [
+        'calculate_woba_manual', 'calculate_wraa_manual',
+        'calculate_wrc_manual', 'add_batting_metrics',
+        'add_pitching_metrics'],
+    'boydsworld_scraper': [
+        'boydsworld_team_results', 'boydsworld_league_results',
+        'boydsworld_teams_results'],
+    'ratings': ['calculate_rpi'],
+    'win_pct': ['calculate_actual_win_pct', 'calculate_pythagenpat_win_pct',
+                'calculate_league_win_pcts'],
+    'guts': [
+        'get_player_lu_path', 'get_player_lu_table',
+        'get_linear_weights_path', 'get_linear_weights_table',
+        'get_players_history_path', 'get_players_history_table',
+        'get_schools_path', 'get_schools_table', 'get_seasons_path',
+        'get_seasons_table', 'get_rosters_path', 'get_rosters_table',
+        'get_games_path', 'get_games_table', 'get_season_linear_weights',
+        'clear_cache'],
+    'download_utils': [
+        'download_rosters', 'download_player_game_logs',
+        'download_season_rosters', 'download_team_results',
+        'download_team_stats', 'download_team_totals',
+        'download_team_stats_and_totals', 'iter_team_stats',
+        'iter_team_totals', 'iter_season_rosters', 'iter_player_game_logs'],
+}
+_NAME_TO_MODULE = {name: module for module, names in _EXPORTS.items()
+                   for name in names}
+_SUBMODULES = {
+    'boydsworld_scraper', 'checkpoint', 'download_utils', 'games', 'guts',
+    'guts_utils', 'http_cache', 'instrument', 'lookup', 'metrics',
+    'ncaa_parser', 'ncaa_scraper', 'ncaa_utils', 'rate_limit', 'ratings',
+    'replay', 'schemas', 'telemetry', 'win_pct'}
+
+__all__ = [name for names in _EXPORTS.values() for name in names
+           if not name.startswith('_')]
+
+
+def __getattr__(name):
+    if name in _NAME_TO_MODULE:
+        module = importlib.import_module(
+            '.' + _NAME_TO_MODULE[name], __name__)
+        value = getattr(module, name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module('.' + name, __name__)
+    else:
+        raise AttributeError(
+            f'''module {__name__!r} has no attribute {name!r}''')
+    # cache so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_NAME_TO_MODULE) | _SUBMODULES)
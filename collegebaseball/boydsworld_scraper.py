@@ -5,9 +5,85 @@ A scraper module for boydsworld.com historical game results
 
 created by Nathan Blumenfeld in November 2021
 """
+import threading
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
 import requests
 from io import StringIO
+from collegebaseball import games
+
+
+# response cache (e.g. a replay.Cassette) consulted before the network
+_CACHE = None
+# raw league-wide tables from boydsworld.com, each game once, keyed by
+# (start, end, parse_dates), least recently used first
+_LEAGUE_TABLES = OrderedDict()
+_LEAGUE_TABLES_LOCK = threading.Lock()
+# league tables kept at most, the least recently used is dropped first
+_LEAGUE_TABLES_SIZE = 8
+
+
+def set_cache(cache=None):
+    """
+    Answers boydsworld requests from a response cache first, e.g. a
+     replay.Cassette to run offline against recorded pages
+
+    Args:
+        cache (optional): anything with get(url, params) and
+         put(url, params, response), None to disable
+
+    Returns:
+        the previous cache, so it can be restored
+    """
+    global _CACHE
+    previous, _CACHE = _CACHE, cache
+    return previous
+
+
+def clear_cache():
+    """
+    Drops every league table kept by boydsworld_league_results, e.g. to
+     pick up new games of a season in progress
+    """
+    with _LEAGUE_TABLES_LOCK:
+        _LEAGUE_TABLES.clear()
+
+
+def _league_table(key):
+    """
+    Returns:
+        the kept raw league table for key, or None
+    """
+    with _LEAGUE_TABLES_LOCK:
+        raw = _LEAGUE_TABLES.get(key)
+        if raw is not None:
+            _LEAGUE_TABLES.move_to_end(key)
+    return raw
+
+
+def _keep_league_table(key, raw):
+    with _LEAGUE_TABLES_LOCK:
+        _LEAGUE_TABLES[key] = raw
+        _LEAGUE_TABLES.move_to_end(key)
+        while len(_LEAGUE_TABLES) > _LEAGUE_TABLES_SIZE:
+            _LEAGUE_TABLES.popitem(last=False)
+
+
+def _get(url, params=None):
+    """
+    Sends a GET request to boydsworld.com, or answers it from the cache
+    """
+    cache = _CACHE
+    if cache is not None:
+        r = cache.get(url, params)
+        if r is not None:
+            return r
+    with requests.Session() as s:
+        r = s.get(url, params=params)
+    if cache is not None and r.status_code == 200:
+        cache.put(url, params, r)
+    return r
 
 
 def boydsworld_team_results(school, start, end=None, vs="all",
@@ -16,6 +92,11 @@ def boydsworld_team_results(school, start, end=None, vs="all",
     A function to scrape game results data, from boydsworld.com
     Valid 1992 to 2021, d1 only
 
+    Seasons in the bundled games table (see games.covered_seasons) are
+     answered from memory; only the others are requested from
+     boydsworld.com. The bundled table has no tied games, so ties only
+     appear in seasons requested from the site
+
     Args:
         school (str): team whose games to select
         start (int): the start year of games, 1992 <= start <= 2022
@@ -29,82 +110,246 @@ def boydsworld_team_results(school, start, end=None, vs="all",
         data from boydsworld.com
 
     """
-    try:
-        df = (_get_data(school, start, end=end, vs=vs, parse_dates=parse_dates)
-              .pipe(_enrich_data, school)
-              .pipe(_set_dtypes)
-              .drop(columns=["team_1", "team_1_score", "team_2",
-                             "team_2_score"])
-              .sort_values(by="date", axis=0, ascending=True)
-              )
-        return df
-    except:
+    if end is None:
+        end = start
+    offline, missing = games.covered_seasons(start, end)
+    frames = []
+    if len(offline) > 0:
+        frames.append(games.team_results(school, offline[0], offline[-1],
+                                         vs=vs, parse_dates=parse_dates))
+    for first, last in _season_ranges(missing):
+        frames.append(_fetch_team_results(school, first, last, vs,
+                                          parse_dates))
+    frames = [df for df in frames if len(df) > 0]
+    if len(frames) == 0:
         print(f'''no records found for {school} between {start} and {end}''')
         return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+    return (pd.concat(frames)
+            .sort_values(by="date", kind="stable")
+            .reset_index(drop=True))
+
+
+def boydsworld_league_results(start, end=None, parse_dates=True):
+    """
+    Every d1 team's game results, from boydsworld.com
+    Valid 1992 to 2021, d1 only
+
+    Seasons in the bundled games table are answered from memory, without
+     tied games (the table has none); each run of the others is one
+     request for the whole league, whose raw table is kept for later
+     calls (see boydsworld_team_results) until clear_cache(), or until
+     _LEAGUE_TABLES_SIZE more recently used ones are kept
+
+    Args:
+        start (int): the start year of games, 1992 <= start <= 2022
+        end (int):  the end season of games, 1992 <= end <= 2022
+        parse_dates (bool): whether to parse data into datetime64
+
+    Returns:
+        Dataframe of every game, once from each team's perspective, in the
+        format of boydsworld_team_results with a school column, by date
+
+    Raises:
+        requests.RequestException: if boydsworld.com could not be reached
+        ValueError: if its page could not be parsed
+    """
+    if end is None:
+        end = start
+    offline, missing = games.covered_seasons(start, end)
+    # (first season, frame), so frames concatenate in date order
+    frames = []
+    for first, last in _season_ranges(offline):
+        frames.append((first, games.league_results(first, last,
+                                                   parse_dates=parse_dates)))
+    for first, last in _season_ranges(missing):
+        frames.append((first, _fetch_league_results(first, last,
+                                                    parse_dates)))
+    frames = [df for _, df in sorted(frames, key=lambda x: x[0])
+              if len(df) > 0]
+    if len(frames) == 0:
+        print(f'''no records found between {start} and {end}''')
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
+
+
+def boydsworld_teams_results(start, end=None, schools=None,
+                             parse_dates=True):
+    """
+    Game results for many teams at once, from boydsworld.com, partitioned
+     locally from one boydsworld_league_results table instead of a
+     request per team
+
+    Args:
+        start (int): the start year of games, 1992 <= start <= 2022
+        end (int):  the end season of games, 1992 <= end <= 2022
+        schools (list, optional): teams to return, default: every team
+        parse_dates (bool): whether to parse data into datetime64
+
+    Returns:
+        dict of school to its Dataframe, as boydsworld_team_results
+        would return it; schools with no games are left out
+    """
+    league = boydsworld_league_results(start, end, parse_dates=parse_dates)
+    if len(league) == 0:
+        return {}
+    return _partition(league, schools)
+
+
+def _partition(league, schools=None):
+    """
+    Splits a league table into one frame per school, keeping date order
+
+    Returns:
+        dict of school to its games, without the school column
+    """
+    if schools is not None:
+        league = league.loc[league["school"].isin(list(schools))]
+    league = league.sort_values(by="school", kind="stable")
+    names = league["school"].to_numpy(object)
+    change = np.flatnonzero(names[1:] != names[:-1]) + 1
+    starts = np.concatenate([[0], change]).tolist()
+    stops = np.concatenate([change, [len(names)]]).tolist()
+    frame = league.drop(columns="school").reset_index(drop=True)
+    return {names[start]: frame.iloc[start:stop].reset_index(drop=True)
+            for start, stop in zip(starts, stops) if stop > start}
+
+
+def _season_ranges(seasons):
+    """
+    Returns:
+        list of (first, last) runs of consecutive seasons
+    """
+    res = []
+    for season in seasons:
+        if res and res[-1][1] == season - 1:
+            res[-1] = (res[-1][0], season)
+        else:
+            res.append((season, season))
+    return res
+
+
+def _fetch_team_results(school, start, end, vs, parse_dates):
+    """
+    Requests a team's results from boydsworld.com, or orients them from a
+     league table already fetched for the same seasons
+    """
+    raw = _league_table((start, end, parse_dates))
+    try:
+        if raw is not None:
+            if vs != "all":
+                raw = raw.loc[(raw["team_1"].to_numpy() == vs)
+                              | (raw["team_2"].to_numpy() == vs)]
+        else:
+            raw = _get_data(school, start, end=end, vs=vs,
+                            parse_dates=parse_dates)
+        if len(raw) == 0:
+            return pd.DataFrame()
+        # boydsworld lists games by date, which _enrich_data keeps
+        return _enrich_data(raw, school)
+    except (requests.RequestException, ValueError) as e:
+        print(f'''boydsworld request failed for {school}: {e}''')
+        return pd.DataFrame()
+
+
+def _fetch_league_results(start, end, parse_dates):
+    """
+    Requests every team's results from boydsworld.com in one request
+     (team1 left open), keeps the raw table, and orients each game once
+     from both teams' perspectives. Request and parse errors are raised,
+     so a failed fetch is not mistaken for a season without games
+    """
+    key = (start, end, parse_dates)
+    raw = _league_table(key)
+    if raw is None:
+        raw = _get_data("all", start, end=end, parse_dates=parse_dates)
+        if len(raw) == 0:
+            return pd.DataFrame()
+        _keep_league_table(key, raw)
+    return _enrich_data(raw)
 
 
 def _get_data(school, start, end=None, vs="all", parse_dates=True):
     """
     A helper function to send GET request to boydsworld.com and parse data
+
+    Returns:
+        the page's results table, empty if it lists no games
+
+    Raises:
+        requests.RequestException: if the request failed
+        ValueError: if the page could not be parsed
     """
     col_names = ["date", "team_1", "team_1_score",
                  "team_2", "team_2_score", "field"]
     url = 'http://www.boydsworld.com/cgi/scores.pl'
     if end is None:
         end = start
-    try:
-        payload = {"team1": school, "firstyear": str(start), "team2": vs,
-                   "lastyear": str(end), "format": "HTML", "submit": "Fetch"}
-        with requests.Session() as s:
-            r = s.get(url, params=payload)
-        response = r.text
-        io = StringIO(response).read()
-        dfs = pd.read_html(io=io, parse_dates=parse_dates)
-        df = dfs[1].dropna(how="all", axis=1, inplace=False)
-        if len(df.columns) != len(col_names):
-            print("no records found")
-            return pd.DataFrame()
-        else:
-            df.columns = col_names
-            if parse_dates:
-                df.loc[:, 'date'] = pd.to_datetime(
-                    df.loc[:, 'date'], infer_datetime_format=True)
-            return df
-    except:
+    payload = {"team1": school, "firstyear": str(start), "team2": vs,
+               "lastyear": str(end), "format": "HTML", "submit": "Fetch"}
+    r = _get(url, params=payload)
+    r.raise_for_status()
+    response = r.text
+    io = StringIO(response).read()
+    dfs = pd.read_html(io=io, parse_dates=parse_dates)
+    if len(dfs) < 2:
+        print("no records found")
+        return pd.DataFrame()
+    df = dfs[1].dropna(how="all", axis=1, inplace=False)
+    if len(df.columns) != len(col_names):
+        print("no records found")
         return pd.DataFrame()
+    df.columns = col_names
+    if parse_dates:
+        df.loc[:, 'date'] = pd.to_datetime(
+            df.loc[:, 'date'], infer_datetime_format=True)
+    return df
 
 
-def _enrich_data(df, school):
+def _enrich_data(df, school=None):
     """
-    A helper function that adds the following columns to a given DataFrame:
+    A helper function that orients boydsworld's rows, which list the
+     winner (or, for a tie, either team) as team_1, to a team's
+     perspective in one pass, ties included. Returns the columns of
+     boydsworld_team_results, typed:
 
         opponent (str): opponent for each game.
-        runs_allowed (int): the number of runs scored by team_1 in each game
-        runs_scored (int): the number of runs scored by team_1 in each game
-        run_difference (int): the difference between team_1's runs scored
-            and runs allowed for each game
-    """
-    wins = df[(df["team_1"] == school) &
-              (df["team_1_score"] > df["team_2_score"])].copy()
-    losses = df[(df["team_2"] == school) &
-                (df["team_1_score"] > df["team_2_score"])].copy()
-    wins.loc[:, "runs_scored"] = wins.loc[:, "team_1_score"]
-    wins.loc[:, "runs_allowed"] = wins.loc[:, "team_2_score"]
-    wins.loc[:, "opponent"] = wins.loc[:, "team_2"]
-    losses.loc[:, "runs_scored"] = losses.loc[:, "team_2_score"]
-    losses.loc[:, "runs_allowed"] = losses.loc[:, "team_1_score"]
-    losses.loc[:, "opponent"] = losses.loc[:, "team_1"]
-    df = pd.concat([wins, losses])
-    df.loc[:, "run_difference"] = df.loc[:, "runs_scored"] \
-        - df.loc[:, "runs_allowed"]
-    return df
+        runs_allowed (int): the number of runs scored by the opponent
+        runs_scored (int): the number of runs scored by the team
+        run_difference (int): runs_scored - runs_allowed
 
+    Args:
+        df (pd.DataFrame): from _get_data()
+        school (str, optional): team whose games to orient; None orients
+         every game from both teams' perspectives, team_1's row first,
+         and adds a school column
 
-def _set_dtypes(df):
-    """
-    A helper function to sets the datatypes of newly added columns
+    Returns:
+        pd.DataFrame in the order of df, with a fresh index
     """
-    df.loc[:, "run_difference"] = df.loc[:, "run_difference"].astype(int)
-    df.loc[:, "runs_allowed"] = df.loc[:, "runs_allowed"].astype(int)
-    df.loc[:, "runs_scored"] = df.loc[:, "runs_scored"].astype(int)
-    return df
+    team_1 = df["team_1"].to_numpy(object)
+    team_2 = df["team_2"].to_numpy(object)
+    if school is None:
+        take = np.repeat(np.arange(len(df)), 2)
+        first = np.tile([True, False], len(df))
+    else:
+        first = team_1 == school
+        take = np.flatnonzero(first | (team_2 == school))
+        first = first[take]
+    score_1 = df["team_1_score"].to_numpy("int64")[take]
+    score_2 = df["team_2_score"].to_numpy("int64")[take]
+    team_1, team_2 = team_1[take], team_2[take]
+    runs_scored = np.where(first, score_1, score_2)
+    runs_allowed = np.where(first, score_2, score_1)
+    res = {"date": df["date"].to_numpy()[take],
+           "field": df["field"].to_numpy(object)[take],
+           "runs_scored": runs_scored,
+           "runs_allowed": runs_allowed,
+           "opponent": np.where(first, team_2, team_1),
+           "run_difference": runs_scored - runs_allowed}
+    if school is None:
+        res["school"] = np.where(first, team_1, team_2)
+    return pd.DataFrame(res)
@@ -0,0 +1,141 @@
+"""
+checkpoint.py
+
+Resumable storage for collegebaseball's bulk downloads: every completed
+school or player is written to its own parquet shard under a
+hive-partitioned directory, and an append-only manifest records which
+shards are done and which requests failed
+"""
+import json
+import os
+import threading
+import pandas as pd
+
+
+_MANIFEST = '_manifest.jsonl'
+
+
+class Checkpoint:
+    """
+    Shards and manifest of one bulk dataset, laid out as:
+
+        {directory}/{dataset}/variant=batting/season=2022/division=1/167.parquet
+        {directory}/{dataset}/_manifest.jsonl
+
+    Args:
+        directory (str): root directory shared by every dataset
+        dataset (str): e.g. 'team_stats', 'rosters'
+    """
+
+    def __init__(self, directory, dataset):
+        self.root = os.path.join(directory, dataset)
+        self._manifest_path = os.path.join(self.root, _MANIFEST)
+        self._lock = threading.Lock()
+        self._status = {}
+        os.makedirs(self.root, exist_ok=True)
+        if os.path.exists(self._manifest_path):
+            with open(self._manifest_path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # a line cut short by a crash mid-write
+                        continue
+                    self._status[entry['shard']] = entry
+
+    @staticmethod
+    def shard_id(partition, key):
+        """
+        Returns:
+            the shard's path relative to the dataset root, without suffix,
+            e.g. 'variant=batting/season=2022/division=1/167'
+        """
+        parts = [f'''{name}={value}''' for name, value in partition.items()]
+        if isinstance(key, tuple):
+            key = '_'.join(str(k) for k in key)
+        return '/'.join(parts + [str(key)])
+
+    def is_complete(self, partition, key):
+        entry = self._status.get(self.shard_id(partition, key))
+        return entry is not None and entry['status'] == 'done'
+
+    def error(self, partition, key):
+        """
+        Returns:
+            the recorded error of a failed shard (str), or None
+        """
+        entry = self._status.get(self.shard_id(partition, key))
+        if entry is None or entry['status'] != 'failed':
+            return None
+        return entry['error']
+
+    def write(self, partition, key, df):
+        """
+        Writes a shard, then marks it done in the manifest
+        """
+        shard = self.shard_id(partition, key)
+        path = os.path.join(self.root, shard + '.parquet')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_parquet(path + '.tmp')
+        os.replace(path + '.tmp', path)
+        self._record({'shard': shard, 'status': 'done', 'rows': len(df)})
+
+    def mark_failed(self, partition, key, error):
+        self._record({'shard': self.shard_id(partition, key),
+                      'status': 'failed',
+                      'error': f'''{type(error).__name__}: {error}'''})
+
+    def read(self, partition, key):
+        """
+        Returns:
+            the DataFrame stored in a completed shard
+        """
+        path = os.path.join(self.root,
+                            self.shard_id(partition, key) + '.parquet')
+        return pd.read_parquet(path)
+
+    def summary(self):
+        """
+        Returns:
+            dict of the number of done and failed shards
+        """
+        statuses = [entry['status'] for entry in self._status.values()]
+        return {'done': statuses.count('done'),
+                'failed': statuses.count('failed')}
+
+    def _record(self, entry):
+        with self._lock:
+            with open(self._manifest_path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self._status[entry['shard']] = entry
+
+
+class CheckpointGroup:
+    """
+    Several datasets filled from the same requests (e.g. team_stats and
+     team_totals, which come from one page), checkpointed together: a
+     key is complete once every dataset has its shard, and results are
+     tuples with one DataFrame per dataset
+
+    Args:
+        checkpoints (list of Checkpoint)
+    """
+
+    def __init__(self, checkpoints):
+        self.checkpoints = list(checkpoints)
+
+    def is_complete(self, partition, key):
+        return all(c.is_complete(partition, key) for c in self.checkpoints)
+
+    def write(self, partition, key, dfs):
+        for checkpoint, df in zip(self.checkpoints, dfs):
+            checkpoint.write(partition, key, df)
+
+    def mark_failed(self, partition, key, error):
+        for checkpoint in self.checkpoints:
+            checkpoint.mark_failed(partition, key, error)
+
+    def read(self, partition, key):
+        return tuple(c.read(partition, key) for c in self.checkpoints)
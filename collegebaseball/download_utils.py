@@ -5,55 +5,391 @@ large-download utilities for collegebaseball
 
 created by Nathan Blumenfeld in Summer 2022
 """
+import contextvars
 import pandas as pd
-from collegebaseball import guts, lookup
+from collegebaseball import guts, instrument, lookup, rate_limit, telemetry
+from collegebaseball.checkpoint import Checkpoint, CheckpointGroup
 from collegebaseball import ncaa_scraper as ncaa
-import random
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from tqdm import tqdm
-from time import sleep
 
 
-# GET request options
-_TIMEOUT = 1
+# default requests per second sent to stats.ncaa.org by bulk downloads,
+# roughly the pace of the random 0-1s pauses used previously
+_RATE = 2.0
 
 
-def download_rosters(seasons: list, divisions: list, save=True):
-    res = pd.DataFrame()
-    failures = []
+def _imap_concurrently(fn, keys, max_workers=1, rate=_RATE):
+    """
+    Calls fn(key) for every key from a pool of max_workers threads, while
+     ncaa_scraper's network requests are limited to rate per second per
+     host (responses served from its cache are not limited) by a limiter
+     of this job's own, see ncaa_scraper.rate_limited. At most
+     2 * max_workers calls are in flight or waiting to be consumed, so
+     memory stays bounded however many keys there are. Each call runs
+     in a copy of the caller's context, so an instrument.collecting()
+     block around the download sees the stages of every thread
+
+    Args:
+        fn: function of one key
+        keys (iterable)
+        max_workers (int, optional): concurrent requests, defaults to 1
+        rate (float, optional): requests per second, None for no limit
+
+    Yields:
+        (key, result, exception, telemetry.KeyResult) tuples as each call
+        completes, with exactly one of result and exception set
+    """
+    max_workers = max(1, max_workers)
+    keys = iter(keys)
+    limiter = rate_limit.HostRateLimiter(rate) if rate else None
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {}
+
+        def _submit_next():
+            for key in keys:
+                context = contextvars.copy_context()
+                pending[pool.submit(context.run, _track_limited, limiter,
+                                    fn, key)] = key
+                return
+
+        for _ in range(2 * max_workers):
+            _submit_next()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = pending.pop(future)
+                outcome = (key,) + future.result()
+                _submit_next()
+                yield outcome
+
+
+def _track_limited(limiter, fn, key):
+    """
+    telemetry.track(fn, key), with the job's own rate limiter
+    """
+    with ncaa.rate_limited(limiter):
+        return telemetry.track(fn, key)
+
+
+def _map_concurrently(fn, keys, max_workers=1, rate=_RATE, checkpoint=None,
+                      shard_of=None, result=None):
+    """
+    Like _imap_concurrently, but waits for every call to finish. With a
+     checkpoint, keys whose shard is already done are skipped and every
+     new result is written to its shard as soon as it arrives, so an
+     interrupted job can be rerun to retry only what is missing. Keys
+     that failed or were blocked (see telemetry.KeyResult) are marked
+     failed instead of written
+
+    Args:
+        checkpoint (checkpoint.Checkpoint, optional)
+        shard_of (optional): function of a key returning the
+         (partition dict, shard key) it is stored under
+        result (telemetry.BulkResult, optional): gets the outcome of
+         every key, in the order of keys
+
+    Returns:
+        list of (key, result, exception) tuples in the order of keys
+    """
+    keys = list(keys)
+    if checkpoint is None:
+        todo = range(len(keys))
+    else:
+        todo = [i for i, key in enumerate(keys)
+                if not checkpoint.is_complete(*shard_of(key))]
+    outcomes = {}
+    records = {}
+    for i, new, error, record in tqdm(_imap_concurrently(
+            lambda i: fn(keys[i]), todo, max_workers, rate),
+            total=len(todo)):
+        if checkpoint is not None:
+            if record.status not in ('failed', 'blocked'):
+                try:
+                    checkpoint.write(*shard_of(keys[i]), new)
+                except Exception as e:
+                    new, error = None, e
+                    record = record._replace(
+                        status='failed', error=type(e).__name__,
+                        message=str(e))
+            if record.status == 'blocked':
+                # the scrapers answer a 403 with an empty frame, which
+                # must be retried on rerun rather than stored as done
+                checkpoint.mark_failed(*shard_of(keys[i]), ConnectionError(
+                    f'''{record.http_status} Error: NCAA blocked request'''))
+            elif error is not None:
+                checkpoint.mark_failed(*shard_of(keys[i]), error)
+        outcomes[i] = (new, error)
+        records[i] = record._replace(key=keys[i])
+    if checkpoint is not None:
+        for i, key in enumerate(keys):
+            if i not in outcomes:
+                outcomes[i] = (checkpoint.read(*shard_of(key)), None)
+    if result is not None:
+        for i, key in enumerate(keys):
+            if i in records:
+                result.add(records[i])
+            else:
+                result.skipped(key)
+    return [(key,) + outcomes[i] for i, key in enumerate(keys)]
+
+
+def _label_team_frame(new, school_id):
+    """
+    Labels a school's frame with its school_id and school name
+    """
+    new['school_id'] = school_id
+    new['school_id'] = new['school_id'].astype('int32')
+    new['school'] = lookup.lookup_schools_reverse(
+        new['school_id'])['ncaa_name']
+    return new
+
+
+def _fetch_team_frame(scraper, school_id, season, variant):
+    """
+    Runs ncaa_team_stats or ncaa_team_totals for one school and labels
+     the result with its school_id and school name
+    """
+    return _label_team_frame(scraper(int(school_id), int(season), variant),
+                             school_id)
+
+
+def _fetch_team_frames(school_id, season, variant):
+    """
+    Runs ncaa_team_stats_and_totals for one school (a single request)
+     and labels both frames
+    """
+    stats, totals = ncaa.ncaa_team_stats_and_totals(
+        int(school_id), int(season), variant)
+    return (_label_team_frame(stats, school_id),
+            _label_team_frame(totals, school_id))
+
+
+def _division_school_ids(division):
+    df = guts.get_schools_table()
+    return df.loc[df.division == division].school_id.unique()
+
+
+def _iter_team_frames(scraper, seasons, variant, divisions, max_workers,
+                      rate, failures, result):
+    keys = [(season, division, school_id)
+            for division in divisions
+            for season in seasons
+            for school_id in _division_school_ids(division)]
+
+    def _fetch(key):
+        return _fetch_team_frame(scraper, key[2], key[0], variant)
+
+    for key, new, error, record in _imap_concurrently(
+            _fetch, keys, max_workers, rate):
+        if result is not None:
+            result.add(record)
+        if error is not None:
+            if failures is not None:
+                failures.append(key)
+            continue
+        yield key, new
+
+
+def iter_team_stats(seasons: list, variant: str, divisions: list,
+                    max_workers=1, rate=_RATE, failures=None, result=None):
+    """
+    Streams player-level season stats school by school, so league-wide
+     pulls can be processed as they arrive without holding the whole
+     result in memory
+
+    Args:
+        seasons (list): seasons as (int, YYYY)
+        variant (str): 'batting', 'pitching', or 'fielding'
+        divisions (list): divisions as int
+        max_workers (int, optional): concurrent requests, defaults to 1
+        rate (float, optional): requests per second, None for no limit
+        failures (list, optional): keys that failed are appended here
+        result (telemetry.BulkResult, optional): gets the outcome of
+         every key as it completes
+
+    Yields:
+        ((season, division, school_id), pd.DataFrame) in completion order
+    """
+    return _iter_team_frames(ncaa.ncaa_team_stats, seasons, variant,
+                             divisions, max_workers, rate, failures, result)
+
+
+def iter_team_totals(seasons: list, variant: str, divisions: list,
+                     max_workers=1, rate=_RATE, failures=None,
+                     result=None):
+    """
+    Streams team-level season totals school by school
+
+    Args:
+        seasons (list): seasons as (int, YYYY)
+        variant (str): 'batting', 'pitching', or 'fielding'
+        divisions (list): divisions as int
+        max_workers (int, optional): concurrent requests, defaults to 1
+        rate (float, optional): requests per second, None for no limit
+        failures (list, optional): keys that failed are appended here
+        result (telemetry.BulkResult, optional): gets the outcome of
+         every key as it completes
+
+    Yields:
+        ((season, division, school_id), pd.DataFrame) in completion order
+    """
+    return _iter_team_frames(ncaa.ncaa_team_totals, seasons, variant,
+                             divisions, max_workers, rate, failures, result)
+
+
+def iter_season_rosters(season: int, division: int, max_workers=1,
+                        rate=_RATE, failures=None, result=None):
+    """
+    Streams single-season rosters school by school
+
+    Args:
+        season (int, YYYY)
+        division (int)
+        max_workers (int, optional): concurrent requests, defaults to 1
+        rate (float, optional): requests per second, None for no limit
+        failures (list, optional): school_ids that failed are appended here
+        result (telemetry.BulkResult, optional): gets the outcome of
+         every school as it completes
+
+    Yields:
+        (school_id, pd.DataFrame) in completion order
+    """
+    def _fetch(i):
+        return ncaa.ncaa_team_season_roster(int(i), int(season))
+
+    for i, new, error, record in _imap_concurrently(
+            _fetch, _division_school_ids(division), max_workers, rate):
+        if result is not None:
+            result.add(record)
+        if error is not None:
+            if failures is not None:
+                failures.append(i)
+            continue
+        yield i, new
+
+
+def iter_player_game_logs(season, division=None,
+                          variants=('batting', 'pitching', 'fielding'),
+                          max_workers=1, rate=_RATE, failures=None,
+                          result=None):
+    """
+    Streams game-by-game stats player by player, for every player on a
+     roster in the given season
+
+    Args:
+        season (int, YYYY)
+        division (int, optional): defaults to all divisions
+        variants (tuple, optional): any of 'batting', 'pitching', 'fielding'
+        max_workers (int, optional): concurrent requests, defaults to 1
+        rate (float, optional): requests per second, None for no limit
+        failures (list, optional): (stats_player_seq, variant, season)
+         tuples that failed are appended here
+        result (telemetry.BulkResult, optional): gets the outcome of
+         every (stats_player_seq, variant) as it completes
+
+    Yields:
+        ((stats_player_seq, variant), pd.DataFrame) in completion order
+    """
+    df = guts.get_rosters_table()
+    players = df.loc[df.season == season]
+    if division is not None:
+        players = players.loc[players.division == division]
+    keys = [(stats_player_seq, variant)
+            for stats_player_seq in players['stats_player_seq'].unique()
+            for variant in variants]
+
+    def _fetch(key):
+        return ncaa.ncaa_player_game_logs(key[0], season, key[1])
+
+    for key, new, error, record in _imap_concurrently(
+            _fetch, keys, max_workers, rate):
+        if result is not None:
+            result.add(record)
+        if error is not None:
+            if failures is not None:
+                failures.append((key[0], key[1], season))
+            continue
+        yield key, new
+
+
+def _concat(frames):
+    """
+    Concatenates collected chunks once, rather than growing a frame chunk
+     by chunk (which copies every previous row on each append)
+
+    Returns:
+        DataFrame (empty if there are no chunks)
+    """
+    if len(frames) == 0:
+        return pd.DataFrame()
+    return pd.concat(frames)
+
+
+@instrument.run
+def download_rosters(seasons: list, divisions: list, save=True,
+                     max_workers=1, rate=_RATE, checkpoint_dir=None,
+                     result=None):
+    """
+    Returns:
+        (rosters, result): every season and division's rosters, and a
+        telemetry.BulkResult keyed by (season, division, school_id)
+    """
+    if result is None:
+        result = telemetry.BulkResult()
+    frames = []
     for season in seasons:
         for division in divisions:
-            sleep(random.uniform(0, _TIMEOUT))
-            try:
-                new = download_season_rosters(int(season), int(division))
-            except:
-                continue
-            try:
-                res = pd.concat([res, new])
-            except:
-                continue
+            new, season_result = download_season_rosters(
+                int(season), int(division), max_workers=max_workers,
+                rate=rate, checkpoint_dir=checkpoint_dir)
+            result.extend(season_result, (int(season), int(division)))
+            frames.append(new)
+    res = _concat(frames)
     if save:
         res.to_parquet(
             'collegebaseball/data/'+str(divisions)+'_'+str(seasons)
             + '_rosters.parquet', index=False)
-    return res, failures
+    return res, result
 
 
-def download_season_rosters(season: int, division: int, save=True):
+@instrument.run
+def download_season_rosters(season: int, division: int, save=True,
+                            max_workers=1, rate=_RATE, checkpoint_dir=None,
+                            result=None):
     """
+    Args:
+        checkpoint_dir (str, optional): write each school's roster to a
+         parquet shard under checkpoint_dir/rosters/season=/division=/
+         and skip schools already there when rerun
+        result (telemetry.BulkResult, optional): gets the outcome of
+         every school, defaults to a new one
+
+    Returns:
+        (rosters, result): the schools' rosters and the BulkResult,
+        whose failures are the school_ids that failed or were blocked
     """
-    res = pd.DataFrame()
-    failures = []
+    if result is None:
+        result = telemetry.BulkResult()
+    frames = []
     df = guts.get_schools_table()
     school_ids = df.loc[df['division'] == division]
     school_ids = school_ids.school_id.unique()
-    for i in school_ids:
-        sleep(random.uniform(0, _TIMEOUT))
-        try:
-            new = ncaa.ncaa_team_season_roster(int(i), int(season))
-            res = pd.concat([res, new])
-        except:
-            failures.append(i)
+
+    def _fetch(i):
+        return ncaa.ncaa_team_season_roster(int(i), int(season))
+
+    checkpoint = None
+    if checkpoint_dir is not None:
+        checkpoint = Checkpoint(checkpoint_dir, 'rosters')
+    partition = {'season': season, 'division': division}
+    for i, new, error in _map_concurrently(
+            _fetch, school_ids, max_workers, rate, checkpoint,
+            lambda i: (partition, i), result):
+        if error is not None:
             continue
+        frames.append(new)
+    res = _concat(frames)
     res['season'] = season
     res['season'] = res['season'].astype('int64')
     res['division'] = division
@@ -61,122 +397,221 @@ def download_season_rosters(season: int, division: int, save=True):
     if save:
         res.to_parquet('collegebaseball/data/d'+str(division) +
                        '_'+str(season)+'_rosters.parquet', index=False)
-    return res
+    return res, result
 
 
-def download_team_results(season: int, division=1, save=True):
+@instrument.run
+def download_team_results(season: int, division=1, save=True,
+                          max_workers=1, rate=_RATE, result=None):
     """
+    Returns:
+        (results, result): every school's game results and a
+        telemetry.BulkResult keyed by school_id
     """
-    res = pd.DataFrame()
-    failures = []
+    if result is None:
+        result = telemetry.BulkResult()
+    frames = []
     df = guts.get_schools_table()
     df = df.loc[df.division == division]
-    for i in tqdm(df.school_id.unique()):
-        sleep(random.uniform(0, _TIMEOUT))
-        try:
-            new = ncaa.ncaa_team_results(int(i), int(season))
-            res = pd.concat([res, new])
-        except:
-            failures.append(i)
+
+    def _fetch(i):
+        return ncaa.ncaa_team_results(int(i), int(season))
+
+    for i, new, error in _map_concurrently(_fetch, df.school_id.unique(),
+                                           max_workers, rate, result=result):
+        if error is not None:
             continue
+        frames.append(new)
+    res = _concat(frames)
     if save:
         res.to_csv('collegebaseball/data/'+str(season) +
                    '_results.csv', index=False)
-    return res, failures
+    return res, result
+
 
+# file suffix of each team dataset saved by the download_team_* functions
+_TEAM_SUFFIXES = {'team_stats': 'stats', 'team_totals': 'totals'}
 
-def download_team_stats(seasons: list, variant: str, divisions: list, save=True):
+
+def _download_team_frames(fetch, datasets, seasons, variant, divisions,
+                          save, max_workers, rate, checkpoint_dir, result):
     """
+    The loop shared by download_team_stats, download_team_totals and
+     download_team_stats_and_totals
+
+    Args:
+        fetch: function of (school_id, season) returning a tuple with
+         one frame per dataset
+        datasets (list): e.g. ['team_stats', 'team_totals']
+        result (telemetry.BulkResult, optional): defaults to a new one
+
+    Returns:
+        ({dataset: frame of the last division and season}, result), with
+        the result keyed by (season, division, school_id)
     """
-    failures = []
+    if result is None:
+        result = telemetry.BulkResult()
+    checkpoint = None
+    if checkpoint_dir is not None:
+        checkpoint = CheckpointGroup(
+            [Checkpoint(checkpoint_dir, dataset) for dataset in datasets])
     df = guts.get_schools_table()
+    res = {}
     for division in tqdm(divisions):
         schools = df.loc[df.division == division]
         for season in tqdm(seasons):
-            res = pd.DataFrame()
-            for i in tqdm(schools.school_id.unique()):
-                sleep(random.uniform(0, _TIMEOUT))
-                try:
-                    new = ncaa.ncaa_team_stats(int(i), int(season), variant)
-                    new['school_id'] = i
-                    new['school_id'] = new['school_id'].astype('int32')
-                    new['school'] = lookup.lookup_school_reverse(i)
-                    new['school'] = new['school'].astype('string')
-                    res = pd.concat([res, new])
-                except:
-                    failures.append(i)
+            frames = [[] for _ in datasets]
+            season_result = telemetry.BulkResult()
+
+            def _fetch(i):
+                return fetch(i, season)
+
+            partition = {'variant': variant, 'season': season,
+                         'division': division}
+            for i, new, error in _map_concurrently(
+                    _fetch, schools.school_id.unique(), max_workers, rate,
+                    checkpoint, lambda i: (partition, i), season_result):
+                if error is not None:
                     continue
-            res['season'] = season
-            res['season'] = res['season'].astype('int32')
-            res['division'] = division
-            res['division'] = res['division'].astype('int8')
-            print(res)
-            if save:
-                res.to_csv('collegebaseball/data/d'+str(division)+'_'+str(season) +
-                           '_'+variant+'_stats.csv', index=False)
-    return res
+                for chunks, frame in zip(frames, new):
+                    chunks.append(frame)
+            result.extend(season_result, (season, division))
+            for dataset, chunks in zip(datasets, frames):
+                out = _concat(chunks)
+                out['season'] = season
+                out['season'] = out['season'].astype('int32')
+                out['division'] = division
+                out['division'] = out['division'].astype('int8')
+                if save:
+                    out.to_csv('collegebaseball/data/d'+str(division)+'_'+str(season) +
+                               '_'+variant+'_'+_TEAM_SUFFIXES[dataset]+'.csv', index=False)
+                res[dataset] = out
+    return res, result
 
 
-def download_team_totals(seasons: list, variant: str, divisions: list, save=True):
+@instrument.run
+def download_team_stats(seasons: list, variant: str, divisions: list,
+                        save=True, max_workers=1, rate=_RATE,
+                        checkpoint_dir=None, result=None):
     """
+    Args:
+        checkpoint_dir (str, optional): write each school's stats to a
+         parquet shard under
+         checkpoint_dir/team_stats/variant=/season=/division=/ and skip
+         schools already there when rerun
+        result (telemetry.BulkResult, optional): gets the outcome of
+         every (season, division, school_id)
     """
-    failures = []
-    df = guts.get_schools_table()
-    for division in tqdm(divisions):
-        schools = df.loc[df.division == division]
-        for season in tqdm(seasons):
-            res = pd.DataFrame()
-            for i in tqdm(schools.school_id.unique()):
-                sleep(random.uniform(0, _TIMEOUT))
-                try:
-                    new = ncaa.ncaa_team_totals(int(i), int(season), variant)
-                    new['school_id'] = i
-                    new['school_id'] = new['school_id'].astype('int32')
-                    new['school'] = lookup.lookup_school_reverse(i)
-                    new['school'] = new['school'].astype('string')
-                    res = pd.concat([res, new])
-                except:
-                    failures.append(i)
-                    continue
-            res['season'] = season
-            res['season'] = res['season'].astype('int32')
-            res['division'] = division
-            res['division'] = res['division'].astype('int8')
-            if save:
-                res.to_csv('collegebaseball/data/d'+str(division)+'_'+str(season) +
-                           '_'+variant+'_totals.csv', index=False)
-    return failures
+    def _fetch(i, season):
+        return (_fetch_team_frame(ncaa.ncaa_team_stats, i, season, variant),)
+
+    res, result = _download_team_frames(
+        _fetch, ['team_stats'], seasons, variant, divisions, save,
+        max_workers, rate, checkpoint_dir, result)
+    return res['team_stats']
+
+
+@instrument.run
+def download_team_totals(seasons: list, variant: str, divisions: list,
+                         save=True, max_workers=1, rate=_RATE,
+                         checkpoint_dir=None, result=None):
+    """
+    Args:
+        checkpoint_dir (str, optional): write each school's totals to a
+         parquet shard under
+         checkpoint_dir/team_totals/variant=/season=/division=/ and skip
+         schools already there when rerun
+        result (telemetry.BulkResult, optional): defaults to a new one
+
+    Returns:
+        telemetry.BulkResult keyed by (season, division, school_id)
+    """
+    def _fetch(i, season):
+        return (_fetch_team_frame(ncaa.ncaa_team_totals, i, season, variant),)
 
+    res, result = _download_team_frames(
+        _fetch, ['team_totals'], seasons, variant, divisions, save,
+        max_workers, rate, checkpoint_dir, result)
+    return result
 
-def download_player_game_logs(season, division=None, save=True):
+
+@instrument.run
+def download_team_stats_and_totals(seasons: list, variant: str,
+                                   divisions: list, save=True, max_workers=1,
+                                   rate=_RATE, checkpoint_dir=None,
+                                   result=None):
+    """
+    Runs download_team_stats and download_team_totals as one pass, with
+     a single request per school instead of two
+
+    Args:
+        checkpoint_dir (str, optional): write each school's stats and
+         totals to the team_stats and team_totals shards described in
+         download_team_stats and download_team_totals
+        result (telemetry.BulkResult, optional): defaults to a new one
+
+    Returns:
+        (stats, totals, result): the frames of the last division and
+        season, and the telemetry.BulkResult keyed by
+        (season, division, school_id)
+    """
+    def _fetch(i, season):
+        return _fetch_team_frames(i, season, variant)
+
+    res, result = _download_team_frames(
+        _fetch, ['team_stats', 'team_totals'], seasons, variant, divisions,
+        save, max_workers, rate, checkpoint_dir, result)
+    return res['team_stats'], res['team_totals'], result
+
+
+@instrument.run
+def download_player_game_logs(season, division=None, save=True,
+                              max_workers=1, rate=_RATE, checkpoint_dir=None,
+                              result=None):
     '''
     Gets literally all stats in D1 NCAA Mens Baseball.
     This will take some time to complete.
+
+    Args:
+        checkpoint_dir (str, optional): write each player's game logs to a
+         parquet shard under
+         checkpoint_dir/player_game_logs/variant=/season=/division=/ and
+         skip players already there when rerun
+        result (telemetry.BulkResult, optional): gets the outcome of
+         every (stats_player_seq, variant)
     '''
     df = guts.get_rosters_table()
     players = df.loc[df.season == season]
     if division is not None:
         players = players.loc[players.division == division]
-    batting_res = pd.DataFrame()
-    pitching_res = pd.DataFrame()
-    fielding_res = pd.DataFrame()
-    failures = []
-    for index, player in tqdm(players.iterrows()):
-        stats_player_seq = player['stats_player_seq']
-        for variant in ['batting', 'pitching', 'fielding']:
-            sleep(random.uniform(0, _TIMEOUT))
-            try:
-                new = ncaa.ncaa_player_game_logs(stats_player_seq,
-                                                 season,  variant)
-                if variant == 'batting':
-                    batting_res = pd.concat([batting_res, new])
-                elif variant == 'pitching':
-                    pitching_res = pd.concat([pitching_res, new])
-                else:
-                    fielding_res = pd.concat([fielding_res, new])
-            except:
-                failures.append((stats_player_seq, variant, season))
-                continue
+    frames = {'batting': [], 'pitching': [], 'fielding': []}
+    keys = [(stats_player_seq, variant)
+            for stats_player_seq in players['stats_player_seq']
+            for variant in ['batting', 'pitching', 'fielding']]
+
+    def _fetch(key):
+        return ncaa.ncaa_player_game_logs(key[0], season, key[1])
+
+    checkpoint = None
+    if checkpoint_dir is not None:
+        checkpoint = Checkpoint(checkpoint_dir, 'player_game_logs')
+    player_divisions = dict(zip(players['stats_player_seq'],
+                                players['division']))
+
+    def _shard_of(key):
+        return ({'variant': key[1], 'season': season,
+                 'division': player_divisions[key[0]]}, key[0])
+
+    for key, new, error in _map_concurrently(_fetch, keys, max_workers,
+                                             rate, checkpoint, _shard_of,
+                                             result):
+        stats_player_seq, variant = key
+        if error is not None:
+            continue
+        frames[variant].append(new)
+    batting_res = _concat(frames['batting'])
+    pitching_res = _concat(frames['pitching'])
+    fielding_res = _concat(frames['fielding'])
     if save:
         batting_res.to_csv('collegebaseball/data/d'+str(division)+'_batting_player_game_logs_' +
                            str(season)+'.csv', index=False)
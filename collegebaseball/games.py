@@ -0,0 +1,173 @@
+"""
+games.py
+
+Offline game results from the bundled boydsworld.com table
+(data/games_1992_2021.parquet), loaded once and indexed by school and
+season, so boydsworld_team_results only goes to the network for seasons
+the table does not cover
+
+The table was built by a scraper that dropped tied games, so it holds no
+ties; a season answered from it can differ from the same season scraped
+from boydsworld.com, which keeps them
+"""
+from time import monotonic
+import numpy as np
+from collegebaseball import guts
+
+
+# seconds between checks of whether guts has reloaded the games table
+_RECHECK_INTERVAL = 1.0
+# columns of boydsworld_team_results, in order
+_COLUMNS = ['date', 'field', 'runs_scored', 'runs_allowed', 'opponent',
+            'run_difference']
+
+
+class GamesIndex:
+    """
+    The games table sorted by (school, season, date), with the row range
+     of every school-season, so a team's results for a range of seasons
+     are one contiguous slice, already in date order. Built on first use
+     and rebuilt when guts reloads or drops the table
+
+    Indexes:
+        frame: the table's boydsworld_team_results columns, sorted
+        rows: {school: {season: (start, stop)}} row ranges in frame
+        seasons: set of the seasons the table covers
+    """
+
+    def __init__(self):
+        # [source DataFrame, index, guts generation, checked at]
+        self._entry = None
+
+    def get(self):
+        entry = self._entry
+        now = monotonic()
+        if (entry is not None and entry[2] == guts._GENERATION
+                and now - entry[3] < _RECHECK_INTERVAL):
+            return entry[1]
+        df = guts._read_table(guts.get_games_path())
+        if entry is not None and entry[0] is df:
+            entry[2], entry[3] = guts._GENERATION, now
+            return entry[1]
+        self._entry = [df, self._build(df), guts._GENERATION, now]
+        return self._entry[1]
+
+    @staticmethod
+    def _build(df):
+        df = df.sort_values(['school', 'season', 'date'], kind='stable')
+        schools = df['school'].to_numpy(object)
+        seasons = df['season'].to_numpy('int64')
+        # first row of every (school, season) run, and one past the last
+        change = np.flatnonzero((schools[1:] != schools[:-1])
+                                | (seasons[1:] != seasons[:-1])) + 1
+        starts = np.concatenate([[0], change]).tolist()
+        stops = np.concatenate([change, [len(df)]]).tolist()
+        rows = {}
+        for start, stop in zip(starts, stops):
+            rows.setdefault(schools[start], {})[int(seasons[start])] = (
+                start, stop)
+        frame = df[_COLUMNS].reset_index(drop=True)
+        for col in ['runs_scored', 'runs_allowed', 'run_difference']:
+            frame[col] = frame[col].astype('int64')
+        return {'frame': frame, 'rows': rows,
+                'seasons': set(np.unique(seasons).tolist())}
+
+
+_INDEX = GamesIndex()
+
+
+def get_index():
+    """
+    Returns:
+        the GamesIndex shared by team_results and boydsworld_scraper
+    """
+    return _INDEX
+
+
+def covered_seasons(start, end=None):
+    """
+    Returns:
+        (seasons in [start, end] the games table covers, those it does not)
+    """
+    if end is None:
+        end = start
+    seasons = _INDEX.get()['seasons']
+    years = range(int(start), int(end) + 1)
+    return ([s for s in years if s in seasons],
+            [s for s in years if s not in seasons])
+
+
+def team_results(school, start, end=None, vs='all', parse_dates=True):
+    """
+    A school's games from the bundled table, in the format of
+     boydsworld_team_results; seasons the table does not cover are left
+     out (see covered_seasons), and so are tied games, which the table
+     lacks
+
+    Args:
+        school (str): boydsworld name of the school
+        start (int): first season
+        end (int, optional): last season, defaults to start
+        vs (str, optional): only games against this school, default: 'all'
+        parse_dates (bool, optional): dates as datetime64 (True) or as
+         boydsworld prints them, M/D/YYYY (False)
+
+    Returns:
+        pd.DataFrame sorted by date, empty if the school played no games
+    """
+    if end is None:
+        end = start
+    index = _INDEX.get()
+    ranges = [rows for season, rows in index['rows'].get(school, {}).items()
+              if int(start) <= season <= int(end)]
+    if len(ranges) == 0:
+        return index['frame'].iloc[:0].copy()
+    # a school's seasons are adjacent and in date order in the table
+    res = index['frame'].iloc[min(r[0] for r in ranges):
+                              max(r[1] for r in ranges)]
+    if vs != 'all':
+        res = res.loc[res['opponent'].to_numpy() == vs]
+    res = res.reset_index(drop=True)
+    if not parse_dates:
+        res['date'] = _format_dates(res['date'])
+    return res
+
+
+def league_results(start, end=None, parse_dates=True):
+    """
+    Every school's games from the bundled table, from each school's
+     perspective, in the format of boydsworld_scraper.
+     boydsworld_league_results; seasons the table does not cover, and
+     tied games, are left out (see covered_seasons)
+
+    Args:
+        start (int): first season
+        end (int, optional): last season, defaults to start
+        parse_dates (bool, optional): dates as datetime64 (True) or as
+         boydsworld prints them, M/D/YYYY (False)
+
+    Returns:
+        pd.DataFrame sorted by date, with a school column
+    """
+    if end is None:
+        end = start
+    df = guts._read_table(guts.get_games_path())
+    seasons = df['season'].to_numpy('int64')
+    res = (df.loc[(seasons >= int(start)) & (seasons <= int(end)),
+                  _COLUMNS + ['school']]
+           .sort_values('date', kind='stable')
+           .reset_index(drop=True))
+    for col in ['runs_scored', 'runs_allowed', 'run_difference']:
+        res[col] = res[col].astype('int64')
+    if not parse_dates:
+        res['date'] = _format_dates(res['date'])
+    return res
+
+
+def _format_dates(date):
+    """
+    Returns:
+        datetime64 Series date as boydsworld prints it, M/D/YYYY
+    """
+    return (date.dt.month.astype(str) + '/' + date.dt.day.astype(str) + '/'
+            + date.dt.year.astype(str))
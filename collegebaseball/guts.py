@@ -6,7 +6,63 @@ A module to provide convenient read-access to collegebaseball's internal data
 created by Nathan Blumenfeld in Summer 2022
 """
 from importlib import resources
-import pandas as pd
+import os
+import threading
+
+
+# in-memory cache of the bundled tables, keyed by file path
+# each entry is ((mtime_ns, size), DataFrame) so that edits made on disk
+# (e.g. by guts_utils) are picked up on the next read
+_TABLE_CACHE = {}
+_TABLE_CACHE_LOCK = threading.Lock()
+# bumped whenever a cached table is dropped or reloaded, so indexes built
+# on top of the cache (see lookup.LookupIndex) know to rebuild
+_GENERATION = 0
+
+
+def _read_table(path):
+    """
+    Reads a bundled table, loading it from disk at most once per process
+     unless the file has since been modified
+
+    Args:
+        path: path to a .parquet or .csv file
+
+    Returns:
+        the cached DataFrame (shared, do not modify in place)
+    """
+    key = str(path)
+    stat = os.stat(key)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    entry = _TABLE_CACHE.get(key)
+    if entry is not None and entry[0] == signature:
+        return entry[1]
+    global _GENERATION
+    with _TABLE_CACHE_LOCK:
+        entry = _TABLE_CACHE.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        if entry is not None:
+            _GENERATION += 1
+        # imported here so that `import collegebaseball.lookup` stays cheap
+        import pandas as pd
+        if key.endswith('.parquet'):
+            df = pd.read_parquet(key)
+        else:
+            df = pd.read_csv(key)
+        _TABLE_CACHE[key] = (signature, df)
+    return df
+
+
+def clear_cache():
+    """
+    Drops every cached table, forcing the next read of each
+     table to reload it from disk
+    """
+    global _GENERATION
+    with _TABLE_CACHE_LOCK:
+        _TABLE_CACHE.clear()
+        _GENERATION += 1
 
 
 def get_schools_path():
@@ -22,10 +78,10 @@ def get_schools_path():
 def get_schools_table(division=None):
     """
     """
-    df = pd.read_parquet(get_schools_path())
+    df = _read_table(get_schools_path())
     if division is not None:
-        df = df.loc[df.division == division]
-    return df
+        return df.loc[df.division == division].copy()
+    return df.copy()
 
 
 def get_player_lu_path():
@@ -41,7 +97,7 @@ def get_player_lu_path():
 def get_player_lu_table():
     """
     """
-    return pd.read_csv(get_player_lu_path())
+    return _read_table(get_player_lu_path()).copy()
 
 
 def get_seasons_path():
@@ -56,14 +112,14 @@ def get_seasons_path():
 def get_seasons_table():
     """
     """
-    return pd.read_parquet(get_seasons_path())
+    return _read_table(get_seasons_path()).copy()
 
 
 def get_rosters_path():
     """
     """
     with resources.path("collegebaseball.data",
-                        "rosters_2012_2023_all.csv") as f:
+                        "rosters_2013_2022_all.parquet") as f:
         data_file_path = f
     return data_file_path
 
@@ -71,7 +127,7 @@ def get_rosters_path():
 def get_rosters_table():
     """
     """
-    return pd.read_csv(get_rosters_path())
+    return _read_table(get_rosters_path()).copy()
 
 
 def get_players_history_path():
@@ -79,7 +135,7 @@ def get_players_history_path():
 
     """
     with resources.path("collegebaseball.data",
-                        "players_history.csv") as f:
+                        "players_history.parquet") as f:
         data_file_path = f
     return data_file_path
 
@@ -87,7 +143,25 @@ def get_players_history_path():
 def get_players_history_table():
     """
     """
-    return pd.read_csv(get_players_history_path())
+    return _read_table(get_players_history_path()).copy()
+
+
+def get_games_path():
+    """
+    """
+    with resources.path("collegebaseball.data",
+                        "games_1992_2021.parquet") as f:
+        data_file_path = f
+    return data_file_path
+
+
+def get_games_table():
+    """
+    Every D1 game from boydsworld.com, 1992-2021, once from each school's
+     side: date, field, runs_scored, runs_allowed, opponent,
+     run_difference, season and school (boydsworld's name)
+    """
+    return _read_table(get_games_path()).copy()
 
 
 # provided by Robert Fray
@@ -104,7 +178,7 @@ def get_linear_weights_path():
 def get_linear_weights_table():
     """
     """
-    return pd.read_csv(get_linear_weights_path())
+    return _read_table(get_linear_weights_path()).copy()
 
 
 def get_season_linear_weights(season: int, division):
@@ -120,7 +194,7 @@ def get_season_linear_weights(season: int, division):
             pitching_id
             fielding_id
     """
-    df = get_linear_weights_table()
+    df = _read_table(get_linear_weights_path())
     df = df.loc[df['season'] == int(season)]
     res = df.loc[df['division'] == int(division)]
     return res
@@ -23,6 +23,7 @@ def update_season_ids(season, season_id, batting_id, pitching_id):
         [[season, season_id, batting_id, pitching_id]], columns=old.columns)
     updated_df = pd.concat([old, new]).reset_index(drop=True)
     updated_df.to_parquet(guts.get_season_lu_path())
+    guts.clear_cache()
     return updated_df
 
 
@@ -32,10 +33,13 @@ def update_rosters(season, division):
     """
     df = pd.read_parquet(guts.get_rosters_path())
     old = df.loc[df.season != season]
-    new, failures = download_utils.download_season_rosters(season, division)
-    print(failures)
+    new, result = download_utils.download_season_rosters(season, division)
+    print(result)
+    if result.failures:
+        print(f'''failed: {result.failures}''')
     res = pd.concat([new, old])
     res.to_parquet(guts.get_rosters_path(), index=False)
+    guts.clear_cache()
 
 
 def _remove_school(school):
@@ -43,3 +47,4 @@ def _remove_school(school):
     df = df.loc[df.ncaa_name != school]
     df.to_csv('collegebaseball/data/schools.csv', index=False)
     df.to_parquet('collegebaseball/data/schools.parquet', index=False)
+    guts.clear_cache()
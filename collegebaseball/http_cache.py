@@ -0,0 +1,206 @@
+"""
+http_cache.py
+
+An opt-in on-disk cache of stats.ncaa.org responses for ncaa_scraper
+"""
+from datetime import date
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode
+from requests import Response
+
+
+# default time-to-live, in seconds, of pages from the in-progress season
+_CURRENT_TTL = 60 * 60
+# default time-to-live of pages from completed seasons (None: never expire)
+_COMPLETED_TTL = 30 * 24 * 60 * 60
+# default size cap of the cache directory, in bytes
+_MAX_BYTES = 512 * 1024 * 1024
+
+
+def _default_directory():
+    return os.path.join(os.path.expanduser('~'), '.cache',
+                        'collegebaseball', 'http')
+
+
+def _current_season():
+    """
+    The season currently being played or, in the offseason, the next one
+     (college seasons wrap up by the end of June)
+    """
+    today = date.today()
+    return today.year + 1 if today.month >= 7 else today.year
+
+
+def cache_key(url, params=None):
+    """
+    Content address of a request: sha256 of the url plus its
+     query parameters, normalized to sorted string pairs
+
+    Args:
+        url (str)
+        params (dict, optional)
+
+    Returns:
+        hex digest (str)
+    """
+    if params:
+        pairs = sorted((str(k), str(v)) for k, v in params.items()
+                       if v is not None)
+        url = url.rstrip('?') + '?' + urlencode(pairs)
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Gzip-compressed response bodies stored under a directory, one file
+     per content-addressed request, with season-aware expiry and
+     least-recently-used eviction once the directory exceeds max_bytes
+
+    Args:
+        directory (str, optional): defaults to ~/.cache/collegebaseball/http
+        max_bytes (int, optional): size cap of the compressed entries
+        current_ttl (int, optional): seconds before pages from the current
+         season (or with no season) expire
+        completed_ttl (int or None, optional): seconds before pages from
+         completed seasons expire, None to keep them until evicted
+        season_ttls (dict, optional): {season: seconds} overrides
+    """
+
+    def __init__(self, directory=None, max_bytes=_MAX_BYTES,
+                 current_ttl=_CURRENT_TTL, completed_ttl=_COMPLETED_TTL,
+                 season_ttls=None):
+        self.directory = directory or _default_directory()
+        self.max_bytes = max_bytes
+        self.current_ttl = current_ttl
+        self.completed_ttl = completed_ttl
+        self.season_ttls = dict(season_ttls or {})
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._size = sum(os.path.getsize(path) for path in self._entries())
+
+    def ttl(self, season=None):
+        """
+        Returns:
+            time-to-live in seconds of a page from the given season
+            (None if it never expires)
+        """
+        if season in self.season_ttls:
+            return self.season_ttls[season]
+        if season is not None and int(season) < _current_season():
+            return self.completed_ttl
+        return self.current_ttl
+
+    def get(self, url, params=None, season=None):
+        """
+        Returns:
+            the cached requests.Response, or None on a miss
+        """
+        path = self._path(cache_key(url, params))
+        try:
+            with gzip.open(path, 'rb') as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+        except (OSError, EOFError, ValueError):
+            self._count(hit=False)
+            return None
+        ttl = self.ttl(season)
+        if ttl is not None and time.time() - meta['stored_at'] > ttl:
+            self._count(hit=False)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count(hit=True)
+        res = Response()
+        res.status_code = meta['status_code']
+        res.encoding = meta['encoding']
+        res.url = meta['url']
+        res._content = body
+        return res
+
+    def put(self, url, params, response):
+        """
+        Stores the body of a response
+        """
+        path = self._path(cache_key(url, params))
+        meta = {'url': response.url, 'status_code': response.status_code,
+                'encoding': response.encoding, 'stored_at': time.time()}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                f.write(json.dumps(meta).encode('utf-8') + b'\n')
+                f.write(response.content)
+        size = os.path.getsize(tmp)
+        with self._lock:
+            if os.path.exists(path):
+                self._size -= os.path.getsize(path)
+            os.replace(tmp, path)
+            self._size += size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def clear(self):
+        """
+        Deletes every entry and resets the counters
+        """
+        with self._lock:
+            for path in self._entries():
+                os.remove(path)
+            self._size = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict of hits, misses, evictions, entries and bytes
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions,
+                    'entries': len(self._entries()), 'bytes': self._size}
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.gz')
+
+    def _entries(self):
+        res = []
+        for root, _, files in os.walk(self.directory):
+            res.extend(os.path.join(root, f) for f in files
+                       if f.endswith('.gz'))
+        return res
+
+    def _evict(self):
+        """
+        drops least-recently-used entries until back under 90% of max_bytes
+        (caller holds the lock)
+        """
+        entries = []
+        for path in self._entries():
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if self._size <= target:
+                break
+            os.remove(path)
+            self._size -= size
+            self.evictions += 1
@@ -0,0 +1,210 @@
+"""
+instrument.py
+
+Per-stage timing of collegebaseball's scrapers. Inside a `collecting()`
+block every ncaa_scraper entry point records the wall time, bytes
+downloaded, rows produced and HTTP status of each of its stages:
+
+    fetch      network request (cache: answered from the response cache)
+    parse      page text -> cells / raw DataFrame
+    transform  ncaa_utils._transform_stats
+    metrics    metrics.add_batting_metrics / add_pitching_metrics
+
+    from collegebaseball import instrument, ncaa_scraper
+    with instrument.collecting() as timings:
+        ncaa_scraper.ncaa_team_stats('Cornell', 2022, 'batting')
+    timings.histograms()
+
+The collector lives in a context variable, so it follows the code that
+opened it (download_utils carries it into its worker threads) and is
+never shared between unrelated callers. Outside a collecting() block
+each stage costs one context variable lookup
+"""
+import contextvars
+import functools
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from time import perf_counter
+import numpy as np
+import pandas as pd
+
+
+StageTiming = namedtuple(
+    'StageTiming', ['scraper', 'stage', 'seconds', 'bytes', 'rows', 'status'])
+
+# upper edges of the wall time histogram buckets, in seconds
+_BUCKETS = [0.001, 0.003, 0.01, 0.03, 0.1, 0.3, 1.0, 3.0, 10.0, np.inf]
+_BUCKET_NAMES = ['<1ms', '<3ms', '<10ms', '<30ms', '<100ms', '<300ms', '<1s',
+                 '<3s', '<10s', '>=10s']
+
+_COLLECTOR = contextvars.ContextVar('collegebaseball_collector', default=None)
+_SCRAPER = contextvars.ContextVar('collegebaseball_scraper', default=None)
+
+
+class Collector:
+    """
+    Stage timings gathered inside a collecting() block
+
+    Args:
+        export (optional): function of (run name, histograms DataFrame)
+         called at the end of every download_utils.download_* run, e.g.
+         lambda name, h: h.to_csv(f'{name}_timings.csv')
+
+    Attributes:
+        records (list of StageTiming)
+        runs (list): (run name, histograms DataFrame) of each finished
+         download_* run
+    """
+
+    def __init__(self, export=None):
+        self.export = export
+        self.records = []
+        self.runs = []
+        self._lock = threading.Lock()
+
+    def add(self, record):
+        with self._lock:
+            self.records.append(record)
+
+    def to_frame(self, start=0):
+        """
+        Returns:
+            DataFrame of the records from position start on, one row each
+        """
+        return pd.DataFrame(self.records[start:], columns=StageTiming._fields)
+
+    def histograms(self, start=0):
+        """
+        Aggregates the records from position start on
+
+        Returns:
+            DataFrame indexed by (scraper, stage) with the number of calls,
+            total/p50/p95/max seconds, bytes, rows, non-200 responses and
+            one column per wall time bucket
+        """
+        df = self.to_frame(start)
+        columns = ['count', 'seconds', 'p50', 'p95', 'max', 'bytes', 'rows',
+                   'non_200'] + _BUCKET_NAMES
+        if df.empty:
+            return pd.DataFrame(columns=columns, index=pd.MultiIndex.from_arrays(
+                [[], []], names=['scraper', 'stage']))
+        res = {}
+        for key, group in df.groupby(['scraper', 'stage'], dropna=False,
+                                     sort=True):
+            seconds = group['seconds'].to_numpy()
+            status = group['status'].dropna()
+            counts = np.histogram(seconds, [0.0] + _BUCKETS)[0]
+            res[key] = [len(seconds), seconds.sum(),
+                        np.percentile(seconds, 50), np.percentile(seconds, 95),
+                        seconds.max(), group['bytes'].sum(),
+                        group['rows'].sum(), int((status != 200).sum())]
+            res[key] += counts.tolist()
+        out = pd.DataFrame.from_dict(res, orient='index', columns=columns)
+        out.index = pd.MultiIndex.from_tuples(out.index,
+                                              names=['scraper', 'stage'])
+        return out
+
+
+def active():
+    """
+    Returns:
+        the Collector of the enclosing collecting() block, or None
+    """
+    return _COLLECTOR.get()
+
+
+@contextmanager
+def collecting(collector=None):
+    """
+    Records stage timings of every scraper called inside the block
+
+    Args:
+        collector (Collector, optional): defaults to a new one
+
+    Yields:
+        the Collector
+    """
+    if collector is None:
+        collector = Collector()
+    token = _COLLECTOR.set(collector)
+    try:
+        yield collector
+    finally:
+        _COLLECTOR.reset(token)
+
+
+def start():
+    """
+    Returns:
+        the start time of a stage, or None when nothing is collecting
+    """
+    if _COLLECTOR.get() is None:
+        return None
+    return perf_counter()
+
+
+def record(stage, started, nbytes=None, rows=None, status=None):
+    """
+    Records a stage begun at start(); does nothing when started is None
+    """
+    if started is None:
+        return
+    collector = _COLLECTOR.get()
+    if collector is not None:
+        collector.add(StageTiming(_SCRAPER.get(), stage,
+                                  perf_counter() - started, nbytes, rows,
+                                  status))
+
+
+def timed(stage, fn, *args, **kwargs):
+    """
+    Calls fn(*args, **kwargs) as a stage, recording the rows it returns
+    """
+    started = start()
+    res = fn(*args, **kwargs)
+    if started is not None:
+        record(stage, started, rows=len(res))
+    return res
+
+
+def entry_point(fn):
+    """
+    Decorator naming the stages recorded inside a scraper after it
+    """
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if _COLLECTOR.get() is None:
+            return fn(*args, **kwargs)
+        token = _SCRAPER.set(name)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _SCRAPER.reset(token)
+    return wrapper
+
+
+def run(fn):
+    """
+    Decorator for download_* functions: when collecting, the histograms
+    of the stages recorded during the call are added to the collector's
+    runs and handed to its export function
+    """
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        collector = _COLLECTOR.get()
+        if collector is None:
+            return fn(*args, **kwargs)
+        first = len(collector.records)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            histograms = collector.histograms(first)
+            collector.runs.append((name, histograms))
+            if collector.export is not None:
+                collector.export(name, histograms)
+    return wrapper
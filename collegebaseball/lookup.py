@@ -6,9 +6,138 @@ lookup functions for collegebaseball
 created by Nathan Blumenfeld in Summer 2022
 """
 
+from time import monotonic
 from collegebaseball import guts
 
 
+# seconds between checks that the bundled tables are unchanged on disk
+_RECHECK_INTERVAL = 1.0
+# stats_player_seq * _SEASON_SPAN + season is unique per (player, season)
+_SEASON_SPAN = 10_000
+
+
+class LookupIndex:
+    """
+    Hash and sorted-array indexes over the guts tables, so that every
+     lookup is a dict get (or a binary search) instead of a scan of a
+     DataFrame. Each table's index is built on first use and rebuilt
+     when guts reloads or drops the table
+
+    Indexes:
+        seasons: {season: row}, {season_id: row}, and the table indexed
+         by season for batch reindexing
+        schools: {ncaa_name: row}, {bd_name: row}, {school_id: row}, and
+         the table indexed by school_id for batch reindexing
+        players: {stats_player_seq: (debut_season, season_last)}
+        rosters: {(stats_player_seq, season): (name, school, school_id)},
+         plus sorted stats_player_seq/season keys with aligned name,
+         school and school_id arrays for vectorized searches
+    """
+
+    def __init__(self):
+        # table name -> [source DataFrame, index, guts generation, checked at]
+        self._entries = {}
+
+    def seasons(self):
+        return self._get('seasons', guts.get_seasons_path,
+                         self._build_seasons)
+
+    def schools(self):
+        return self._get('schools', guts.get_schools_path,
+                         self._build_schools)
+
+    def players(self):
+        return self._get('players', guts.get_players_history_path,
+                         self._build_players)
+
+    def rosters(self):
+        return self._get('rosters', guts.get_rosters_path,
+                         self._build_rosters)
+
+    def _get(self, name, get_path, build):
+        entry = self._entries.get(name)
+        now = monotonic()
+        if (entry is not None and entry[2] == guts._GENERATION
+                and now - entry[3] < _RECHECK_INTERVAL):
+            return entry[1]
+        df = guts._read_table(get_path())
+        if entry is not None and entry[0] is df:
+            entry[2], entry[3] = guts._GENERATION, now
+            return entry[1]
+        self._entries[name] = [df, build(df), guts._GENERATION, now]
+        return self._entries[name][1]
+
+    @staticmethod
+    def _build_seasons(df):
+        cols = ['season', 'season_id', 'batting_id', 'pitching_id',
+                'fielding_id']
+        rows = [tuple(int(v) for v in row)
+                for row in df[cols].itertuples(index=False)]
+        return {'season': {row[0]: row for row in reversed(rows)},
+                'season_id': {row[1]: row for row in reversed(rows)},
+                'frame': df.drop_duplicates('season').set_index(
+                    'season')[cols[1:]]}
+
+    @staticmethod
+    def _build_schools(df):
+        rows = list(zip(df['ncaa_name'].tolist(), df['bd_name'].tolist(),
+                        df['school_id'].astype('int64').tolist(),
+                        df['division'].astype('int64').tolist()))
+        # built back to front so the first matching row wins, as with .loc
+        ncaa_name, bd_name, school_id = {}, {}, {}
+        for row in reversed(rows):
+            ncaa_name[row[0]] = row
+            if isinstance(row[1], str):
+                bd_name[row[1]] = row
+            school_id[row[2]] = row
+        return {'ncaa_name': ncaa_name, 'bd_name': bd_name,
+                'school_id': school_id,
+                'frame': df.drop_duplicates('school_id').set_index(
+                    'school_id')[['ncaa_name', 'division']]}
+
+    @staticmethod
+    def _build_players(df):
+        def to_int(x):
+            # left as is if unparseable, so the lookup raises as it did
+            try:
+                return int(x)
+            except (TypeError, ValueError):
+                return x
+
+        seqs = df['stats_player_seq'].tolist()
+        played = zip(map(to_int, df['debut_season'].tolist()),
+                     map(to_int, df['season_last'].tolist()))
+        return dict(reversed(list(zip(seqs, played))))
+
+    @staticmethod
+    def _build_rosters(df):
+        keys = (df['stats_player_seq'].to_numpy('int64') * _SEASON_SPAN
+                + df['season'].to_numpy('int64'))
+        # stable, so the first of any duplicated rows sorts first
+        order = keys.argsort(kind='stable')
+        names = df['name'].to_numpy(object)
+        schools = df['school'].to_numpy(object)
+        school_ids = df['school_id'].to_numpy('int64')
+        rows = zip(zip(df['stats_player_seq'].tolist(),
+                       df['season'].tolist()),
+                   zip(map(str, names), map(str, schools),
+                       school_ids.tolist()))
+        return {'rows': dict(reversed(list(rows))),
+                'keys': keys[order], 'name': names[order],
+                'school': schools[order], 'school_id': school_ids[order]}
+
+
+_INDEX = LookupIndex()
+
+
+def get_index():
+    """
+    Returns:
+        the LookupIndex shared by the lookup functions
+    """
+    return _INDEX
+
+
 def lookup_season_ids(season):
     """
     A function that finds the year_stat_category_ids of a given season
@@ -17,13 +146,7 @@ def lookup_season_ids(season):
     Returns:
         tuple of (season_id, batting_id, pitching_id) for desired season
     """
-    df = guts.get_seasons_table()
-    season_row = df.loc[df['season'] == season]
-    season_id = season_row.values[0][1]
-    batting_id = season_row.values[0][2]
-    pitching_id = season_row.values[0][3]
-    fielding_id = season_row.values[0][4]
-    return int(season_id), int(batting_id), int(pitching_id), int(fielding_id)
+    return _INDEX.seasons()['season'][season][1:]
 
 
 def lookup_season_reverse(season_id):
@@ -34,13 +157,9 @@ def lookup_season_reverse(season_id):
     Returns:
         tuple of (season_id, batting_id, pitching_id) for desired season
     """
-    df = guts.get_seasons_table()
-    season_row = df.loc[df['season_id'] == season_id]
-    season = season_row['season'].values[0]
-    batting_id = season_row['batting_id'].values[0]
-    pitching_id = season_row['pitching_id'].values[0]
-    fielding_id = season_row['fielding_id'].values[0]
-    return int(season), int(batting_id), int(pitching_id), int(fielding_id)
+    season, _, batting_id, pitching_id, fielding_id = \
+        _INDEX.seasons()['season_id'][season_id]
+    return season, batting_id, pitching_id, fielding_id
 
 
 def lookup_season_id(season):
@@ -53,10 +172,7 @@ def lookup_season_id(season):
     Returns:
         season_id as an int
     """
-    df = guts.get_seasons_table()
-    season_row = df.loc[df['season'] == season]
-    season_id = season_row.values[0][1]
-    return int(season_id)
+    return _INDEX.seasons()['season'][season][1]
 
 
 def lookup_season_id_reverse(season_id):
@@ -69,10 +185,7 @@ def lookup_season_id_reverse(season_id):
     Returns:
         season_id as an int
     """
-    df = guts.get_seasons_table()
-    season_row = df.loc[df['season_id'] == season_id]
-    season = season_row.values[0][0]
-    return int(season)
+    return _INDEX.seasons()['season_id'][season_id][0]
 
 
 def lookup_seasons_played(stats_player_seq):
@@ -85,9 +198,8 @@ def lookup_seasons_played(stats_player_seq):
     Returns:
         tuple of ints: (debut season, most recent season)
     """
-    df = guts.get_players_history_table()
-    row = df.loc[df.stats_player_seq == stats_player_seq]
-    return int(row['debut_season'].values[0]), int(row['season_last'].values[0])
+    debut_season, season_last = _INDEX.players()[stats_player_seq]
+    return int(debut_season), int(season_last)
 
 
 def lookup_school(school_name):
@@ -104,14 +216,14 @@ def lookup_school(school_name):
         lookup_school("cornell")
         >>> 167, 1
     """
-    df = guts.get_schools_table()
-    school_row = df.loc[(df.ncaa_name == school_name)]
-    if len(school_row) == 0:
-        school_row = df.loc[(df.bd_name == school_name)]
-    if len(school_row) == 0:
+    index = _INDEX.schools()
+    row = index['ncaa_name'].get(school_name)
+    if row is None:
+        row = index['bd_name'].get(school_name)
+    if row is None:
         return f'''could not find school {school_name}'''
     else:
-        return int(school_row['school_id'].values[0]), int(school_row['division'].values[0])
+        return row[2], row[3]
 
 
 def lookup_school_reverse(school_id):
@@ -128,13 +240,11 @@ def lookup_school_reverse(school_id):
         lookup_school_reverse(167)
         >>> "Cornell", 1
     """
-    df = guts.get_schools_table()
-    school_row = df.loc[(
-        df.school_id == school_id)]
-    if len(school_row) == 0:
+    row = _INDEX.schools()['school_id'].get(school_id)
+    if row is None:
         return f'''could not find school {school_id}'''
     else:
-        return str(school_row['ncaa_name'].values[0]), int(school_row['division'].values[0])
+        return str(row[0]), row[3]
 
 
 def lookup_player(player_name, school):
@@ -175,13 +285,106 @@ def lookup_player_reverse(player_id, season):
         player_name (str), school_name (str), school_id (int)
 
     """
-    df = guts.get_rosters_table()
-    row = df.loc[(df.stats_player_seq == player_id)
-                 & (df.season == season)]
-    if len(row) == 0:
+    row = _INDEX.rosters()['rows'].get((player_id, season))
+    if row is None:
         return f'''could not find player {player_id}'''
     else:
-        return str(row['name'].values[0]), str(row['school'].values[0]), int(row['school_id'].values[0])
+        return row
+
+
+def _as_keys(values):
+    """
+    Returns:
+        values as a nullable Int64 Series, keeping the index of a Series
+    """
+    import pandas as pd
+    index = values.index if isinstance(values, pd.Series) else None
+    return pd.Series(pd.array(values, dtype='Int64'), index=index)
+
+
+def lookup_schools_reverse(school_ids):
+    """
+    A function to find the names and divisions of many schools at once
+
+    Args:
+        school_ids (list, array or pd.Series of int)
+
+    Returns:
+        pd.DataFrame of school_id, ncaa_name and division, one row per
+        input in the same order (and with the same index, given a
+        Series); unknown school_ids get nulls
+
+    Examples:
+        lookup_schools_reverse([167, 736])
+        >>>    school_id   ncaa_name  division
+            0        167     Cornell         1
+            1        736  Vanderbilt         1
+    """
+    keys = _as_keys(school_ids)
+    res = _INDEX.schools()['frame'].reindex(keys.to_numpy())
+    res.index = keys.index
+    res.insert(0, 'school_id', keys)
+    return res.astype({'ncaa_name': 'string', 'division': 'Int64'})
+
+
+def lookup_players_reverse(player_ids, seasons):
+    """
+    A function to find the names and schools of many players at once
+
+    Args:
+        player_ids (list, array or pd.Series of int): stats_player_seq
+        seasons (int, or list, array or pd.Series of int aligned with
+         player_ids): YYYY
+
+    Returns:
+        pd.DataFrame of stats_player_seq, season, name, school and
+        school_id, one row per input in the same order (and with the same
+        index, given a Series); unknown players get nulls
+    """
+    import numpy as np
+    import pandas as pd
+    ids = _as_keys(player_ids)
+    if np.ndim(seasons) == 0:
+        seasons = [seasons] * len(ids)
+    seasons = _as_keys(seasons)
+    if len(seasons) != len(ids):
+        raise ValueError('player_ids and seasons must be the same length')
+    index = _INDEX.rosters()
+    valid = (ids.notna() & seasons.notna()).to_numpy()
+    keys = (ids.fillna(0).to_numpy('int64') * _SEASON_SPAN
+            + seasons.fillna(0).to_numpy('int64'))
+    pos = index['keys'].searchsorted(keys)
+    pos = np.minimum(pos, len(index['keys']) - 1)
+    found = valid & (index['keys'][pos] == keys)
+    pos = pos[found]
+    res = pd.DataFrame({'stats_player_seq': ids.to_numpy(),
+                        'season': seasons.to_numpy()}, index=ids.index)
+    for col, dtype in [('name', 'string'), ('school', 'string'),
+                       ('school_id', 'Int64')]:
+        values = pd.array([None] * len(res), dtype=dtype)
+        values[found] = index[col][pos]
+        res[col] = values
+    return res
+
+
+def lookup_seasons(seasons):
+    """
+    A function to find the season_id and year_stat_category_ids of many
+     seasons at once
+
+    Args:
+        seasons (list, array or pd.Series of int, YYYY)
+
+    Returns:
+        pd.DataFrame of season, season_id, batting_id, pitching_id and
+        fielding_id, one row per input in the same order (and with the
+        same index, given a Series); unknown seasons get nulls
+    """
+    keys = _as_keys(seasons)
+    res = _INDEX.seasons()['frame'].reindex(keys.to_numpy())
+    res.index = keys.index
+    res.insert(0, 'season', keys)
+    return res.astype('Int64')
 
 
 def _lookup_school_info(x):
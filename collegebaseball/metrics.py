@@ -8,60 +8,90 @@ created by Nathan Blumenfeld in Spring 2022
 """
 from collegebaseball import guts
 import numpy as np
+import pandas as pd
 
 
 # number of decimal places to round floats to
 ROUND_TO = 3
 
 
-def _calculate_pa(row):
+def _calculate_pa(df):
     """
     Returns:
-        The number of plate appearances by a player as an int
+        The number of plate appearances by each player as an int Series
         based on the following formula:
 
         PA = AB + BB + SF + SH + HBP - IBB
 
     """
-    PA = (row['AB'] + row['BB'] + row['SF'] + row['SH'] + row['HBP']
-          - row['IBB'])
+    PA = (df['AB'] + df['BB'] + df['SF'] + df['SH'] + df['HBP']
+          - df['IBB'])
+    if pd.api.types.is_integer_dtype(PA):
+        PA = PA.astype('int64')
     return PA
 
 
-def _calculate_woba(row):
+def _fill_numeric(df):
     """
+    Fills missing values of the numeric columns with 0.00, leaving text
+     columns (which may hold nulls) as they are
     """
-    if row['PA'] > 0:
-        season_weights = guts.get_season_linear_weights(
-            row['season'], row['division'])
-        numerator = (season_weights['wBB'].values[0] * row['BB']
-                     + season_weights['wHBP'].values[0] * row['HBP']
-                     + season_weights['w1B'].values[0] * row['1B']
-                     + season_weights['w2B'].values[0] * row['2B']
-                     + season_weights['w3B'].values[0] * row['3B']
-                     + season_weights['wHR'].values[0] * row['HR'])
-        denominator = row['PA']
-        return round(numerator / denominator, ROUND_TO)
-    else:
-        return 0.00
+    numeric = df.select_dtypes('number').columns
+    return df.fillna(value={col: 0.00 for col in numeric}, inplace=False)
 
 
-def _calculate_woba_against(row):
+def _get_season_weights(df):
     """
+    Joins the linear weights table against the season and division of
+     every row of a given DataFrame in a single merge
+
+    Args:
+        df(DataFrame): must include season and division columns
+
+    Returns:
+        DataFrame of linear weights, positionally aligned with df
+        (NaN for rows whose season/division has no weights)
     """
-    if row['BF'] > 0:
-        season_weights = guts.get_season_linear_weights(
-            row['season'], row['division'])
-        numerator = (season_weights['wBB'].values[0] * row['BB']
-                     + season_weights['wHBP'].values[0] * row['HB']
-                     + season_weights['w1B'].values[0] * row['1B-A']
-                     + season_weights['w2B'].values[0] * row['2B-A']
-                     + season_weights['w3B'].values[0] * row['3B-A']
-                     + season_weights['wHR'].values[0] * row['HR-A'])
-        denominator = row['BF']
-        return round(numerator / denominator, ROUND_TO)
-    else:
-        return 0.00
+    keys = pd.DataFrame({'season': df['season'].to_numpy().astype('int64'),
+                         'division': df['division'].to_numpy().astype('int64')})
+    weights = guts._read_table(guts.get_linear_weights_path())
+    weights = weights.astype({'season': 'int64', 'division': 'int64'})
+    weights = weights.drop_duplicates(subset=['season', 'division'])
+    return keys.merge(weights, how='left', on=['season', 'division'])
+
+
+def _calculate_woba(df, weights):
+    """
+    Returns:
+        wOBA of each player as a float ndarray
+    """
+    numerator = (weights['wBB'].to_numpy() * df['BB'].to_numpy()
+                 + weights['wHBP'].to_numpy() * df['HBP'].to_numpy()
+                 + weights['w1B'].to_numpy() * df['1B'].to_numpy()
+                 + weights['w2B'].to_numpy() * df['2B'].to_numpy()
+                 + weights['w3B'].to_numpy() * df['3B'].to_numpy()
+                 + weights['wHR'].to_numpy() * df['HR'].to_numpy())
+    PA = df['PA'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        res = np.round(numerator / PA, ROUND_TO)
+    return np.where(PA > 0, res, 0.00)
+
+
+def _calculate_woba_against(df, weights):
+    """
+    Returns:
+        wOBA-against of each pitcher as a float ndarray
+    """
+    numerator = (weights['wBB'].to_numpy() * df['BB'].to_numpy()
+                 + weights['wHBP'].to_numpy() * df['HB'].to_numpy()
+                 + weights['w1B'].to_numpy() * df['1B-A'].to_numpy()
+                 + weights['w2B'].to_numpy() * df['2B-A'].to_numpy()
+                 + weights['w3B'].to_numpy() * df['3B-A'].to_numpy()
+                 + weights['wHR'].to_numpy() * df['HR-A'].to_numpy())
+    BF = df['BF'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        res = np.round(numerator / BF, ROUND_TO)
+    return np.where(BF > 0, res, 0.00)
 
 
 def calculate_woba_manual(plate_appearances, walks, hits_by_pitch, singles,
@@ -96,17 +126,16 @@ def calculate_woba_manual(plate_appearances, walks, hits_by_pitch, singles,
         return 0.00
 
 
-def _calculate_wraa(row):
+def _calculate_wraa(df, weights):
     """
+    Returns:
+        wRAA of each player as a float ndarray
     """
-    if row['PA'] > 0:
-        season_weights = guts.get_season_linear_weights(
-            row['season'], row['division'])
-        return round(((row['wOBA'] - season_weights['wOBA'].values[0])
-                     / season_weights['wOBAScale'].values[0])
-                     * row['PA'], ROUND_TO)
-    else:
-        return 0.00
+    PA = df['PA'].to_numpy()
+    res = np.round(((df['wOBA'].to_numpy() - weights['wOBA'].to_numpy())
+                    / weights['wOBAScale'].to_numpy())
+                   * PA, ROUND_TO)
+    return np.where(PA > 0, res, 0.00)
 
 
 def calculate_wraa_manual(plate_appearances, woba,  season):
@@ -131,25 +160,20 @@ def calculate_wraa_manual(plate_appearances, woba,  season):
         return 0.00
 
 
-def _calculate_wrc(row):
+def _calculate_wrc(df, weights):
     """
-    Args:
-
     Returns:
-        The weighted runs created of a player as a float
+        The weighted runs created of each player as a float ndarray
         based on the following formula:
 
         wRC = [((wOBA - lgwOBA) / wOBAScale) + (lgR / PA))] * PA
     """
-    if row['PA'] > 0:
-        season_weights = guts.get_season_linear_weights(
-            row['season'], row['division'])
-        return round((((row['wOBA'] - season_weights['wOBA'].values[0])
-                       / season_weights['wOBAScale'].values[0])
-                      + season_weights['R/PA'].values[0])
-                     * row['PA'], ROUND_TO)
-    else:
-        return 0.00
+    PA = df['PA'].to_numpy()
+    res = np.round((((df['wOBA'].to_numpy() - weights['wOBA'].to_numpy())
+                     / weights['wOBAScale'].to_numpy())
+                    + weights['R/PA'].to_numpy())
+                   * PA, ROUND_TO)
+    return np.where(PA > 0, res, 0.00)
 
 
 def calculate_wrc_manual(plate_appearances, woba, season, division):
@@ -189,7 +213,7 @@ def add_batting_metrics(df, season = True):
     Returns:
         DataFrame of stats with additional columns
     """
-    df.loc[:, 'PA'] = df.apply(_calculate_pa, axis=1)
+    df.loc[:, 'PA'] = _calculate_pa(df)
     df = df.loc[df.PA > 0]
     df.loc[:, '1B'] = (df['H'] - df['2B'] - df['3B'] - df['HR'])
     df.loc[:, 'OBP'] = round((df['H'] + df['BB'] + df['IBB'] + df['HBP'])
@@ -209,37 +233,47 @@ def add_batting_metrics(df, season = True):
                                / (df['AB'] - df['K'] - df['HR']
                                   + df['SF']), ROUND_TO)
     if season:
-        df.loc[:, 'wOBA'] = df.apply(_calculate_woba, axis=1)
-        df.loc[:, 'wRAA'] = df.apply(_calculate_wraa, axis=1)
-        df.loc[:, 'wRC'] = df.apply(_calculate_wrc, axis=1)
+        weights = _get_season_weights(df)
+        df.loc[:, 'wOBA'] = _calculate_woba(df, weights)
+        df.loc[:, 'wRAA'] = _calculate_wraa(df, weights)
+        df.loc[:, 'wRC'] = _calculate_wrc(df, weights)
     else:
         df['wOBA'] = np.nan
         df['wRAA'] = np.nan
         df['wRC'] = np.nan
-    df = df.fillna(value=0.00, inplace=False)
+    df = _fill_numeric(df)
     return df
 
 
 def _adjust_innings_pitched(df):
-    full_innings = int(df['IP'])
-    partial_innings = df['IP'] % 1
-    adj_innings = round(partial_innings*(10/3), ROUND_TO)
-    res = full_innings + adj_innings
-    return float(res)
+    """
+    Converts the NCAA's innings pitched notation (where .1 and .2 are
+     one and two outs) to true fractional innings
+
+    Returns:
+        float Series of adjusted innings pitched
+    """
+    IP = df['IP'].astype('float64')
+    full_innings = np.floor(IP)
+    partial_innings = np.mod(IP, 1)
+    adj_innings = np.round(partial_innings*(10/3), ROUND_TO)
+    return full_innings + adj_innings
 
 
-def _calculate_fip(row):
+def _calculate_fip(df, weights):
     """
+    Returns:
+        FIP of each pitcher as a float ndarray
     """
-    if row['IP-adj'] > 0:
-        season_weights = guts.get_season_linear_weights(
-            row['season'], row['division'])
-        res = round(((13 * row['HR-A'] + 3 * (row['BB'] + row['HB']) - 2 *
-                    row['SO']) / row['IP-adj'])
-                    + season_weights['cFIP'].values[0], 3)
-        return res
-    else:
-        return 0.00
+    IP = df['IP-adj'].to_numpy()
+    HR = df['HR-A'].to_numpy().astype('int64')
+    BB = df['BB'].to_numpy().astype('int64')
+    HB = df['HB'].to_numpy().astype('int64')
+    SO = df['SO'].to_numpy().astype('int64')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        res = np.round(((13 * HR + 3 * (BB + HB) - 2 * SO) / IP)
+                       + weights['cFIP'].to_numpy(), ROUND_TO)
+    return np.where(IP > 0, res, 0.00)
 
 
 def calculate_fip_manual(homeruns, walks, hit_batters, strikeouts, innings_pitched, season, division):
@@ -277,7 +311,7 @@ def add_pitching_metrics(df, season = True):
     Returns:
         DataFrame of stats with additional columns
     """
-    df['IP-adj'] = df.apply(_adjust_innings_pitched, axis=1)
+    df['IP-adj'] = _adjust_innings_pitched(df)
     df['1B-A'] = df['H']-df['HR-A']-df['3B-A']-df['2B-A']
     df.loc[:, 'OBP-against'] = round((df['H'] + df['BB'] + df['IBB']
                                       + df['HB']) /
@@ -307,8 +341,9 @@ def add_pitching_metrics(df, season = True):
                                        / (df['BF'] - df['SO']
                                           - df['HR-A'] + df['SFA']), ROUND_TO)
     if season:
-        df.loc[:, 'FIP'] = df.apply(_calculate_fip, axis=1)
-        df.loc[:, 'wOBA-against'] = df.apply(_calculate_woba_against, axis=1)
+        weights = _get_season_weights(df)
+        df.loc[:, 'FIP'] = _calculate_fip(df, weights)
+        df.loc[:, 'wOBA-against'] = _calculate_woba_against(df, weights)
     else:
         df.loc[:, 'FIP'] = np.nan
         df.loc[:, 'wOBA-against'] = np.nan
@@ -333,5 +368,5 @@ def add_pitching_metrics(df, season = True):
         df = df.drop(columns=['Pitches/IP'], inplace=False)
     if len(df.loc[df['Pitches/PA'] > 0]) < 1:
         df = df.drop(columns=['Pitches/PA'], inplace=False)
-    df = df.fillna(value=0.00, inplace=False)
+    df = _fill_numeric(df)
     return df
@@ -0,0 +1,270 @@
+"""
+ncaa_parser.py
+
+Table extraction for stats.ncaa.org pages, working directly on an lxml
+tree instead of a BeautifulSoup one. Each helper reproduces what the
+scrapers used to read off the BeautifulSoup tree (`.string`, `.text`,
+`.attrs`, `find_all`), so parsed values are unchanged
+"""
+from lxml import etree
+
+
+def parse_document(text):
+    """
+    Parses an HTML page
+
+    Args:
+        text (str or bytes): the page, e.g. requests.Response.text
+
+    Returns:
+        the root lxml element, or None for an empty page
+    """
+    if not text:
+        return None
+    if isinstance(text, str):
+        text = text.encode('utf-8')
+    return etree.fromstring(text, etree.HTMLParser(encoding='utf-8'))
+
+
+def find_tables(root, table_id=None):
+    """
+    Returns:
+        list of every <table> in the page (in document order), optionally
+        only those with the given id
+    """
+    if root is None:
+        return []
+    if table_id is None:
+        return root.xpath('//table')
+    return root.xpath('//table[@id=$table_id]', table_id=table_id)
+
+
+def is_tag(el):
+    """
+    False for comments and processing instructions, which lxml counts as
+     children but BeautifulSoup does not treat as tags
+    """
+    return isinstance(el.tag, str)
+
+
+def element_string(el):
+    """
+    An element's only string, as BeautifulSoup's `Tag.string`: its text
+     if that is its single child, the only string of its single child
+     element otherwise, and None if it has more (or no) children
+    """
+    children = list(el)
+    count = (1 if el.text else 0) + len(children) + sum(
+        1 for child in children if child.tail)
+    if count != 1:
+        return None
+    if el.text:
+        return el.text
+    child = children[0]
+    if not is_tag(child):
+        return child.text
+    return element_string(child)
+
+
+def element_text(el):
+    """
+    All text under an element, as BeautifulSoup's `Tag.text`
+    """
+    return ''.join(el.itertext())
+
+
+def first_link(el):
+    """
+    Returns:
+        the first <a> under el, as BeautifulSoup's `Tag.a`, or None
+    """
+    return next(el.iterdescendants('a'), None)
+
+
+def links(el):
+    """
+    Returns:
+        list of every <a> under el, as BeautifulSoup's `find_all('a')`
+    """
+    return list(el.iterdescendants('a'))
+
+
+def header_strings(table):
+    """
+    Returns:
+        the stripped, non-empty strings of the first header row of a
+        table, as BeautifulSoup's `table.thead.tr.stripped_strings`
+    """
+    tr = table.find('.//thead').find('.//tr')
+    return [s.strip() for s in tr.xpath('.//text()') if s.strip()]
+
+
+def stat_grid(page, section='tbody', player_links=False, last=True):
+    """
+    Pulls the rows of a stat_grid table (team stats and totals pages)
+
+    Args:
+        page (str): the page, or its root from parse_document
+        section (str, optional): 'tbody' for player rows, 'tfoot' for
+         team totals
+        player_links (bool, optional): whether to read the player's
+         stats_player_seq from the link in each linked cell, inserting it
+         (or '-' if the link has no href) ahead of the cell's string
+        last (bool, optional): use the last stat_grid table on the page
+         rather than the first
+
+    Returns:
+        (headers, rows), or None if the page has no stat_grid table
+    """
+    if isinstance(page, (str, bytes)):
+        page = parse_document(page)
+    grids = find_tables(page, 'stat_grid')
+    if len(grids) < 1:
+        return None
+    table = grids[-1] if last else grids[0]
+    headers = header_strings(table)
+    rows = []
+    for tr in table.find('.//' + section).iterdescendants('tr'):
+        row = []
+        for td in tr.iterdescendants('td'):
+            order = td.get('data-order')
+            if order is not None:
+                row.append(order)
+                continue
+            if player_links:
+                a = first_link(td)
+                if a is not None:
+                    href = a.get('href')
+                    if href is not None:
+                        row.append(int(href.split('&')[-1].split('=')[-1]))
+                    else:
+                        row.append('-')
+            row.append(element_string(td))
+        rows.append(row)
+    return headers, rows
+
+
+def career_table(text):
+    """
+    Pulls the season-by-season table of a player's career page
+
+    Args:
+        text (str): the page
+
+    Returns:
+        (headers, rows, last_row): the header strings, every completed
+        season row, and the trailing row (which the page's 'Career' cells
+        are appended to)
+    """
+    table = find_tables(parse_document(text))[2]
+    headers = [element_string(th).strip()
+               for th in table.iterdescendants('th')]
+    rows = []
+    row = []
+    for td in table.iterdescendants('td'):
+        order = td.get('data-order')
+        if order is not None:
+            row.append(order)
+            continue
+        a = first_link(td)
+        if a is not None:
+            row.append(a.get('href').split('/')[2])
+            continue
+        value = element_text(td).strip()
+        if value != 'Career' and td.get('width') is None:
+            if row != []:
+                rows.append(row)
+            row = [value]
+        elif value != 'Career':
+            row.append(value)
+    return headers, rows, row
+
+
+def game_log_rows(text):
+    """
+    Returns:
+        the game rows (<tr> without an id, after the three header rows)
+        of the game-by-game table of a game log page
+    """
+    table = find_tables(parse_document(text))[3]
+    return [tr for tr in table.iterdescendants('tr')
+            if tr.get('id') is None][3:]
+
+
+def _read_cell(state, link, string, text):
+    """
+    Updates state ([date, opponent_id, opponent, score, game_id]) from one
+     cell of a game row that is not a stat
+
+    Args:
+        link: None, or (href, string of the cell's first <a>, href, text
+         of its last <a>)
+        string: the cell's only string (BeautifulSoup's `.string`)
+        text: all text in the cell
+    """
+    if link is not None:
+        first_href, first_string, last_href, last_text = link
+        if 'box_score' in last_href:
+            state[3] = first_string.strip()
+            state[4] = first_href.split('/')[-2]
+        elif 'team' in last_href:
+            state[1] = last_href.split('/')[2]
+            state[2] = last_text.strip()
+        elif 'game/index' in last_href:
+            state[4] = last_href.split('/')[-1].split('?')[0]
+            state[3] = first_string.strip()
+        else:
+            state[2] = text.strip()
+            state[1] = '-'
+    elif '/' in (string or ''):
+        state[0] = string
+    elif text.strip() == '-':
+        state[3] = state[4] = '-'
+    else:
+        state[2] = text.strip()
+        state[1] = '-'
+
+
+def game_log_cells(text):
+    """
+    Reads the game-by-game table of a game log page, visiting each cell
+     once. Stat cells are the ones with a data-order (and no link); the
+     date, opponent and score cells are told apart by their links and
+     text
+
+    Args:
+        text (str): the page
+
+    Returns:
+        list of (stats, date, opponent_id, opponent, score, game_id), one
+        per game row: the raw stat strings, then the raw date, opponent
+        text (e.g. '@ Penn St.') and score (e.g. 'W 3 - 1 (10)'). A value
+        a row lacks is carried over from the row before it
+    """
+    state = [None] * 5
+    res = []
+    for tr in game_log_rows(text):
+        stats = []
+        for td in tr:
+            if not is_tag(td):
+                continue
+            order = td.get('data-order')
+            if not len(td):
+                if order is not None:
+                    stats.append(order)
+                    continue
+                _read_cell(state, None, td.text, td.text or '')
+                continue
+            a = first_link(td)
+            if a is None and order is not None:
+                stats.append(order)
+                continue
+            link = None
+            if a is not None:
+                last = links(td)[-1]
+                link = (a.get('href'), element_string(a), last.get('href'),
+                        element_text(last))
+            _read_cell(state, link, element_string(td), element_text(td))
+        res.append((stats,) + tuple(state))
+    return res
+
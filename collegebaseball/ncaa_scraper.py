@@ -5,36 +5,277 @@ A module to scrape and parse college baseball statistics from stats.ncaa.org
 
 created by Nathan Blumenfeld in Spring 2022
 """
+import contextvars
+import logging
 import pandas as pd
-from time import sleep
-import random
-from bs4 import BeautifulSoup, Tag
-from collegebaseball import metrics, ncaa_utils, lookup
+from contextlib import contextmanager
+from time import perf_counter
+import threading
+from urllib.parse import urlsplit
+from bs4 import BeautifulSoup
+from collegebaseball import metrics, ncaa_utils, ncaa_parser, lookup, http_cache
+from collegebaseball import instrument, rate_limit, schemas, telemetry
 from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 # GET request options
 _HEADERS = {'User-Agent': 'Mozilla/5.0'}
 _TIMEOUT = 4
+# (connect, read) timeouts in seconds, passed to every request
+_REQUEST_TIMEOUT = (_TIMEOUT, 30)
+# 403 is how stats.ncaa.org signals rate-limiting, so it is retried too
+_RETRY_STATUSES = (403, 429, 500, 502, 503, 504)
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+# opt-in on-disk response cache, see enable_cache()
+_CACHE = None
+# per-thread record of whether the last _get was served from the cache
+_LOCAL = threading.local()
+# requests per second sent to each host unless set_rate_limiter() says
+# otherwise, the mean pace of the random 0-4s pauses ncaa_team_roster
+# used to take between seasons
+_DEFAULT_RATE = 0.5
+# rate_limit.HostRateLimiter applied to every network request, or None
+_RATE_LIMITER = rate_limit.HostRateLimiter(_DEFAULT_RATE)
+# limiter of the bulk job running in the current context, see
+# rate_limited(); unset outside one, where _RATE_LIMITER applies
+_JOB_LIMITER = contextvars.ContextVar('collegebaseball_rate_limiter')
+# blocked (403) requests are reported here; bulk downloads also record
+# them as 'blocked' in their telemetry.BulkResult
+_LOGGER = logging.getLogger(__name__)
+
+
+class _PacedRetry(Retry):
+    """
+    Retry that takes a token from the current rate limiter before each
+     retried attempt, so a burst of 403/429/5xx answers is retried at the
+     pace of new requests
+    """
 
+    def increment(self, method=None, url=None, response=None, error=None,
+                  _pool=None, _stacktrace=None):
+        new = super().increment(method, url, response, error, _pool,
+                                _stacktrace)
+        limiter = _current_limiter()
+        if limiter is not None and _pool is not None:
+            limiter.acquire(_pool.host)
+        return new
 
-def ncaa_team_stats(school, season, variant, include_advanced=True,
-                    split=None):
+
+def create_session(pool_size=10, max_retries=3, backoff_factor=1.0):
     """
-    Obtains player-level single-season aggregate stats
-     for all players from a given school, from stats.ncaa.org
+    Builds a requests Session with a keep-alive connection pool and
+     retry with exponential backoff on 403/429/5xx responses, each retry
+     rate limited like a new request
 
     Args:
-        school: schools (str) or NCAA school_id (int)
-        season: season (int, YYYY) or NCAA season_id (int), valid 2013-2022
-        variant (str): 'batting', 'pitching', or 'fielding'
-        include_advanced (bool, optional). Whether to
-         automatically calcuate advanced metrics, Defaults to True
-        split (str, optional): 'vs_LH', 'vs_RH', 'runners_on', 'bases_empty',
-        'bases_loaded', 'with_RISP', 'two_outs'
+        pool_size (int): max connections kept open per host, should be at
+         least the number of threads sharing the session
+        max_retries (int): retries per request before giving up
+        backoff_factor (float): retries sleep backoff_factor * 2^(n-1)
+         seconds, or honor the response's Retry-After header
 
     Returns:
-       pd.DataFrame
+        requests.Session
+    """
+    retry = _PacedRetry(total=max_retries, backoff_factor=backoff_factor,
+                  status_forcelist=_RETRY_STATUSES,
+                  allowed_methods=['GET'], raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                          max_retries=retry)
+    session = Session()
+    session.headers.update(_HEADERS)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session():
+    """
+    Returns the session shared by every ncaa_scraper function,
+     creating it with default settings on first use
+    """
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                _SESSION = create_session()
+    return _SESSION
+
+
+def set_session(session=None, timeout=None):
+    """
+    Replaces the session shared by every ncaa_scraper function, e.g. with
+     a larger pool from create_session() for a multi-threaded bulk job
+
+    Args:
+        session (requests.Session, optional): the new shared session.
+         None discards the current one so the default is rebuilt lazily
+        timeout (tuple, optional): new (connect, read) timeouts in seconds
+    """
+    global _SESSION, _REQUEST_TIMEOUT
+    with _SESSION_LOCK:
+        old, _SESSION = _SESSION, session
+        if timeout is not None:
+            _REQUEST_TIMEOUT = timeout
+    if old is not None and old is not session:
+        old.close()
+
+
+def set_rate_limiter(limiter=None):
+    """
+    Limits the rate of network requests made by every ncaa_scraper
+     function (cached responses are not limited). By default each host
+     gets _DEFAULT_RATE requests per second
+
+    Args:
+        limiter (rate_limit.HostRateLimiter, optional): None to disable
+
+    Returns:
+        the previous limiter, so it can be restored
+    """
+    global _RATE_LIMITER
+    previous, _RATE_LIMITER = _RATE_LIMITER, limiter
+    return previous
+
+
+@contextmanager
+def rate_limited(limiter):
+    """
+    Limits the network requests made inside the block with limiter
+     instead of the one from set_rate_limiter(). The limiter lives in a
+     context variable, so it follows the block into threads run in a
+     copy of its context, and concurrent bulk jobs each keep their own
+
+    Args:
+        limiter (rate_limit.HostRateLimiter): None for no limit
+    """
+    token = _JOB_LIMITER.set(limiter)
+    try:
+        yield limiter
+    finally:
+        _JOB_LIMITER.reset(token)
+
+
+def _current_limiter():
+    """
+    Returns:
+        the rate limiter that applies to the calling context, or None
+    """
+    return _JOB_LIMITER.get(_RATE_LIMITER)
+
+
+def enable_cache(directory=None, **kwargs):
+    """
+    Turns on the on-disk response cache for every ncaa_scraper function.
+     Pages are keyed by url and query parameters, so repeat scrapes of
+     completed seasons never touch the network
+
+    Args:
+        directory (str, optional): defaults to ~/.cache/collegebaseball/http
+        **kwargs: max_bytes, current_ttl, completed_ttl and season_ttls,
+         see http_cache.ResponseCache
+
+    Returns:
+        the http_cache.ResponseCache in use
+    """
+    global _CACHE
+    _CACHE = http_cache.ResponseCache(directory, **kwargs)
+    return _CACHE
+
+
+def disable_cache():
+    """
+    Turns off the on-disk response cache (entries stay on disk)
+    """
+    global _CACHE
+    _CACHE = None
+
+
+def get_cache():
+    """
+    Returns:
+        the http_cache.ResponseCache in use, or None if caching is off
+    """
+    return _CACHE
+
+
+def set_cache(cache=None):
+    """
+    Installs a response cache other than the default on-disk one, e.g. a
+     replay.Cassette to run offline against recorded pages
+
+    Args:
+        cache (optional): anything with get(url, params, season) and
+         put(url, params, response), None to disable
+
+    Returns:
+        the previous cache, so it can be restored
+    """
+    global _CACHE
+    previous, _CACHE = _CACHE, cache
+    return previous
+
+
+def _get(url, params=None, season=None):
+    """
+    Sends a GET request through the shared session, or answers it from
+     the response cache if one is enabled
+
+    Args:
+        url (str)
+        params (dict, optional): query parameters
+        season (int, optional): season the page belongs to, which sets
+         how long its cached copy stays fresh
+    """
+    started = instrument.start()
+    cache = _CACHE
+    if cache is not None:
+        r = cache.get(url, params, season)
+        if r is not None:
+            _LOCAL.from_cache = True
+            if started is not None:
+                instrument.record('cache', started, len(r.content),
+                                  status=r.status_code)
+            telemetry.log_request(r, 0.0, cached=True)
+            return r
+    _LOCAL.from_cache = False
+    limiter = _current_limiter()
+    if limiter is not None:
+        limiter.acquire(urlsplit(url).hostname)
+    sent = perf_counter()
+    r = get_session().get(url, params=params, headers=_HEADERS,
+                          timeout=_REQUEST_TIMEOUT)
+    telemetry.log_request(r, perf_counter() - sent)
+    if started is not None:
+        instrument.record('fetch', started, len(r.content),
+                          status=r.status_code)
+    if cache is not None and r.status_code == 200:
+        cache.put(url, params, r)
+    return r
+
+
+def _last_request_cached():
+    """
+    Returns:
+        whether the calling thread's last request was served from the
+        response cache
+    """
+    return getattr(_LOCAL, 'from_cache', False)
+
+
+def _team_stats_page(school, season, variant, split=None):
+    """
+    Requests and parses the team stats page that both ncaa_team_stats
+     (its stat_grid body) and ncaa_team_totals (its stat_grid footer)
+     read from
+
+    Returns:
+        (page root, season, division), with a None root if the request
+        was blocked
     """
     season, season_id, batting_id, pitching_id, fielding_id = lookup._lookup_season_info(
         season)
@@ -51,53 +292,46 @@ def ncaa_team_stats(school, season, variant, include_advanced=True,
                'year_stat_category_id': str(year_stat_category_id)
                }
     if split is not None and variant != 'fielding':
-        available_stat_id = ncaa_utils.available_stat_ids[variant][season][split]
+        available_stat_id = schemas.get_registry().split_id(
+            variant, season, split)
         payload['available_stat_id'] = available_stat_id
-    with Session() as s:
-        r = s.get(url, params=payload, headers=_HEADERS)
+    r = _get(url, params=payload, season=season)
     if r.status_code == 403:
-        print('An error occurred with the GET Request')
-        print('403 Error: NCAA blocked request')
-        return pd.DataFrame()
-    soup = BeautifulSoup(r.text, features='lxml')
-    if len(soup.find_all(name='table', id='stat_grid')) < 1:
+        _LOGGER.warning('403 Error: NCAA blocked request for %s', url)
+        return None, season, division
+    return (instrument.timed('parse', ncaa_parser.parse_document, r.text),
+            season, division)
+
+
+def _team_stats_frame(page, season, division, variant, include_advanced,
+                      split):
+    """
+    Player-level stats from the stat_grid body of a team stats page
+    """
+    if page is None:
         return pd.DataFrame()
-    table = soup.find_all(name='table', id='stat_grid')[-1]
-    if table is None:
-        print('no data found')
+    started = instrument.start()
+    grid = ncaa_parser.stat_grid(page, 'tbody', player_links=True)
+    if grid is None:
         return pd.DataFrame()
-    headers = [x for x in table.thead.tr.stripped_strings]
+    headers, rows = grid
     headers.insert(headers.index('Player'), 'stats_player_seq')
     if season == 2022 and variant == 'batting':
         headers.remove('RBI2out')
-    rows = []
-    for i in table.tbody.find_all('tr'):
-        row = []
-        for j in i.find_all('td'):
-            if 'data-order' in j.attrs:
-                row.append(j.attrs['data-order'])
-            else:
-                if j.find('a') is not None:
-                    if 'href' in j.a.attrs:
-                        row.append(
-                            int(j.a.attrs['href'].split('&')[-1].split('=')[-1]))
-                    else:
-                        row.append('-')
-                row.append(j.string)
-        if len(row) > len(headers):
-            row = row[:-1]
-        rows.append(row)
+    rows = [row[:-1] if len(row) > len(headers) else row for row in rows]
     df = pd.DataFrame(rows, columns=headers)
+    instrument.record('parse', started, rows=len(df))
     if len(df) < 1:
         return pd.DataFrame()
     df.columns = headers
     df['season'] = season
     df['division'] = division
-    res = ncaa_utils._transform_stats(df)
+    res = instrument.timed('transform', ncaa_utils._transform_stats, df)
     if variant == 'batting':
         if include_advanced:
             if len(res) > 0:
-                res = metrics.add_batting_metrics(res)
+                res = instrument.timed('metrics', metrics.add_batting_metrics,
+                                       res)
                 res = res.loc[res.PA > 0]
     elif variant == 'pitching':
         if split is None:
@@ -105,10 +339,74 @@ def ncaa_team_stats(school, season, variant, include_advanced=True,
                 res = res.loc[res.App > 0]
         if include_advanced:
             if len(res) > 0:
-                res = metrics.add_pitching_metrics(res)
+                res = instrument.timed('metrics', metrics.add_pitching_metrics,
+                                       res)
+    return res
+
+
+def _team_totals_frame(page, season, division, variant, include_advanced):
+    """
+    Team-level totals from the stat_grid footer of a team stats page
+    """
+    if page is None:
+        return pd.DataFrame()
+    started = instrument.start()
+    grid = ncaa_parser.stat_grid(page, 'tfoot', last=False)
+    if grid is None:
+        print('no data found')
+        return pd.DataFrame()
+    headers, rows = grid
+    if season == 2022 and variant == 'batting':
+        headers.remove('RBI2out')
+    rows = [row[:-1] if len(row) > len(headers) else row for row in rows]
+    df = pd.DataFrame(rows, columns=headers)
+    instrument.record('parse', started, rows=len(df))
+    df['season'] = season
+    df['division'] = division
+    res = instrument.timed('transform', ncaa_utils._transform_stats, df)
+    cols_to_drop = ['Jersey', 'Yr', 'pos', 'GP', 'GS', 'App']
+    for i in cols_to_drop:
+        if i in res.columns:
+            res = res.drop(columns=[i], inplace=False)
+    if variant == 'batting':
+        if include_advanced:
+            if len(res) > 0:
+                res = instrument.timed('metrics', metrics.add_batting_metrics,
+                                       res)
+                res = res.loc[res.PA > 0]
+    elif variant == 'pitching':
+        if include_advanced:
+            if len(res) > 0:
+                res = instrument.timed('metrics', metrics.add_pitching_metrics,
+                                       res)
     return res
 
 
+@instrument.entry_point
+def ncaa_team_stats(school, season, variant, include_advanced=True,
+                    split=None):
+    """
+    Obtains player-level single-season aggregate stats
+     for all players from a given school, from stats.ncaa.org
+
+    Args:
+        school: schools (str) or NCAA school_id (int)
+        season: season (int, YYYY) or NCAA season_id (int), valid 2013-2022
+        variant (str): 'batting', 'pitching', or 'fielding'
+        include_advanced (bool, optional). Whether to
+         automatically calcuate advanced metrics, Defaults to True
+        split (str, optional): 'vs_LH', 'vs_RH', 'runners_on', 'bases_empty',
+        'bases_loaded', 'with_RISP', 'two_outs'
+
+    Returns:
+       pd.DataFrame
+    """
+    page, season, division = _team_stats_page(school, season, variant, split)
+    return _team_stats_frame(page, season, division, variant,
+                             include_advanced, split)
+
+
+@instrument.entry_point
 def ncaa_career_stats(stats_player_seq, variant, include_advanced=True):
     """
     Obtains season-aggregate stats for all seasons in a given player's
@@ -123,7 +421,7 @@ def ncaa_career_stats(stats_player_seq, variant, include_advanced=True):
     Returns:
         pd.DataFrame
     """
-    season = lookup.lookup_seasons_played(stats_player_seq)[0]
+    season, last_season = lookup.lookup_seasons_played(stats_player_seq)
     season, season_id, batting_id, pitching_id, fielding_id = lookup._lookup_season_info(
         season)
     if variant == 'batting':
@@ -135,34 +433,16 @@ def ncaa_career_stats(stats_player_seq, variant, include_advanced=True):
     payload = {'id': str(season_id), 'stats_player_seq': str(stats_player_seq),
                'year_stat_category_id': str(year_stat_category_id)}
     url = 'https://stats.ncaa.org/player/index'
-    with Session() as s:
-        r = s.get(url, params=payload, headers=_HEADERS)
+    r = _get(url, params=payload, season=last_season)
     if r.status_code == 403:
-        print('403 Error: NCAA blocked request')
+        _LOGGER.warning('403 Error: NCAA blocked request for %s', url)
         return pd.DataFrame()
-    soup = BeautifulSoup(r.text, features='lxml')
-    table = soup.find_all('table')[2]
-    headers = []
-    for val in table.find_all('th'):
-        headers.append(val.string.strip())
-    rows = []
-    row = []
-    for val in table.find_all('td'):
-        if 'data-order' in val.attrs:
-            row.append(val['data-order'])
-        elif val.a is not None:
-            row.append(val.a.attrs['href'].split('/')[2])
-        elif val.text.strip() != 'Career' and 'width' not in val.attrs:
-            if row != []:
-                rows.append(row)
-            row = []
-            row.append(val.text.strip())
-        else:
-            if val.text.strip() != 'Career':
-                row.append(val.text.strip())
+    started = instrument.start()
+    headers, rows, row = ncaa_parser.career_table(r.text)
+    instrument.record('parse', started, rows=len(rows))
     df = pd.DataFrame(rows)
     df.columns = headers
-    df = ncaa_utils._transform_stats(df)
+    df = instrument.timed('transform', ncaa_utils._transform_stats, df)
     school, school_id, division = lookup._lookup_school_info(
         int(df['school_id'].values[0]))
     df['division'] = division
@@ -173,14 +453,17 @@ def ncaa_career_stats(stats_player_seq, variant, include_advanced=True):
     if variant == 'batting':
         if include_advanced:
             if len(df) > 0:
-                df = metrics.add_batting_metrics(df)
+                df = instrument.timed('metrics', metrics.add_batting_metrics,
+                                      df)
                 df = df.loc[df.PA > 0]
     elif variant == 'pitching':
         if include_advanced:
             if len(df) > 0:
-                df = metrics.add_pitching_metrics(df)
+                df = instrument.timed('metrics', metrics.add_pitching_metrics,
+                                      df)
     return df
 
+@instrument.entry_point
 def ncaa_career_aggregated(stats_player_seq, variant, include_advanced=True):
     """
     Obtains career-aggregate stats for a given player's
@@ -195,7 +478,7 @@ def ncaa_career_aggregated(stats_player_seq, variant, include_advanced=True):
     Returns:
         pd.DataFrame
     """
-    season = lookup.lookup_seasons_played(stats_player_seq)[0]
+    season, last_season = lookup.lookup_seasons_played(stats_player_seq)
     season, season_id, batting_id, pitching_id, fielding_id = lookup._lookup_season_info(
         season)
     if variant == 'batting':
@@ -207,37 +490,18 @@ def ncaa_career_aggregated(stats_player_seq, variant, include_advanced=True):
     payload = {'id': str(season_id), 'stats_player_seq': str(stats_player_seq),
                'year_stat_category_id': str(year_stat_category_id)}
     url = 'https://stats.ncaa.org/player/index'
-    with Session() as s:
-        r = s.get(url, params=payload, headers=_HEADERS)
+    r = _get(url, params=payload, season=last_season)
     if r.status_code == 403:
-        print('403 Error: NCAA blocked request')
+        _LOGGER.warning('403 Error: NCAA blocked request for %s', url)
         return pd.DataFrame()
-    soup = BeautifulSoup(r.text, features='lxml')
-    table = soup.find_all('table')[2]
-    headers = []
-    for val in table.find_all('th'):
-        headers.append(val.string.strip())
-    rows = []
-    row = []
-    for val in table.find_all('td'):
-        # print(val, '\n')
-        if 'data-order' in val.attrs:
-            row.append(val['data-order'])
-        elif val.a is not None:
-            row.append(val.a.attrs['href'].split('/')[2])
-        elif val.text.strip() != 'Career' and 'width' not in val.attrs:
-            if row != []:
-                rows.append(row)
-            row = []
-            row.append(val.text.strip())
-        else:
-            if val.text.strip() != 'Career':
-                row.append(val.text.strip())
+    started = instrument.start()
+    headers, rows, row = ncaa_parser.career_table(r.text)
+    instrument.record('parse', started, rows=len(rows))
     df = pd.DataFrame([row])
     df.insert(1, 'tm', [0])
     df.columns = headers
     df['Year'] = 0
-    df = ncaa_utils._transform_stats(df)
+    df = instrument.timed('transform', ncaa_utils._transform_stats, df)
     df['division'] = 0
     df['school'] = 0
     df['division'] = df['division'].astype('int8')
@@ -246,15 +510,18 @@ def ncaa_career_aggregated(stats_player_seq, variant, include_advanced=True):
     if variant == 'batting':
         if include_advanced:
             if len(df) > 0:
-                df = metrics.add_batting_metrics(df, season=False)
+                df = instrument.timed('metrics', metrics.add_batting_metrics,
+                                      df, season=False)
                 df = df.loc[df.PA > 0]
     elif variant == 'pitching':
         if include_advanced:
             if len(df) > 0:
-                df = metrics.add_pitching_metrics(df, season=False)
+                df = instrument.timed('metrics', metrics.add_pitching_metrics,
+                                      df, season=False)
     return df
 
 
+@instrument.entry_point
 def ncaa_team_totals(school, season, variant, include_advanced=True,
                      split=None):
     """
@@ -273,71 +540,101 @@ def ncaa_team_totals(school, season, variant, include_advanced=True,
     Returns:
         pd.DataFrame
     """
-    school, school_id, division = lookup._lookup_school_info(school)
-    season, season_id, batting_id, pitching_id, fielding_id = lookup._lookup_season_info(
-        season)
-    if variant == 'batting':
-        year_stat_category_id = batting_id
-    elif variant == 'pitching':
-        year_stat_category_id = pitching_id
-    else:
-        year_stat_category_id = fielding_id
-    url = 'https://stats.ncaa.org/team/'+str(school_id)+'/stats'
-    payload = {'game_sport_year_ctl_id': str(season_id),
-               'id': str(season_id),
-               'year_stat_category_id': str(year_stat_category_id)
-               }
-    if split is not None and variant != 'fielding':
-        available_stat_id = ncaa_utils.available_stat_ids[variant][season][split]
-        payload['available_stat_id'] = available_stat_id
-    with Session() as s:
-        r = s.get(url, params=payload, headers=_HEADERS)
-    if r.status_code == 403:
-        print('An error occurred with the GET Request')
-        print('403 Error: NCAA blocked request')
-        return pd.DataFrame()
-    soup = BeautifulSoup(r.text, features='lxml')
-    if len(soup.find_all(name='table', id='stat_grid')) < 1:
-        print('no data found')
-        return pd.DataFrame()
-    table = soup.find(name='table', id='stat_grid')
-    if table is None:
-        print('no data found')
-        return pd.DataFrame()
-    headers = [x for x in table.thead.tr.stripped_strings]
-    if season == 2022 and variant == 'batting':
-        headers.remove('RBI2out')
-    rows = []
-    for i in table.tfoot.find_all('tr'):
-        row = []
-        for j in i.find_all('td'):
-            if 'data-order' in j.attrs:
-                row.append(j.attrs['data-order'])
-            else:
-                row.append(j.string)
-        if len(row) > len(headers):
-            row = row[:-1]
-        rows.append(row)
-    df = pd.DataFrame(rows, columns=headers)
-    df['season'] = season
-    df['division'] = division
-    res = ncaa_utils._transform_stats(df)
-    cols_to_drop = ['Jersey', 'Yr', 'pos', 'GP', 'GS', 'App']
-    for i in cols_to_drop:
-        if i in res.columns:
-            res = res.drop(columns=[i], inplace=False)
-    if variant == 'batting':
+    page, season, division = _team_stats_page(school, season, variant, split)
+    return _team_totals_frame(page, season, division, variant,
+                              include_advanced)
+
+
+@instrument.entry_point
+def ncaa_team_stats_and_totals(school, season, variant, include_advanced=True,
+                               split=None):
+    """
+    Obtains both the player-level stats of ncaa_team_stats and the
+     team-level totals of ncaa_team_totals for a given team with a single
+     request to stats.ncaa.org, since both come from the same page
+
+    Args:
+        school: schools (str) or NCAA school_id (int)
+        season: season (int, YYYY) or NCAA season_id (int), valid 2013-2022
+        variant (str): 'batting', 'pitching', or 'fielding'
+        include_advanced (bool, optional). Whether to
+         automatically calcuate advanced metrics, Defaults to True
+        split (str, optional): 'vs_LH', 'vs_RH', 'runners_on', 'bases_empty',
+        'bases_loaded', 'with_RISP', 'two_outs'
+
+    Returns:
+        tuple of pd.DataFrame: (player stats, team totals)
+    """
+    page, season, division = _team_stats_page(school, season, variant, split)
+    return (_team_stats_frame(page, season, division, variant,
+                              include_advanced, split),
+            _team_totals_frame(page, season, division, variant,
+                               include_advanced))
+
+
+def _game_log_frame(text, schema, season_id, school_id, player_id=None):
+    """
+    Parses a game-by-game page into its raw game log, one row per game
+
+    Args:
+        text (str): the page
+        schema (schemas.Schema): layout of the page's table
+        season_id (int), school_id (int)
+        player_id (int, optional): stats_player_seq, for player game logs
+
+    Returns:
+        pd.DataFrame with schema.columns, values as parsed
+    """
+    rows = ncaa_parser.game_log_cells(text)
+    buffer = schema.buffer(len(rows))
+    prev_game_id = 0
+    for stats, date, opponent_id, opponent, score, game_id in rows:
+        runs_scored, runs_allowed, run_diff, result, ip, extras = ncaa_utils._parse_score(
+            score)
+        if buffer.fits(stats) and ((game_id != prev_game_id) or (result == 'cancelled')):
+            prev_game_id = game_id
+            opponent_name, field = ncaa_utils._parse_opponent_info(opponent)
+            meta = (date, field, season_id, opponent_id, opponent_name, ip,
+                    extras, runs_scored, runs_allowed, run_diff, result,
+                    game_id, school_id)
+            if player_id is not None:
+                meta += (player_id,)
+            buffer.append(stats, meta)
+    return pd.DataFrame(buffer.columns())
+
+
+def _game_logs(schema, payload, season, season_id, school_id, division,
+               include_advanced, player_id=None):
+    """
+    Requests a game-by-game page and returns its cleaned game log, shared
+     by ncaa_player_game_logs and ncaa_team_game_logs
+    """
+    url = 'https://stats.ncaa.org/player/game_by_game?'
+    r = _get(url, params=payload, season=season)
+    res = instrument.timed('parse', _game_log_frame, r.text, schema,
+                           season_id, school_id, player_id)
+    if not res.empty:
+        res['season'] = season
+        res['division'] = division
+        res = res.loc[res.field.isin(['away', 'home', 'neutral'])]
+        res = instrument.timed('transform', ncaa_utils._transform_stats,
+                               res)
+    if schema.variant == 'batting':
         if include_advanced:
             if len(res) > 0:
-                res = metrics.add_batting_metrics(res)
+                res = instrument.timed('metrics', metrics.add_batting_metrics,
+                                       res)
                 res = res.loc[res.PA > 0]
-    elif variant == 'pitching':
+    elif schema.variant == 'pitching':
         if include_advanced:
             if len(res) > 0:
-                res = metrics.add_pitching_metrics(res)
+                res = res.loc[res.IP > 0]
+                res = instrument.timed('metrics', metrics.add_pitching_metrics,
+                                       res)
     return res
 
 
+@instrument.entry_point
 def ncaa_player_game_logs(player, season, variant, school=None, include_advanced=True):
     """
     Obtains player-level game-by-game stats for a given player in 
@@ -372,7 +669,7 @@ def ncaa_player_game_logs(player, season, variant, school=None, include_advanced
         else:
             return 'must give a player_id if no school given'
     stats_player_seq = str(player_id)
-    headers = ncaa_utils.player_gamelog_headers[variant][season]
+    schema = schemas.get_schema('player_game_logs', variant, season)
     if variant == 'batting':
         year_stat_category_id = batting_id
     elif variant == 'pitching':
@@ -383,87 +680,11 @@ def ncaa_player_game_logs(player, season, variant, school=None, include_advanced
                'org_id': str(school_id),
                'stats_player_seq': str(stats_player_seq),
                'year_stat_category_id': str(year_stat_category_id)}
-    url = 'https://stats.ncaa.org/player/game_by_game?'
-    with Session() as s:
-        r = s.get(url, params=payload, headers=_HEADERS)
-    soup = BeautifulSoup(r.text, features='lxml')
-    table = soup.find_all('table')[3]
-    if table is None:
-        print('no data found')
-        return pd.DataFrame()
-    rows = []
-    prev_game_id = 0
-    for val in table.find_all(ncaa_utils._has_no_id)[3:]:
-        row = []
-        for i in val.children:
-            if isinstance(i, Tag):
-                if i.a:
-                    if len(i.find_all('a')) >= 1:
-                        if 'box_score' in i.find_all('a')[-1].get('href'):
-                            score = i.a.string.strip()
-                            game_id = i.a.get('href').split('/')[-2]
-                        elif 'team' in (i.find_all('a'))[-1].get('href'):
-                            opponent_id = i.find_all(
-                                'a')[-1].get('href').split('/')[2]
-                            opponent_name, field = ncaa_utils._parse_opponent_info(
-                                i.find_all('a')[-1].text.strip())
-                        elif 'game/index' in i.find_all('a')[-1].get('href'):
-                            game_id = i.find_all(
-                                'a')[-1].get('href').split('/')[-1].split('?')[0]
-                            score = i.a.string.strip()
-                        else:
-                            opponent_name, field = ncaa_utils._parse_opponent_info(
-                                i.text.strip())
-                            opponent_id = '-'
-                elif 'data-order' in i.attrs:
-                    row.append(i.get('data-order'))
-                elif '/' in i.string:
-                    date = i.string
-                elif i.text.strip() == '-':
-                    score = '-'
-                    game_id = '-'
-                else:
-                    opponent_name, field = ncaa_utils._parse_opponent_info(
-                        i.text.strip())
-                    opponent_id = '-'
-        runs_scored, runs_allowed, run_diff, result, ip, extras = ncaa_utils._parse_score(
-            score)
-        row.append(date)
-        row.append(field)
-        row.append(season_id)
-        row.append(opponent_id)
-        row.append(opponent_name)
-        row.append(ip)
-        row.append(extras)
-        row.append(runs_scored)
-        row.append(runs_allowed)
-        row.append(run_diff)
-        row.append(result)
-        row.append(game_id)
-        row.append(school_id)
-        if len(row) == (len(headers)-1) and ((game_id != prev_game_id) or (result == 'cancelled')):
-            prev_game_id = game_id
-            row.append(int(player_id))
-            rows.append(row)
-    res = pd.DataFrame(rows, columns=headers)
-    if not res.empty:
-        res['season'] = season
-        res['division'] = division
-        res = res.loc[res.field.isin(['away', 'home', 'neutral'])]
-        res = ncaa_utils._transform_stats(res)
-    if variant == 'batting':
-        if include_advanced:
-            if len(res) > 0:
-                res = metrics.add_batting_metrics(res)
-                res = res.loc[res.PA > 0]
-    elif variant == 'pitching':
-        if include_advanced:
-            if len(res) > 0:
-                res = res.loc[res.IP > 0]
-                res = metrics.add_pitching_metrics(res)
-    return res
+    return _game_logs(schema, payload, season, season_id, school_id,
+                      division, include_advanced, player_id=int(player_id))
 
 
+@instrument.entry_point
 def ncaa_team_game_logs(school, season, variant, include_advanced=True):
     """
     Obtains team-level game-by-game stats for a given team in a given 
@@ -482,7 +703,7 @@ def ncaa_team_game_logs(school, season, variant, include_advanced=True):
     season, season_id, batting_id, pitching_id, fielding_id = lookup._lookup_season_info(
         season)
     school, school_id, division = lookup._lookup_school_info(school)
-    headers = ncaa_utils.team_gamelog_headers[variant][season]
+    schema = schemas.get_schema('team_game_logs', variant, season)
     if variant == 'batting':
         year_stat_category_id = batting_id
     elif variant == 'pitching':
@@ -493,83 +714,11 @@ def ncaa_team_game_logs(school, season, variant, include_advanced=True):
                'org_id': str(school_id),
                'stats_player_seq': '-100',
                'year_stat_category_id': str(year_stat_category_id)}
-    url = 'https://stats.ncaa.org/player/game_by_game?'
-    with Session() as s:
-        r = s.get(url, params=payload, headers=_HEADERS)
-    soup = BeautifulSoup(r.text, features='lxml')
-    table = soup.find_all('table')[3]
-    rows = []
-    prev_game_id = 0
-    for val in table.find_all(ncaa_utils._has_no_id)[3:]:
-        row = []
-        for i in val.children:
-            if isinstance(i, Tag):
-                if i.a:
-                    if len(i.find_all('a')) >= 1:
-                        if 'box_score' in i.find_all('a')[-1].get('href'):
-                            score = i.a.string.strip()
-                            game_id = i.a.get('href').split('/')[-2]
-                        elif 'team' in (i.find_all('a'))[-1].get('href'):
-                            opponent_id = i.find_all(
-                                'a')[-1].get('href').split('/')[2]
-                            opponent_name, field = ncaa_utils._parse_opponent_info(
-                                i.find_all('a')[-1].text.strip())
-                        elif 'game/index' in i.find_all('a')[-1].get('href'):
-                            game_id = i.find_all(
-                                'a')[-1].get('href').split('/')[-1].split('?')[0]
-                            score = i.a.string.strip()
-                        else:
-                            opponent_name, field = ncaa_utils._parse_opponent_info(
-                                i.text.strip())
-                            opponent_id = '-'
-                elif 'data-order' in i.attrs:
-                    row.append(i.get('data-order'))
-                elif '/' in i.string:
-                    date = i.string
-                elif i.text.strip() == '-':
-                    score = '-'
-                    game_id = '-'
-                else:
-                    opponent_name, field = ncaa_utils._parse_opponent_info(
-                        i.text.strip())
-                    opponent_id = '-'
-        runs_scored, runs_allowed, run_diff, result, ip, extras = ncaa_utils._parse_score(
-            score)
-        row.append(date)
-        row.append(field)
-        row.append(season_id)
-        row.append(opponent_id)
-        row.append(opponent_name)
-        row.append(ip)
-        row.append(extras)
-        row.append(runs_scored)
-        row.append(runs_allowed)
-        row.append(run_diff)
-        row.append(result)
-        row.append(game_id)
-        row.append(school_id)
-        if (len(row) == len(headers)) and ((game_id != prev_game_id) or (result == 'cancelled')):
-            prev_game_id = game_id
-            rows.append(row)
-    res = pd.DataFrame(rows, columns=headers)
-    if not res.empty:
-        res['season'] = season
-        res['division'] = division
-        res = res.loc[res.field.isin(['away', 'home', 'neutral'])]
-        res = ncaa_utils._transform_stats(res)
-    if variant == 'batting':
-        if include_advanced:
-            if len(res) > 0:
-                res = metrics.add_batting_metrics(res)
-                res = res.loc[res.PA > 0]
-    elif variant == 'pitching':
-        if include_advanced:
-            if len(res) > 0:
-                res = res.loc[res.IP > 0]
-                res = metrics.add_pitching_metrics(res)
-    return res
+    return _game_logs(schema, payload, season, season_id, school_id,
+                      division, include_advanced)
 
 
+@instrument.entry_point
 def ncaa_team_results(school, season):
     """
     Obtains the results of games for a given school in a given 
@@ -590,6 +739,7 @@ def ncaa_team_results(school, season):
     return res
 
 
+@instrument.entry_point
 def ncaa_team_season_roster(school, season):
     """
     Retrieves the single-season roster for a given school in a 
@@ -606,8 +756,8 @@ def ncaa_team_season_roster(school, season):
     season, season_id = lookup._lookup_season_basic(season)
     request_body = 'https://stats.ncaa.org/team/'
     request_body += f'''{str(school_id)}/roster/{str(season_id)}'''
-    with Session() as s:
-        r = s.get(request_body, headers=_HEADERS)
+    r = _get(request_body, season=season)
+    started = instrument.start()
     soup = BeautifulSoup(r.text, features='lxml')
     res = []
     if (season in [2019, 14781, 2023, 2022, 15860]):
@@ -636,6 +786,7 @@ def ncaa_team_season_roster(school, season):
             except:
                 details.append(None)
     df = pd.DataFrame(res)
+    instrument.record('parse', started, rows=len(df))
     df.columns = col_names
     df.stats_player_seq = df.stats_player_seq.astype('str')
     df.stats_player_seq = df.stats_player_seq.str.replace('=', '')
@@ -656,6 +807,7 @@ def ncaa_team_season_roster(school, season):
     return df
 
 
+@instrument.entry_point
 def ncaa_team_roster(school, seasons):
     """
     Retrieves a blindly concattenated roster for a given tea
@@ -672,16 +824,19 @@ def ncaa_team_roster(school, seasons):
     if len(seasons) == 1:
         return ncaa_team_season_roster(school, seasons[0])
     else:
-        roster = pd.DataFrame()
+        frames = []
+        # pacing is left to the rate limiter (see set_rate_limiter)
         for season in set(seasons):
-            sleep(random.uniform(0, _TIMEOUT))
             try:
                 new = ncaa_team_season_roster(school, season)
                 if 'height' in new.columns:
                     new = new.drop(columns=['height'], inplace=False)
-                roster = pd.concat([roster, new])
-                if 'Unnamed: 0' in roster.columns:
-                    roster = roster.drop(columns=['Unnamed: 0'], inplace=False)
+                if 'Unnamed: 0' in new.columns:
+                    new = new.drop(columns=['Unnamed: 0'], inplace=False)
+                frames.append(new)
             except:
                 continue
+        if len(frames) == 0:
+            return pd.DataFrame()
+        roster = pd.concat(frames)
     return roster
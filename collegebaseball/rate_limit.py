@@ -0,0 +1,78 @@
+"""
+rate_limit.py
+
+Thread-safe token-bucket rate limiting for collegebaseball's scrapers
+"""
+import threading
+from time import monotonic, sleep
+
+
+class TokenBucket:
+    """
+    Allows on average `rate` acquisitions per second, with bursts of
+     up to `burst`. Callers that find the bucket empty reserve a future
+     token and sleep until it is due, so waiting threads are served in
+     arrival order without holding the lock
+
+    Args:
+        rate (float): tokens added per second
+        burst (int, optional): bucket capacity, defaults to 1
+    """
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Blocks until a token is available
+
+        Returns:
+            seconds spent waiting (float)
+        """
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(self.burst, self._tokens
+                               + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """
+    One TokenBucket per host, so every site is limited to `rate`
+     requests per second independently
+
+    Args:
+        rate (float): requests per second allowed per host
+        burst (int, optional): bucket capacity, defaults to 1
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host):
+        """
+        Blocks until a request to host is allowed
+
+        Returns:
+            seconds spent waiting (float)
+        """
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.setdefault(
+                    host, TokenBucket(self.rate, self.burst))
+        return bucket.acquire()
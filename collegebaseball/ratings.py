@@ -0,0 +1,196 @@
+"""
+ratings.py
+
+RPI and strength of schedule for every team-season at once, from a long
+game results table such as the bundled games table,
+boydsworld_league_results() or download_team_results()
+
+The team x team results matrix is kept sparse, as one entry per pair of
+teams that met in a season, and the ratings are sums over its entries,
+so a full history is rated in one vectorized pass and new games only
+re-rate the seasons they were played in
+"""
+import numpy as np
+import pandas as pd
+from collegebaseball import guts
+
+
+# RPI = WP, OWP and OOWP weighted by _RPI_WEIGHTS
+_RPI_WEIGHTS = (0.25, 0.50, 0.25)
+# columns of the ratings table, after the team and season columns
+_COLUMNS = ['games', 'wins', 'ties', 'losses', 'wp', 'owp', 'oowp', 'rpi',
+            'sos']
+# counts kept for every entry of the results matrix
+_COUNTS = ['games', 'wins', 'ties', 'losses']
+
+
+class Ratings:
+    """
+    WP, OWP, OOWP, RPI and SOS of every team-season in a game results
+     table, updatable as new games arrive
+
+    Only games between two teams that appear in the table count, and a
+     team's opponents are rated from their own rows, so every game needs
+     a row from each team's perspective, as in the bundled games table.
+     Ties count as half a win and half a loss; the bundled games table
+     has none, as tied games were dropped when it was built. A rating
+     with nothing to average over, e.g. OWP when every opponent only
+     played the team, is NaN
+
+        WP: winning percentage
+        OWP: opponents' WP, without their games against the team,
+         averaged over the team's games
+        OOWP: opponents' OWP, averaged over the team's games
+        RPI: .25 * WP + .50 * OWP + .25 * OOWP
+        SOS: (2 * OWP + OOWP) / 3
+
+    Attributes:
+        table: pd.DataFrame with a row per team-season, sorted by season
+         and team
+    """
+
+    def __init__(self, games=None, team='school', opponent='opponent',
+                 season='season'):
+        """
+        Args:
+            games (pd.DataFrame, optional): games from each team's
+             perspective, with runs_scored, runs_allowed and the team,
+             opponent and season columns, default: the bundled games table
+            team (str, optional): column of the team, default: 'school'
+            opponent (str, optional): column of the opponent, default:
+             'opponent'; use opponent_id with NCAA results
+            season (str, optional): column of the season, default: 'season'
+        """
+        if games is None:
+            games = guts._read_table(guts.get_games_path())
+        self._keys = [season, team, opponent]
+        self._pairs = _pair_results(games, self._keys)
+        self.table = _rate(self._pairs, self._keys)
+
+    def update(self, games):
+        """
+        Adds games to the results matrix and re-rates the seasons they
+         were played in
+
+        Args:
+            games (pd.DataFrame): new games, in the format given to Ratings
+
+        Returns:
+            self.table
+        """
+        season = self._keys[0]
+        new = _pair_results(games, self._keys)
+        if len(new) == 0:
+            return self.table
+        seasons = new[season].unique()
+        touched = self._pairs[season].isin(seasons).to_numpy()
+        pairs = (pd.concat([self._pairs.loc[touched], new],
+                           ignore_index=True)
+                 .groupby(self._keys, sort=False)[_COUNTS].sum()
+                 .reset_index())
+        self._pairs = pd.concat([self._pairs.loc[~touched], pairs],
+                                ignore_index=True)
+        kept = self.table.loc[~self.table[season].isin(seasons)]
+        self.table = (pd.concat([kept, _rate(pairs, self._keys)],
+                                ignore_index=True)
+                      .sort_values([season, self._keys[1]], kind='stable')
+                      .reset_index(drop=True))
+        return self.table
+
+
+def calculate_rpi(games=None, team='school', opponent='opponent',
+                  season='season'):
+    """
+    WP, OWP, OOWP, RPI and SOS of every team-season, see Ratings
+
+    Args:
+        games (pd.DataFrame, optional): games from each team's
+         perspective, default: the bundled games table
+        team (str, optional): column of the team, default: 'school'
+        opponent (str, optional): column of the opponent, default:
+         'opponent'
+        season (str, optional): column of the season, default: 'season'
+
+    Returns:
+        pd.DataFrame with a row per team-season, sorted by season and team
+    """
+    return Ratings(games, team=team, opponent=opponent, season=season).table
+
+
+def _pair_results(games, keys):
+    """
+    Sums games into entries of the results matrix
+
+    Returns:
+        pd.DataFrame with a row per (season, team, opponent) that met and
+         their games, wins, ties and losses
+    """
+    scored = pd.to_numeric(games['runs_scored'], errors='coerce').to_numpy(
+        'float64')
+    allowed = pd.to_numeric(games['runs_allowed'], errors='coerce').to_numpy(
+        'float64')
+    played = ~(np.isnan(scored) | np.isnan(allowed))
+    scored, allowed = scored[played], allowed[played]
+    frame = pd.DataFrame({key: games[key].to_numpy()[played] for key in keys})
+    frame['games'] = np.ones(len(scored), 'int64')
+    frame['wins'] = (scored > allowed).astype('int64')
+    frame['ties'] = (scored == allowed).astype('int64')
+    frame['losses'] = (scored < allowed).astype('int64')
+    return frame.groupby(keys, sort=False)[_COUNTS].sum().reset_index()
+
+
+def _rate(pairs, keys):
+    """
+    Rates every team-season in the entries of a results matrix
+
+    Returns:
+        pd.DataFrame with the team and season columns and _COLUMNS
+    """
+    season, team, opponent = keys
+    teams = pd.MultiIndex.from_arrays([pairs[team], pairs[season]]).unique()
+    n = len(teams)
+    i = teams.get_indexer(pd.MultiIndex.from_arrays(
+        [pairs[team], pairs[season]]))
+    j = teams.get_indexer(pd.MultiIndex.from_arrays(
+        [pairs[opponent], pairs[season]]))
+    # games against teams without rows of their own do not count
+    rated = j >= 0
+    i, j = i[rated], j[rated]
+    counts = {col: pairs[col].to_numpy('float64')[rated] for col in _COUNTS}
+    games, wins = counts['games'], counts['wins'] + counts['ties'] / 2
+
+    team_games = np.bincount(i, games, n)
+    team_wins = np.bincount(i, wins, n)
+    # each entry's transpose: the opponent's record against the team
+    entries = i.astype('int64') * n + j
+    order = np.argsort(entries, kind='stable')
+    transposed = j.astype('int64') * n + i
+    pos = np.minimum(np.searchsorted(entries[order], transposed),
+                     max(len(entries) - 1, 0))
+    found = (len(entries) > 0) & (entries[order][pos] == transposed)
+    games_back = np.where(found, games[order][pos], 0)
+    wins_back = np.where(found, wins[order][pos], 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        wp = team_wins / team_games
+        # opponent's WP without its games against the team
+        others = team_games[j] - games_back
+        opp_wp = np.where(others > 0, (team_wins[j] - wins_back) / others, 0)
+        weight = games * (others > 0)
+        owp = np.bincount(i, weight * opp_wp, n) / np.bincount(i, weight, n)
+        weight = games * np.isfinite(owp[j])
+        oowp = (np.bincount(i, weight * np.nan_to_num(owp[j]), n)
+                / np.bincount(i, weight, n))
+    res = pd.DataFrame({team: teams.get_level_values(0),
+                        season: teams.get_level_values(1)})
+    for col in _COUNTS:
+        res[col] = np.bincount(i, counts[col], n).astype('int64')
+    res['wp'] = wp
+    res['owp'] = owp
+    res['oowp'] = oowp
+    res['rpi'] = (_RPI_WEIGHTS[0] * wp + _RPI_WEIGHTS[1] * owp
+                  + _RPI_WEIGHTS[2] * oowp)
+    res['sos'] = (2 * owp + oowp) / 3
+    return (res.loc[res['games'].to_numpy() > 0, [team, season] + _COLUMNS]
+            .sort_values([season, team], kind='stable')
+            .reset_index(drop=True))
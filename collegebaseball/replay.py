@@ -0,0 +1,163 @@
+"""
+replay.py
+
+Record/replay of the pages collegebaseball's scrapers request. A cassette
+is a directory of response bodies, saved as the site served them, with an
+index.json of the request each one answers. Installed as a scraper's
+cache it answers every request from disk, so scrapers (and their tests
+and benchmarks) run offline against real pages
+
+    from collegebaseball import boydsworld_scraper, ncaa_scraper, replay
+    cassette = replay.Cassette('tests/fixtures/html')
+    ncaa_scraper.set_cache(cassette)
+    boydsworld_scraper.set_cache(cassette)
+
+Recording with Cassette(directory, record=True) lets requests missing from
+the cassette go to the network and saves what comes back
+"""
+import json
+import os
+import threading
+from urllib.parse import urlsplit
+from requests import Response
+from collegebaseball.http_cache import cache_key
+
+
+_INDEX = 'index.json'
+
+
+class ReplayMiss(LookupError):
+    """
+    Raised when a replaying cassette has no response for a request
+    """
+
+
+def page_type(url):
+    """
+    Returns:
+        the kind of page a url requests, which names its recorded body:
+        'stats' (team stats, whose footer holds the totals), 'career',
+        'game_by_game', 'roster', 'boydsworld' or 'other'
+    """
+    parts = urlsplit(url)
+    if 'boydsworld' in parts.netloc:
+        return 'boydsworld'
+    path = parts.path.rstrip('/')
+    if path.endswith('/stats'):
+        return 'stats'
+    if path.endswith('/player/game_by_game'):
+        return 'game_by_game'
+    if path.endswith('/player/index'):
+        return 'career'
+    if '/roster/' in path + '/':
+        return 'roster'
+    return 'other'
+
+
+class Cassette:
+    """
+    Recorded responses under a directory, matched to requests by url and
+     query parameters (the same key as http_cache)
+
+    Args:
+        directory (str)
+        record (bool, optional): on a miss, let the request through and
+         save its response (True), or raise ReplayMiss (False, the
+         default, so an offline run never touches the network)
+    """
+
+    def __init__(self, directory, record=False):
+        self.directory = directory
+        self.record = record
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = {}
+        path = os.path.join(directory, _INDEX)
+        if os.path.exists(path):
+            with open(path) as f:
+                for entry in json.load(f):
+                    key = cache_key(entry['url'], entry['params'])
+                    self._entries[key] = entry
+
+    def entries(self, page=None):
+        """
+        Returns:
+            list of index entries (dicts of file, page, url, params,
+            status_code and encoding), optionally of one page type
+        """
+        return [entry for entry in self._entries.values()
+                if page is None or entry['page'] == page]
+
+    def body(self, entry):
+        """
+        Returns:
+            the recorded body (bytes) of an index entry
+        """
+        with open(os.path.join(self.directory, entry['file']), 'rb') as f:
+            return f.read()
+
+    def get(self, url, params=None, season=None):
+        """
+        Returns:
+            the recorded requests.Response, or None on a miss while
+            recording
+
+        Raises:
+            ReplayMiss: on a miss while replaying
+        """
+        entry = self._entries.get(cache_key(url, params))
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            if self.record:
+                return None
+            raise ReplayMiss(
+                f'''no recorded response for {url} {params or {}} in '''
+                f'''{self.directory}, record it with '''
+                f'''Cassette({self.directory!r}, record=True)''')
+        with self._lock:
+            self.hits += 1
+        res = Response()
+        res.status_code = entry['status_code']
+        res.encoding = entry['encoding']
+        res.url = entry['url']
+        res._content = self.body(entry)
+        return res
+
+    def put(self, url, params, response, name=None):
+        """
+        Saves a response and adds it to the index (only while recording)
+
+        Args:
+            name (str, optional): file name of the body, defaults to the
+             page type and the request's key, e.g. 'roster_3f9a1c02e4.html'
+        """
+        if not self.record:
+            return
+        key = cache_key(url, params)
+        page = page_type(url)
+        if name is None:
+            name = f'''{page}_{key[:10]}.html'''
+        entry = {'file': name, 'page': page, 'url': url,
+                 'params': {str(k): str(v) for k, v in (params or {}).items()
+                            if v is not None},
+                 'status_code': response.status_code,
+                 'encoding': response.encoding or 'utf-8'}
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, name), 'wb') as f:
+            f.write(response.content)
+        with self._lock:
+            self._entries[key] = entry
+            self._save()
+
+    def _save(self):
+        """
+        rewrites the index, sorted by file (caller holds the lock)
+        """
+        entries = sorted(self._entries.values(), key=lambda e: e['file'])
+        path = os.path.join(self.directory, _INDEX)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(entries, f, indent=1, sort_keys=True)
+            f.write('\n')
+        os.replace(path + '.tmp', path)
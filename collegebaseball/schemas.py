@@ -0,0 +1,355 @@
+"""
+schemas.py
+
+Column layouts of the stats.ncaa.org game log pages, compiled once per
+(source, variant, season): the stat columns as they appear on the page,
+the columns collegebaseball adds to every game, their dtypes and their
+positions. Replaces the hand-written header lists, which had drifted
+(e.g. 'fieldseason_id' in 2021 batting)
+"""
+import threading
+import numpy as np
+from collegebaseball import ncaa_utils
+
+
+class SchemaError(ValueError):
+    """
+    Raised when there is no schema for a request, or when a page does not
+     match the schema it should (i.e. the NCAA changed its columns)
+    """
+
+
+# columns collegebaseball adds after the stats of every game, in order
+_GAME_META = ['date', 'field', 'season_id', 'opponent_id', 'opponent_name',
+              'innings_played', 'extras', 'runs_scored', 'runs_allowed',
+              'run_difference', 'result', 'game_id', 'school_id']
+_SOURCES = {'team_game_logs': _GAME_META,
+            'player_game_logs': _GAME_META + ['stats_player_seq']}
+
+#    n.b. due to inconsistencies in NCAA formatting (e.g. ghost columns),
+#    the stat columns of each season are listed by hand, in page order
+_BATTING_2017 = ['G', 'R', 'AB', 'H', '2B', '3B', 'TB', 'HR', 'RBI', 'BB',
+                 'HBP', 'SF', 'SH', 'K', 'DP', 'CS', 'Picked', 'SB', 'IBB',
+                 'RBI2out']
+_BATTING_2020 = [('OPP DP' if col == 'DP' else col) for col in _BATTING_2017]
+_PITCHING_2013 = ['App', 'GS', 'IP', 'H', 'R', 'ER', 'BB', 'SO', 'SHO', 'BF',
+                  'P-OAB', '2B-A', '3B-A', 'Bk', 'HR-A', 'WP', 'HB', 'IBB',
+                  'Inh Run', 'Inh Run Score', 'SHA', 'SFA', 'Pitches', 'GO',
+                  'FO', 'W', 'L', 'SV', 'OrdAppeared', 'KL']
+_PITCHING_2015 = ['App', 'G'] + _PITCHING_2013[1:]
+_PITCHING_2016 = _PITCHING_2015[:4] + ['CG'] + _PITCHING_2015[4:]
+_PITCHING_2020 = _PITCHING_2016 + ['pickoffs']
+_PITCHING_2022 = ['G', 'App'] + _PITCHING_2020[2:]
+_FIELDING_2012 = ['PO', 'A', 'E', 'CI', 'PB', 'SBA', 'CSB', 'IDP', 'TP']
+_FIELDING_2018 = ['G', 'PO', 'TC', 'A', 'E', 'CI', 'PB', 'SBA', 'CSB', 'IDP',
+                  'TP']
+
+# variant -> [(first season, last season, stat columns)]
+_GAME_LOG_STATS = {
+    'batting': [
+        (2012, 2012, ['AB', 'R', 'H', '2B', '3B', 'HR', 'RBI', 'BB', 'HBP',
+                      'SF', 'SH', 'K', 'DP', 'SB', 'CS', 'Picked', 'IBB']),
+        (2013, 2013, ['AB', 'H', 'TB', 'R', '2B', '3B', 'HR', 'RBI', 'BB',
+                      'HBP', 'SF', 'SH', 'K', 'DP', 'SB', 'CS', 'Picked',
+                      'IBB']),
+        (2014, 2014, ['G', 'AB', 'R', 'H', '2B', '3B', 'TB', 'HR', 'RBI',
+                      'BB', 'HBP', 'SF', 'SH', 'K', 'DP', 'SB', 'CS',
+                      'Picked', 'IBB']),
+        (2015, 2015, ['G', 'R', 'AB', 'H', '2B', '3B', 'TB', 'HR', 'RBI',
+                      'BB', 'HBP', 'SF', 'SH', 'K', 'DP', 'SB', 'CS',
+                      'Picked', 'IBB']),
+        (2016, 2016, _BATTING_2017[:18] + ['RBI2out', 'IBB']),
+        (2017, 2019, _BATTING_2017),
+        (2020, 2021, _BATTING_2020),
+        (2022, 2023, _BATTING_2020[:19] + ['GDP', 'RBI2out'])],
+    'pitching': [
+        (2012, 2014, _PITCHING_2013),
+        (2015, 2015, _PITCHING_2015),
+        (2016, 2019, _PITCHING_2016),
+        (2020, 2021, _PITCHING_2020),
+        (2022, 2023, _PITCHING_2022)],
+    'fielding': [
+        (2012, 2013, _FIELDING_2012),
+        (2014, 2016, ['G'] + _FIELDING_2012),
+        (2017, 2017, ['G', 'G', 'PO', 'TC', 'A', 'E', 'CI', 'PB', 'SBA',
+                      'CSB', 'IDP', 'TP']),
+        (2018, 2018, _FIELDING_2018),
+        (2019, 2023, _FIELDING_2018[:2] + ['A', 'TC'] + _FIELDING_2018[4:])],
+}
+
+# available_stat_id of each split on the team stats page
+# html changes year to year make it difficult to read these automatically
+_BATTING_SPLITS = ['two_outs', 'vs_RH', 'runners_on', 'with_RISP', 'vs_LH',
+                   'bases_empty', 'bases_loaded']
+_PITCHING_SPLITS = ['runners_on', 'vs_LH', 'two_outs', 'bases_empty',
+                    'with_RISP', 'bases_loaded', 'vs_RH']
+# variant -> season -> ids, in the order of the variant's split names
+_SPLIT_IDS = {
+    'batting': {
+        2012: [10092, 10093, 10098, 10099, 10100, 10106, 10107],
+        2013: [10160, 10161, 10166, 10167, 10168, 10174, 10175],
+        2014: [10200, 10201, 10206, 10207, 10208, 10214, 10215],
+        2015: [10280, 10281, 10286, 10287, 10288, 10294, 10295],
+        2016: [10534, 10535, 10540, 10541, 10542, 10548, 10549],
+        2017: [10580, 10581, 10586, 10587, 10588, 10594, 10595],
+        2018: [11960, 11961, 11966, 11967, 11968, 11974, 11975],
+        2019: [16908, 16909, 16914, 16915, 16916, 16922, 16923],
+        2020: [17060, 17061, 17066, 17067, 17068, 17074, 17075],
+        2021: [17120, 17121, 17126, 17127, 17128, 17134, 17135],
+        2022: [17200, 17201, 17206, 17207, 17208, 17214, 17215],
+        2023: [17280, 17281, 17286, 17293, 17288, 17294, 17295]},
+    'pitching': {
+        2012: [10109, 10110, 10111, 10112, 10113, 10116, 10117],
+        2013: [10177, 10178, 10179, 10180, 10181, 10184, 10185],
+        2014: [10217, 10218, 10219, 10220, 10221, 10224, 10225],
+        2015: [10297, 10298, 10299, 10300, 10301, 10304, 10305],
+        2016: [10551, 10552, 10553, 10554, 10555, 10558, 10559],
+        2017: [10597, 10598, 10599, 10600, 10601, 10604, 10605],
+        2018: [11977, 11978, 11979, 11980, 11981, 11984, 11985],
+        2019: [16925, 16926, 16927, 16928, 16929, 16932, 16933],
+        2020: [17077, 17078, 17079, 17080, 17081, 17084, 17085],
+        2021: [17137, 17138, 17139, 17140, 17141, 17144, 17145],
+        2022: [17217, 17218, 17219, 17220, 17221, 17224, 17225],
+        2023: [17297, 17298, 17299, 17300, 17301, 17304, 17305]},
+}
+_SPLIT_NAMES = {'batting': _BATTING_SPLITS, 'pitching': _PITCHING_SPLITS}
+
+
+def _to_int(value):
+    # the NCAA's '-' for a missing id reads as 0, as in _transform_stats
+    return 0 if value == '-' else int(value)
+
+
+def _to_bool(value):
+    return value is True or value == 'True'
+
+
+def _meta_dtype(col):
+    dtype = ncaa_utils._COLUMN_TYPES.get(col, 'string')
+    return object if dtype == 'string' else np.dtype(dtype)
+
+
+class Schema:
+    """
+    The compiled layout of one game log table
+
+    Attributes:
+        source (str): 'team_game_logs' or 'player_game_logs'
+        variant (str): 'batting', 'pitching', or 'fielding'
+        season (int)
+        stats (tuple): stat columns in page order, ghost columns included
+        meta (tuple): columns added after the stats of every game
+        columns (tuple): the parsed frame's columns, without duplicates
+        dtypes (dict): column -> numpy dtype of its parsed values (raw stat
+         strings are kept as objects for ncaa_utils._transform_stats)
+        positions (dict): column -> position in a page row of stats + meta
+    """
+
+    def __init__(self, source, variant, season, stats):
+        self.source = source
+        self.variant = variant
+        self.season = season
+        self.stats = tuple(stats)
+        self.meta = tuple(_SOURCES[source])
+        self.n_stats = len(self.stats)
+        self.positions = {}
+        for i, col in enumerate(self.stats + self.meta):
+            self.positions.setdefault(col, i)
+        self.columns = tuple(self.positions)
+        self.dtypes = {col: object for col in self.stats}
+        self.dtypes.update({col: _meta_dtype(col) for col in self.meta})
+        # positions of the first copy of each stat column
+        self._keep = [self.positions[col] for col in self.columns
+                      if self.positions[col] < self.n_stats]
+        self._convert = []
+        for col in self.meta:
+            kind = np.dtype(self.dtypes[col]).kind
+            self._convert.append(
+                _to_bool if kind == 'b' else _to_int if kind in 'iu' else None)
+
+    def __repr__(self):
+        return (f'''Schema({self.source!r}, {self.variant!r}, '''
+                f'''{self.season}, {self.n_stats} stats)''')
+
+    def buffer(self, size):
+        """
+        Returns:
+            a GameLogBuffer with room for size games
+        """
+        return GameLogBuffer(self, size)
+
+    def drift_error(self, widths):
+        """
+        Returns:
+            SchemaError describing a page whose game rows had the given
+            numbers of stat cells instead of this schema's
+        """
+        seen = ', '.join(str(w) for w in sorted(widths))
+        return SchemaError(
+            f'''stats.ncaa.org {self.source} page for {self.variant} '''
+            f'''{self.season} has {seen} stat columns per game, expected '''
+            f'''{self.n_stats} ({', '.join(self.stats)}): the page layout '''
+            f'''has changed and the schema in collegebaseball.schemas '''
+            f'''needs updating''')
+
+
+class GameLogBuffer:
+    """
+    Preallocated, typed columns that a game log parser fills one game at a
+     time: the raw stat strings go into one 2-D object block, the values
+     collegebaseball adds are converted straight into their numpy dtypes
+
+    Args:
+        schema (Schema)
+        size (int): most games the page can hold
+    """
+
+    def __init__(self, schema, size):
+        self.schema = schema
+        self.size = 0
+        self._stats = np.empty((size, schema.n_stats), dtype=object)
+        self._meta = [np.empty(size, dtype=schema.dtypes[col])
+                      for col in schema.meta]
+        self._widths = set()
+
+    def fits(self, stats):
+        """
+        Returns:
+            whether a row's stat cells match the schema; mismatched widths
+            are remembered, to tell a drifted page from an empty one
+        """
+        if len(stats) == self.schema.n_stats:
+            return True
+        if stats:
+            self._widths.add(len(stats))
+        return False
+
+    def append(self, stats, meta):
+        """
+        Adds one game
+
+        Args:
+            stats (list): the raw stat cells, as many as schema.stats
+            meta (tuple): one value per schema.meta column
+        """
+        i = self.size
+        self._stats[i] = stats
+        for array, convert, value in zip(self._meta, self.schema._convert,
+                                         meta):
+            array[i] = value if convert is None else convert(value)
+        self.size = i + 1
+
+    def columns(self):
+        """
+        Returns:
+            dict of column -> filled array, in schema.columns order
+
+        Raises:
+            SchemaError: if no game matched the schema but some rows had
+             stat cells, i.e. the page's columns have changed
+        """
+        if self.size == 0 and self._widths:
+            raise self.schema.drift_error(self._widths)
+        n = self.size
+        res = {self.schema.columns[j]: self._stats[:n, pos]
+               for j, pos in enumerate(self.schema._keep)}
+        for col, array in zip(self.schema.meta, self._meta):
+            res[col] = array[:n]
+        return res
+
+
+class SchemaRegistry:
+    """
+    Compiles each (source, variant, season) schema on first use and keeps
+     it for the life of the process
+    """
+
+    def __init__(self):
+        self._schemas = {}
+        self._lock = threading.Lock()
+
+    def get(self, source, variant, season):
+        """
+        Returns:
+            the Schema of a game log page
+
+        Raises:
+            SchemaError: for an unknown source, variant or season
+        """
+        key = (source, variant, season)
+        schema = self._schemas.get(key)
+        if schema is None:
+            schema = self._compile(source, variant, season)
+            with self._lock:
+                schema = self._schemas.setdefault(key, schema)
+        return schema
+
+    def seasons(self, variant):
+        """
+        Returns:
+            list of the seasons with game log schemas for a variant
+        """
+        return [season for first, last, _ in self._ranges(variant)
+                for season in range(first, last + 1)]
+
+    def split_id(self, variant, season, split):
+        """
+        Returns:
+            the available_stat_id (str) of a split on the team stats page
+
+        Raises:
+            SchemaError: for an unknown variant, season or split
+        """
+        if variant not in _SPLIT_IDS:
+            raise SchemaError(
+                f'''splits are only available for batting and pitching, '''
+                f'''not {variant!r}''')
+        ids = _SPLIT_IDS[variant].get(season)
+        if ids is None:
+            raise SchemaError(
+                f'''no {variant} split ids for {season}, only for '''
+                f'''{min(_SPLIT_IDS[variant])}-{max(_SPLIT_IDS[variant])}''')
+        names = _SPLIT_NAMES[variant]
+        if split not in names:
+            raise SchemaError(
+                f'''unknown split {split!r}, expected one of {names}''')
+        return str(ids[names.index(split)])
+
+    def _ranges(self, variant):
+        if variant not in _GAME_LOG_STATS:
+            raise SchemaError(
+                f'''unknown variant {variant!r}, expected one of '''
+                f'''{list(_GAME_LOG_STATS)}''')
+        return _GAME_LOG_STATS[variant]
+
+    def _compile(self, source, variant, season):
+        if source not in _SOURCES:
+            raise SchemaError(
+                f'''unknown source {source!r}, expected one of '''
+                f'''{list(_SOURCES)}''')
+        ranges = self._ranges(variant)
+        for first, last, stats in ranges:
+            if first <= season <= last:
+                return Schema(source, variant, season, stats)
+        raise SchemaError(
+            f'''no {source} schema for {variant} in {season}, only for '''
+            f'''{ranges[0][0]}-{ranges[-1][1]}''')
+
+
+_REGISTRY = SchemaRegistry()
+
+
+def get_registry():
+    """
+    Returns:
+        the SchemaRegistry shared by the scrapers
+    """
+    return _REGISTRY
+
+
+def get_schema(source, variant, season):
+    """
+    Returns:
+        the Schema of a game log page, see SchemaRegistry.get
+    """
+    return _REGISTRY.get(source, variant, season)
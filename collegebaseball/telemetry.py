@@ -0,0 +1,210 @@
+"""
+telemetry.py
+
+Request-level outcomes of collegebaseball's bulk downloads. Every key a
+download_* function fetches (a school, a player and variant, ...) gets a
+KeyResult with its status, HTTP status, latency, retries and exception
+class, collected in a BulkResult whose summary gives the request rate,
+the share of requests the NCAA blocked with a 403 and latency percentiles
+
+    stats, totals, result = download_utils.download_team_stats_and_totals(
+        [2022], 'batting', [1], max_workers=4)
+    result.summary()
+    result.failures
+"""
+import contextvars
+import threading
+from collections import namedtuple
+from time import perf_counter
+import numpy as np
+import pandas as pd
+
+
+KeyResult = namedtuple(
+    'KeyResult', ['key', 'status', 'http_status', 'latency', 'seconds',
+                  'requests', 'retries', 'forbidden', 'error', 'message'])
+KeyResult.__doc__ = """
+Outcome of one key of a bulk download
+
+    key: the key, e.g. a school_id or (stats_player_seq, variant)
+    status (str): 'ok', 'blocked' (a request got a 403), 'failed' (an
+     exception was raised) or 'skipped' (already in the checkpoint)
+    http_status (int): status of the key's last request, None if it made
+     none
+    latency (float): seconds spent in its requests, rate limiting of their
+     first attempts excluded (retries wait for the limiter, see
+     ncaa_scraper.create_session)
+    seconds (float): seconds for the whole key, parsing included
+    requests (int): requests made, including those answered by the cache
+    retries (int): retries made by the session before its responses
+    forbidden (int): 403 responses, retried ones included
+    error (str): exception class, None unless failed
+    message (str): exception message, None unless failed
+"""
+
+# list the current key's requests are logged to, set by track()
+_REQUEST_LOG = contextvars.ContextVar('collegebaseball_request_log',
+                                      default=None)
+
+
+def _retry_statuses(response):
+    """
+    Returns:
+        the statuses of the attempts urllib3 retried before a response
+    """
+    retries = getattr(getattr(response, 'raw', None), 'retries', None)
+    if retries is None:
+        return []
+    return [attempt.status for attempt in retries.history]
+
+
+def log_request(response, seconds, cached=False):
+    """
+    Logs a response against the key being tracked, if any
+    """
+    log = _REQUEST_LOG.get()
+    if log is not None:
+        retried = [] if cached else _retry_statuses(response)
+        forbidden = retried.count(403) + (response.status_code == 403)
+        log.append((response.status_code, seconds, len(retried), forbidden))
+
+
+def track(fn, key):
+    """
+    Calls fn(key) and logs the requests it makes
+
+    Returns:
+        (result, exception, KeyResult), with exactly one of result and
+        exception set
+    """
+    log = []
+    token = _REQUEST_LOG.set(log)
+    started = perf_counter()
+    result, error = None, None
+    try:
+        result = fn(key)
+    except Exception as e:
+        error = e
+    finally:
+        _REQUEST_LOG.reset(token)
+    seconds = perf_counter() - started
+    statuses = [entry[0] for entry in log]
+    if error is not None:
+        status = 'failed'
+    elif 403 in statuses:
+        status = 'blocked'
+    else:
+        status = 'ok'
+    outcome = KeyResult(
+        key, status, statuses[-1] if statuses else None,
+        sum(entry[1] for entry in log), seconds, len(log),
+        sum(entry[2] for entry in log), sum(entry[3] for entry in log),
+        None if error is None else type(error).__name__,
+        None if error is None else str(error))
+    return result, error, outcome
+
+
+class BulkResult:
+    """
+    KeyResults of a bulk download, in completion order
+
+    Attributes:
+        records (list of KeyResult)
+    """
+
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+        self._started = perf_counter()
+        self._finished = None
+
+    def add(self, record):
+        with self._lock:
+            self.records.append(record)
+            self._finished = perf_counter()
+
+    def skipped(self, key):
+        """
+        Records a key restored from a checkpoint without a request
+        """
+        self.add(KeyResult(key, 'skipped', None, 0.0, 0.0, 0, 0, 0, None,
+                           None))
+
+    def extend(self, other, prefix=()):
+        """
+        Adds the records of another BulkResult, e.g. one per season
+
+        Args:
+            prefix (tuple, optional): prepended to each of its keys, e.g.
+             (season, division)
+        """
+        records = other.records
+        if prefix:
+            records = [r._replace(key=prefix + (r.key,)) for r in records]
+        with self._lock:
+            self.records.extend(records)
+            self._started = min(self._started, other._started)
+            if other._finished is not None:
+                self._finished = max(self._finished or other._finished,
+                                     other._finished)
+
+    @property
+    def failures(self):
+        """
+        list of the keys that failed or were blocked, in completion order
+        """
+        return [r.key for r in self.records
+                if r.status in ('failed', 'blocked')]
+
+    def to_frame(self):
+        """
+        Returns:
+            DataFrame with one row per key
+        """
+        return pd.DataFrame(self.records, columns=KeyResult._fields)
+
+    def summary(self):
+        """
+        Returns:
+            dict of counts per status, requests, requests per second,
+            share of HTTP attempts (requests and their retries) answered
+            with a 403, p50 and p95 latency of the keys that made
+            requests, retries and exceptions by class
+        """
+        records = list(self.records)
+        res = {status: sum(r.status == status for r in records)
+               for status in ['ok', 'blocked', 'failed', 'skipped']}
+        requests = sum(r.requests for r in records)
+        elapsed = ((self._finished or self._started) - self._started)
+        retries = sum(r.retries for r in records)
+        attempts = requests + retries
+        latencies = [r.latency for r in records if r.requests > 0]
+        res['requests'] = requests
+        res['requests_per_second'] = (requests / elapsed if elapsed > 0
+                                      else 0.0)
+        res['rate_403'] = (sum(r.forbidden for r in records) / attempts
+                           if attempts else 0.0)
+        res['p50_latency'] = (float(np.percentile(latencies, 50))
+                              if latencies else None)
+        res['p95_latency'] = (float(np.percentile(latencies, 95))
+                              if latencies else None)
+        res['retries'] = retries
+        errors = {}
+        for r in records:
+            if r.error is not None:
+                errors[r.error] = errors.get(r.error, 0) + 1
+        res['errors'] = errors
+        return res
+
+    def __len__(self):
+        return len(self.records)
+
+    def __repr__(self):
+        s = self.summary()
+        p95 = ('-' if s['p95_latency'] is None
+               else f'''{s['p95_latency']:.2f}s''')
+        return (f'''BulkResult({len(self)} keys: {s['ok']} ok, '''
+                f'''{s['blocked']} blocked, {s['failed']} failed, '''
+                f'''{s['skipped']} skipped; {s['requests']} requests at '''
+                f'''{s['requests_per_second']:.2f}/s, '''
+                f'''{s['rate_403']:.1%} 403, p95 latency {p95})''')
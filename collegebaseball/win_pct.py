@@ -7,6 +7,12 @@ from boysworld.com data
 created by Nathan Blumenfeld in Winter 2022
 """
 _ROUND_TO = 3
+# PythagenPat exponent: x = (RPG)^_PYTHAGENPAT_EXPONENT
+_PYTHAGENPAT_EXPONENT = 0.287
+# columns of calculate_league_win_pcts, after the group keys
+_LEAGUE_COLUMNS = ['games', 'wins', 'ties', 'losses', 'win_pct',
+                   'runs_scored', 'runs_allowed', 'run_difference',
+                   'pythagenpat_win_pct']
 
 
 def calculate_actual_win_pct(games):
@@ -14,6 +20,9 @@ def calculate_actual_win_pct(games):
     A function to calculate the winning percentage as
     # games won / # games plated
 
+    Ties are not counted as games played; with no games won or lost the
+     winning percentage is 0
+
     Args:
         games (pd.DataFrame from boydsworld_team_results())
 
@@ -23,12 +32,13 @@ def calculate_actual_win_pct(games):
         ties (int)
         losses (int)
     """
+    wins, ties, losses = 0, 0, 0
     if len(games) > 0:
         wins = len(games[games.run_difference > 0])
         ties = len(games[games.run_difference == 0])
         losses = len(games[games.run_difference < 0])
-        wins_and_losses = len(games[games.run_difference != 0])
-        res = wins / wins_and_losses
+    if wins + losses > 0:
+        res = wins / (wins + losses)
     else:
         res = 0
     return round(res, _ROUND_TO), int(wins), int(ties), int(losses)
@@ -50,18 +60,84 @@ def calculate_pythagenpat_win_pct(games):
         A tuple of (the expected winning percentage as a float,
         total run differential as int)
     """
-    runs_scored_total = games.runs_scored.sum()
-    runs_allowed_total = games.runs_allowed.sum()
+    if len(games) == 0:
+        return 0, 0
+    runs_scored_total = int(games.runs_scored.sum())
+    runs_allowed_total = int(games.runs_allowed.sum())
     games_played_total = len(games)
     total_run_difference = runs_scored_total - runs_allowed_total
 
-    if len(games) == 0:
-        res = 0
-    else:
-        runs_per_game = runs_scored_total / games_played_total
-        x = runs_per_game ** 0.287
-        numerator = (runs_scored_total ** x)
-        demoninator = (runs_scored_total ** x) + (runs_allowed_total ** x)
-        res = numerator / demoninator
+    runs_per_game = runs_scored_total / games_played_total
+    x = runs_per_game ** _PYTHAGENPAT_EXPONENT
+    numerator = (runs_scored_total ** x)
+    demoninator = (runs_scored_total ** x) + (runs_allowed_total ** x)
+    res = numerator / demoninator
 
     return round(res, _ROUND_TO), int(total_run_difference)
+
+
+def calculate_league_win_pcts(games=None, by=('school', 'season')):
+    """
+    Actual and PythagenPat winning percentages of every team and season
+     at once, from a long table with one row per game per team, in one
+     groupby pass. Each group gets the same values that
+     calculate_actual_win_pct and calculate_pythagenpat_win_pct give for
+     its games
+
+    Args:
+        games (pd.DataFrame, optional): games from each team's perspective,
+         with runs_scored, runs_allowed and the columns in by, e.g. the
+         bundled games table (the default) or boydsworld_team_results()
+         output with a school column added. Games without a score are
+         skipped. The bundled table has no tied games, so its ties are
+         always 0
+        by (list, optional): columns to group on, default:
+         ('school', 'season')
+
+    Returns:
+        pd.DataFrame with a row per group, sorted by the columns in by,
+         followed by games, wins, ties, losses, win_pct, runs_scored,
+         runs_allowed, run_difference and pythagenpat_win_pct
+    """
+    # imported here so that `import collegebaseball.win_pct` stays cheap
+    import numpy as np
+    import pandas as pd
+    if games is None:
+        from collegebaseball import guts
+        games = guts._read_table(guts.get_games_path())
+    keys = list(by)
+    scored = pd.to_numeric(games['runs_scored'], errors='coerce').to_numpy(
+        'float64')
+    allowed = pd.to_numeric(games['runs_allowed'], errors='coerce').to_numpy(
+        'float64')
+    played = ~(np.isnan(scored) | np.isnan(allowed))
+    scored, allowed = scored[played], allowed[played]
+    frame = pd.DataFrame({key: games[key].to_numpy()[played]
+                          for key in keys})
+    frame['games'] = np.ones(len(scored), 'int64')
+    frame['wins'] = (scored > allowed).astype('int64')
+    frame['ties'] = (scored == allowed).astype('int64')
+    frame['losses'] = (scored < allowed).astype('int64')
+    frame['runs_scored'] = scored.astype('int64')
+    frame['runs_allowed'] = allowed.astype('int64')
+    res = (frame.groupby(keys, sort=True, observed=True, dropna=False)
+           [['games', 'wins', 'ties', 'losses', 'runs_scored',
+             'runs_allowed']]
+           .sum()
+           .reset_index())
+    wins = res['wins'].to_numpy('float64')
+    decisions = wins + res['losses'].to_numpy('float64')
+    runs = res['runs_scored'].to_numpy('float64')
+    runs_against = res['runs_allowed'].to_numpy('float64')
+    n_games = res['games'].to_numpy('float64')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        win_pct = np.where(decisions > 0, wins / decisions, 0.0)
+        x = (runs / n_games) ** _PYTHAGENPAT_EXPONENT
+        numerator = runs ** x
+        denominator = numerator + runs_against ** x
+        pythagenpat = np.where((n_games > 0) & (denominator > 0),
+                               numerator / denominator, 0.0)
+    res.insert(len(keys) + 4, 'win_pct', np.round(win_pct, _ROUND_TO))
+    res['run_difference'] = res['runs_scored'] - res['runs_allowed']
+    res['pythagenpat_win_pct'] = np.round(pythagenpat, _ROUND_TO)
+    return res[keys + _LEAGUE_COLUMNS]
@@ -1,7 +1,9 @@
 import pytest
-from collegebaseball import boydsworld_scraper
+from collegebaseball import boydsworld_scraper, games
 from time import sleep
 import random
+import pandas as pd
+import requests
 
 
 _TIMEOUT = 1
@@ -24,3 +26,118 @@ def generate_boydsworld_games():
 def test_boydsworld_games(generate_boydsworld_games):
     for i in generate_boydsworld_games:
         assert i is not None
+
+
+@ pytest.fixture()
+def generate_raw_games():
+    return pd.DataFrame({
+        'date': pd.to_datetime(['2019-03-01', '2019-03-02', '2019-03-03']),
+        'team_1': ['Cornell', 'Harvard', 'Cornell'],
+        'team_1_score': [5, 4, 3],
+        'team_2': ['Harvard', 'Cornell', 'Yale'],
+        'team_2_score': [2, 1, 3],
+        'field': ['@Cornell', '@Harvard', '@Yale']})
+
+
+def test_enrich_data_one_team(generate_raw_games):
+    res = boydsworld_scraper._enrich_data(generate_raw_games, 'Cornell')
+    assert list(res.columns) == ['date', 'field', 'runs_scored',
+                                 'runs_allowed', 'opponent',
+                                 'run_difference']
+    assert res.opponent.tolist() == ['Harvard', 'Harvard', 'Yale']
+    assert res.runs_scored.tolist() == [5, 1, 3]
+    assert res.runs_allowed.tolist() == [2, 4, 3]
+    assert res.run_difference.tolist() == [3, -3, 0]
+    assert (res.dtypes[['runs_scored', 'runs_allowed', 'run_difference']]
+            == 'int64').all()
+
+
+def test_enrich_data_all_teams(generate_raw_games):
+    res = boydsworld_scraper._enrich_data(generate_raw_games)
+    assert len(res) == 2 * len(generate_raw_games)
+    assert res.school.tolist() == ['Cornell', 'Harvard', 'Harvard',
+                                   'Cornell', 'Cornell', 'Yale']
+    assert res.run_difference.tolist() == [3, -3, 3, -3, 0, 0]
+    cornell = res.loc[res.school == 'Cornell'].drop(columns='school')
+    pd.testing.assert_frame_equal(
+        cornell.reset_index(drop=True),
+        boydsworld_scraper._enrich_data(generate_raw_games, 'Cornell'))
+
+
+@ pytest.fixture()
+def generate_league_request(monkeypatch, generate_raw_games):
+    calls = []
+
+    def fake_get_data(school, start, end=None, vs='all', parse_dates=True):
+        calls.append((school, start, end, vs))
+        df = generate_raw_games.copy()
+        df['date'] = df['date'] + pd.DateOffset(years=start - 2019)
+        return df
+    monkeypatch.setattr(boydsworld_scraper, '_get_data', fake_get_data)
+    boydsworld_scraper.clear_cache()
+    yield calls
+    boydsworld_scraper.clear_cache()
+
+
+def test_teams_results_offline(generate_league_request):
+    res = boydsworld_scraper.boydsworld_teams_results(
+        2019, 2020, schools=['Cornell', 'Harvard', 'Not A School'])
+    assert generate_league_request == []
+    assert sorted(res) == ['Cornell', 'Harvard']
+    pd.testing.assert_frame_equal(res['Cornell'],
+                                  games.team_results('Cornell', 2019, 2020))
+
+
+def test_league_results_one_request(generate_league_request):
+    res = boydsworld_scraper.boydsworld_teams_results(2022, 2023)
+    assert generate_league_request == [('all', 2022, 2023, 'all')]
+    assert sorted(res) == ['Cornell', 'Harvard', 'Yale']
+    assert res['Yale'].run_difference.tolist() == [0]
+    # per-team requests for the same seasons reuse the raw league table
+    cornell = boydsworld_scraper.boydsworld_team_results('Cornell', 2022,
+                                                         2023)
+    assert len(generate_league_request) == 1
+    pd.testing.assert_frame_equal(cornell, res['Cornell'])
+    vs = boydsworld_scraper.boydsworld_team_results('Cornell', 2022, 2023,
+                                                    vs='Yale')
+    assert vs.opponent.tolist() == ['Yale']
+
+
+def test_league_results_date_order(generate_league_request):
+    res = boydsworld_scraper.boydsworld_league_results(1992, 1994)
+    assert generate_league_request == [('all', 1993, 1993, 'all')]
+    assert res.date.is_monotonic_increasing
+    assert sorted(res.date.dt.year.unique()) == [1992, 1993, 1994]
+    assert 'school' in res.columns
+
+
+def test_league_tables_bounded(generate_league_request, monkeypatch):
+    monkeypatch.setattr(boydsworld_scraper, '_LEAGUE_TABLES_SIZE', 2)
+    for season in [2022, 2023, 2022, 2024]:
+        boydsworld_scraper.boydsworld_league_results(season)
+    # 2022 was used again after 2023, so 2023 is dropped first
+    assert list(boydsworld_scraper._LEAGUE_TABLES) == [
+        (2022, 2022, True), (2024, 2024, True)]
+    assert len(generate_league_request) == 3
+    boydsworld_scraper.clear_cache()
+    boydsworld_scraper.boydsworld_league_results(2022)
+    assert len(generate_league_request) == 4
+
+
+def test_league_request_errors_raised(monkeypatch):
+    def fake_get(url, params=None):
+        raise requests.ConnectionError('unreachable')
+    monkeypatch.setattr(boydsworld_scraper, '_get', fake_get)
+    boydsworld_scraper.clear_cache()
+    with pytest.raises(requests.ConnectionError):
+        boydsworld_scraper.boydsworld_league_results(2022)
+    # a single team's request still answers with an empty frame
+    assert boydsworld_scraper.boydsworld_team_results('Cornell', 2022).empty
+
+
+def test_unexpected_errors_propagate(monkeypatch):
+    def fake_get_data(*args, **kwargs):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(boydsworld_scraper, '_get_data', fake_get_data)
+    with pytest.raises(KeyboardInterrupt):
+        boydsworld_scraper.boydsworld_team_results('Cornell', 2022)
@@ -0,0 +1,120 @@
+from collegebaseball import checkpoint
+from collegebaseball import download_utils, telemetry
+from collegebaseball import ncaa_scraper as ncaa
+from requests import Response
+import os
+import pandas as pd
+import pytest
+
+
+_PARTITION = {'variant': 'batting', 'season': 2022, 'division': 1}
+
+
+@ pytest.fixture()
+def generate_flaky_team_stats(monkeypatch):
+    calls = []
+    broken = set()
+
+    def fake_team_stats(school_id, season, variant):
+        calls.append(school_id)
+        if school_id in broken:
+            raise ConnectionError('blocked')
+        return pd.DataFrame({'name': pd.array(['a', 'b'], dtype='string'),
+                             'H': pd.array([1, 2], dtype='int16')})
+    monkeypatch.setattr(ncaa, 'ncaa_team_stats', fake_team_stats)
+    return calls, broken
+
+
+class _BlockingSession:
+    """
+    answers stats.ncaa.org with a 403 for the school_ids in blocked
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.blocked = set()
+
+    def get(self, url, params=None, **kwargs):
+        school_id = int(url.split('/')[-2])
+        self.calls.append(school_id)
+        res = Response()
+        res.status_code = 403 if school_id in self.blocked else 200
+        res.encoding = 'utf-8'
+        res._content = b'<table></table>'
+        return res
+
+    def close(self):
+        pass
+
+
+@ pytest.fixture()
+def generate_blocking_session():
+    session = _BlockingSession()
+    ncaa.set_session(session)
+    yield session.calls, session.blocked
+    ncaa.set_session(None)
+
+
+def test_shard_round_trip(tmp_path):
+    ckpt = checkpoint.Checkpoint(str(tmp_path), 'team_stats')
+    df = pd.DataFrame({'H': pd.array([1, 2], dtype='int16')}, index=[4, 9])
+    ckpt.write(_PARTITION, 167, df)
+    assert os.path.exists(os.path.join(
+        str(tmp_path), 'team_stats', 'variant=batting', 'season=2022',
+        'division=1', '167.parquet'))
+    assert ckpt.is_complete(_PARTITION, 167)
+    pd.testing.assert_frame_equal(ckpt.read(_PARTITION, 167), df)
+
+
+def test_manifest_reloaded(tmp_path):
+    ckpt = checkpoint.Checkpoint(str(tmp_path), 'rosters')
+    ckpt.write({'season': 2022}, 167, pd.DataFrame({'a': [1]}))
+    ckpt.mark_failed({'season': 2022}, 746, ConnectionError('blocked'))
+    with open(os.path.join(str(tmp_path), 'rosters', '_manifest.jsonl'),
+              'a') as f:
+        f.write('{"shard": "trunc')
+    reloaded = checkpoint.Checkpoint(str(tmp_path), 'rosters')
+    assert reloaded.is_complete({'season': 2022}, 167)
+    assert not reloaded.is_complete({'season': 2022}, 746)
+    assert reloaded.error({'season': 2022}, 746) == 'ConnectionError: blocked'
+    assert reloaded.summary() == {'done': 1, 'failed': 1}
+
+
+def test_rerun_retries_only_failures(generate_flaky_team_stats, tmp_path):
+    calls, broken = generate_flaky_team_stats
+    school_ids = list(download_utils._division_school_ids(1))
+    broken.update(school_ids[:3])
+    first = download_utils.download_team_stats(
+        [2022], 'batting', [1], save=False, rate=None,
+        checkpoint_dir=str(tmp_path))
+    assert len(calls) == len(school_ids)
+    broken.clear()
+    del calls[:]
+    second = download_utils.download_team_stats(
+        [2022], 'batting', [1], save=False, rate=None,
+        checkpoint_dir=str(tmp_path))
+    assert sorted(calls) == sorted(school_ids[:3])
+    assert len(second) == len(first) + 6
+
+
+def test_rerun_retries_blocked(generate_blocking_session, tmp_path):
+    calls, blocked = generate_blocking_session
+    school_ids = list(download_utils._division_school_ids(1))
+    blocked.update(school_ids[:3])
+    first, second = telemetry.BulkResult(), telemetry.BulkResult()
+    download_utils.download_team_stats(
+        [2022], 'batting', [1], save=False, rate=None,
+        checkpoint_dir=str(tmp_path), result=first)
+    assert sorted(k[-1] for k in first.failures) == sorted(school_ids[:3])
+    ckpt = checkpoint.Checkpoint(str(tmp_path), 'team_stats')
+    assert ckpt.summary() == {'done': len(school_ids) - 3, 'failed': 3}
+    assert ckpt.error(_PARTITION, school_ids[0]) == \
+        'ConnectionError: 403 Error: NCAA blocked request'
+    blocked.clear()
+    del calls[:]
+    download_utils.download_team_stats(
+        [2022], 'batting', [1], save=False, rate=None,
+        checkpoint_dir=str(tmp_path), result=second)
+    assert sorted(calls) == sorted(school_ids[:3])
+    assert second.summary()['skipped'] == len(school_ids) - 3
+    assert second.failures == []
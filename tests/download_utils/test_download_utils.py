@@ -0,0 +1,142 @@
+from collegebaseball import download_utils
+from collegebaseball import ncaa_scraper as ncaa
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pytest
+import threading
+
+
+@ pytest.fixture()
+def generate_fake_results(monkeypatch):
+    def fake_team_results(school_id, season):
+        if school_id % 7 == 0:
+            raise ValueError('no data')
+        return pd.DataFrame({'school_id': [school_id] * 3,
+                             'season': [season] * 3,
+                             'game_id': range(3)})
+    monkeypatch.setattr(ncaa, 'ncaa_team_results', fake_team_results)
+
+
+def test_map_concurrently_preserves_order():
+    res = download_utils._map_concurrently(
+        lambda x: x * 2, range(50), max_workers=8, rate=None)
+    assert [r[1] for r in res] == [x * 2 for x in range(50)]
+    assert all(r[2] is None for r in res)
+
+
+def test_map_concurrently_collects_errors():
+    def fn(x):
+        if x == 3:
+            raise KeyError(x)
+        return x
+    res = download_utils._map_concurrently(fn, range(5), rate=None)
+    assert isinstance(res[3][2], KeyError)
+    assert res[3][1] is None
+
+
+def test_concurrent_download_matches_serial(generate_fake_results):
+    serial, serial_result = download_utils.download_team_results(
+        2022, division=1, save=False, max_workers=1, rate=None)
+    threaded, threaded_result = download_utils.download_team_results(
+        2022, division=1, save=False, max_workers=8, rate=None)
+    pd.testing.assert_frame_equal(serial, threaded)
+    assert serial_result.failures == threaded_result.failures
+    assert len(serial_result.failures) > 0
+
+
+def test_concat_empty():
+    assert download_utils._concat([]).empty
+
+
+@ pytest.fixture()
+def generate_fake_team_stats(monkeypatch):
+    def fake_team_stats(school_id, season, variant):
+        if school_id % 7 == 0:
+            raise ValueError('no data')
+        return pd.DataFrame({'name': ['a', 'b'], 'season': [season] * 2})
+    monkeypatch.setattr(ncaa, 'ncaa_team_stats', fake_team_stats)
+
+
+def test_iter_team_stats(generate_fake_team_stats):
+    failures = []
+    seen = {}
+    for key, df in download_utils.iter_team_stats(
+            [2022], 'batting', [1], max_workers=4, rate=None,
+            failures=failures):
+        seen[key] = df
+    school_ids = download_utils._division_school_ids(1)
+    assert len(seen) + len(failures) == len(school_ids)
+    assert all(key[2] % 7 == 0 for key in failures)
+    season, division, school_id = next(iter(seen))
+    assert (season, division) == (2022, 1)
+    assert (seen[(season, division, school_id)]['school_id']
+            == school_id).all()
+
+
+def test_iter_team_stats_stops_early(generate_fake_team_stats):
+    default = ncaa._RATE_LIMITER
+    stream = download_utils.iter_team_stats([2022], 'batting', [1],
+                                            max_workers=2, rate=None)
+    key, df = next(stream)
+    stream.close()
+    assert len(df) == 2
+    assert ncaa._RATE_LIMITER is default
+
+
+def test_concurrent_jobs_keep_their_limiters():
+    default = ncaa._RATE_LIMITER
+    barrier = threading.Barrier(2, timeout=10)
+
+    def fn(key):
+        # both jobs are running by the time either reads its limiter
+        barrier.wait()
+        limiter = ncaa._current_limiter()
+        return None if limiter is None else limiter.rate
+
+    with ThreadPoolExecutor(2) as pool:
+        fast = pool.submit(download_utils._map_concurrently, fn, range(3),
+                           rate=50)
+        unlimited = pool.submit(download_utils._map_concurrently, fn,
+                                range(3), rate=None)
+        assert [r[1] for r in fast.result()] == [50] * 3
+        assert [r[1] for r in unlimited.result()] == [None] * 3
+    assert ncaa._RATE_LIMITER is default
+
+
+@ pytest.fixture()
+def generate_fake_stats_and_totals(monkeypatch):
+    calls = []
+
+    def fake_stats_and_totals(school_id, season, variant):
+        calls.append(school_id)
+        if school_id % 7 == 0:
+            raise ValueError('no data')
+        return (pd.DataFrame({'name': ['a', 'b'], 'H': [1, 2]}),
+                pd.DataFrame({'name': ['Totals'], 'H': [3]}))
+    monkeypatch.setattr(ncaa, 'ncaa_team_stats_and_totals',
+                        fake_stats_and_totals)
+    return calls
+
+
+def test_download_team_stats_and_totals(generate_fake_stats_and_totals,
+                                        tmp_path):
+    calls = generate_fake_stats_and_totals
+    stats, totals, result = download_utils.download_team_stats_and_totals(
+        [2022], 'batting', [1], save=False, max_workers=4, rate=None,
+        checkpoint_dir=str(tmp_path))
+    failures = [school_id for season, division, school_id
+                in result.failures]
+    schools = download_utils._division_school_ids(1)
+    assert sorted(calls) == sorted(schools)
+    assert len(stats) == 2 * (len(schools) - len(failures))
+    assert len(totals) == len(schools) - len(failures)
+    assert set(totals['school_id']) == set(stats['school_id'])
+    assert (tmp_path / 'team_stats').is_dir()
+    assert (tmp_path / 'team_totals').is_dir()
+    # a rerun reads the shards of both datasets instead of refetching
+    calls.clear()
+    _, _, rerun = download_utils.download_team_stats_and_totals(
+        [2022], 'batting', [1], save=False, rate=None,
+        checkpoint_dir=str(tmp_path))
+    assert sorted(calls) == sorted(failures)
+    assert rerun.summary()['skipped'] == len(schools) - len(failures)
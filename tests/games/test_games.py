@@ -0,0 +1,113 @@
+from collegebaseball import boydsworld_scraper, games, guts
+from requests import Response
+import pandas as pd
+import pytest
+
+
+_PAGE = """<html><body>
+<table><tr><td><h2>Cornell vs. all 2022-2022</h2></td></tr></table>
+<table>
+<tr><td>2/25/2022</td><td>Cornell</td><td>4</td><td>Navy</td><td>1</td>
+<td></td><td>@Navy</td></tr>
+<tr><td>2/26/2022</td><td>Navy</td><td>6</td><td>Cornell</td><td>2</td>
+<td></td><td>@Navy</td></tr>
+<tr><td>2/26/2022</td><td>Harvard</td><td>3</td><td>Yale</td><td>2</td>
+<td></td><td>@Yale</td></tr>
+<tr><td>2/26/2022</td><td>Penn</td><td>5</td><td>Cornell</td><td>5</td>
+<td></td><td>@Penn</td></tr>
+</table></body></html>"""
+
+
+@ pytest.fixture()
+def generate_page(monkeypatch):
+    def fake_get(url, params=None):
+        res = Response()
+        res.status_code = 200
+        res.encoding = 'utf-8'
+        res._content = _PAGE.encode('utf-8')
+        return res
+    monkeypatch.setattr(boydsworld_scraper, '_get', fake_get)
+
+
+@ pytest.fixture()
+def generate_network_calls(monkeypatch):
+    calls = []
+
+    def fake_fetch(school, start, end, vs, parse_dates):
+        calls.append((school, start, end, vs))
+        return pd.DataFrame({'date': pd.to_datetime([f'''{start}-03-01''']),
+                             'field': ['@neutral'], 'runs_scored': [3],
+                             'runs_allowed': [2], 'opponent': ['Harvard'],
+                             'run_difference': [1]})
+    monkeypatch.setattr(boydsworld_scraper, '_fetch_team_results',
+                        fake_fetch)
+    return calls
+
+
+def _sorted(df):
+    return (df.sort_values(list(df.columns), kind='stable')
+            .reset_index(drop=True))
+
+
+def test_matches_boydsworld_format(generate_page):
+    # a hand-written page, so the values checked are not the table's
+    scraped = boydsworld_scraper._fetch_team_results('Cornell', 2022, 2022,
+                                                     'all', True)
+    assert scraped.date.tolist() == list(pd.to_datetime(
+        ['2022-02-25', '2022-02-26', '2022-02-26']))
+    assert scraped.opponent.tolist() == ['Navy', 'Navy', 'Penn']
+    assert scraped.runs_scored.tolist() == [4, 2, 5]
+    assert scraped.runs_allowed.tolist() == [1, 6, 5]
+    assert scraped.run_difference.tolist() == [3, -4, 0]
+    # offline answers have the scraped columns and dtypes
+    offline = games.team_results('Cornell', 2019)
+    assert list(offline.columns) == list(scraped.columns)
+    pd.testing.assert_series_equal(offline.dtypes, scraped.dtypes)
+
+
+def test_team_results_range():
+    df = guts.get_games_table()
+    expected = df.loc[(df.school == 'Cornell') & df.season.between(2002, 2018)]
+    res = games.team_results('Cornell', 2002, 2018)
+    assert len(res) == len(expected)
+    assert res.date.dt.year.between(2002, 2018).all()
+    vs = games.team_results('Cornell', 2002, 2018, vs='Harvard')
+    assert len(vs) > 0
+    assert (vs.opponent == 'Harvard').all()
+
+
+def test_team_results_unknown():
+    assert games.team_results('Not A School', 2019).empty
+    assert list(games.team_results('Not A School', 2019).columns) == \
+        games._COLUMNS
+
+
+def test_team_results_string_dates():
+    res = games.team_results('Cornell', 2019, parse_dates=False)
+    assert res.date.iloc[0] == '2/22/2019'
+
+
+def test_covered_seasons():
+    covered, missing = games.covered_seasons(2019, 2023)
+    assert covered == [2019, 2020, 2021]
+    assert missing == [2022, 2023]
+
+
+def test_offline_only(generate_network_calls):
+    res = boydsworld_scraper.boydsworld_team_results('Cornell', 2015, 2019)
+    assert generate_network_calls == []
+    pd.testing.assert_frame_equal(res, games.team_results('Cornell', 2015,
+                                                          2019))
+
+
+def test_network_fallback(generate_network_calls):
+    res = boydsworld_scraper.boydsworld_team_results('Cornell', 2019, 2023)
+    assert generate_network_calls == [('Cornell', 2022, 2023, 'all')]
+    assert res.date.iloc[-1] == pd.Timestamp('2022-03-01')
+    assert len(res) == len(games.team_results('Cornell', 2019, 2021)) + 1
+    assert res.date.is_monotonic_increasing
+
+
+def test_season_ranges():
+    assert boydsworld_scraper._season_ranges([1993, 2022, 2023, 2025]) == [
+        (1993, 1993), (2022, 2023), (2025, 2025)]
@@ -0,0 +1,41 @@
+from collegebaseball import guts
+import os
+import pandas as pd
+import pytest
+
+
+@ pytest.fixture()
+def generate_temp_table(tmp_path):
+    path = tmp_path / 'table.csv'
+    pd.DataFrame({'season': [2021, 2022]}).to_csv(path, index=False)
+    yield path
+    guts.clear_cache()
+
+
+def test_tables_cached():
+    guts.clear_cache()
+    first = guts._read_table(guts.get_schools_path())
+    second = guts._read_table(guts.get_schools_path())
+    assert first is second
+
+
+def test_tables_returned_as_copies():
+    df = guts.get_schools_table()
+    df['ncaa_name'] = 'modified'
+    assert (guts.get_schools_table()['ncaa_name'] != 'modified').all()
+
+
+def test_cache_picks_up_modified_file(generate_temp_table):
+    path = generate_temp_table
+    assert len(guts._read_table(path)) == 2
+    pd.DataFrame({'season': [2021, 2022, 2023]}).to_csv(path, index=False)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert len(guts._read_table(path)) == 3
+
+
+def test_clear_cache(generate_temp_table):
+    path = generate_temp_table
+    first = guts._read_table(path)
+    guts.clear_cache()
+    assert guts._read_table(path) is not first
@@ -0,0 +1,109 @@
+from collegebaseball import http_cache
+from collegebaseball import ncaa_scraper as ncaa
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from requests import Response
+import gzip
+import json
+import os
+import threading
+import time
+import pytest
+
+
+_URL = 'https://stats.ncaa.org/team/167/stats'
+
+
+class _CountingHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    calls = 0
+
+    def do_GET(self):
+        type(self).calls += 1
+        body = b'<table id="stat_grid"></table>'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _response(body):
+    res = Response()
+    res.status_code = 200
+    res.encoding = 'utf-8'
+    res.url = _URL
+    res._content = body
+    return res
+
+
+@ pytest.fixture()
+def generate_cache(tmp_path):
+    return http_cache.ResponseCache(str(tmp_path), current_ttl=60,
+                                    completed_ttl=None)
+
+
+@ pytest.fixture()
+def generate_local_server():
+    _CountingHandler.calls = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _CountingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'''http://127.0.0.1:{server.server_address[1]}/team/167/stats'''
+    server.shutdown()
+    server.server_close()
+    ncaa.disable_cache()
+
+
+def test_cache_key_normalizes_params():
+    a = http_cache.cache_key(_URL, {'id': 15860, 'year_stat_category_id': '1'})
+    b = http_cache.cache_key(_URL, {'year_stat_category_id': 1, 'id': '15860'})
+    assert a == b
+    assert a != http_cache.cache_key(_URL, {'id': 15580})
+
+
+def test_round_trip(generate_cache):
+    cache = generate_cache
+    assert cache.get(_URL, {'id': 1}, 2019) is None
+    cache.put(_URL, {'id': 1}, _response(b'<html>page</html>'))
+    res = cache.get(_URL, {'id': 1}, 2019)
+    assert res.status_code == 200
+    assert res.text == '<html>page</html>'
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_current_season_expires(generate_cache):
+    cache = generate_cache
+    cache.put(_URL, None, _response(b'page'))
+    path = cache._path(http_cache.cache_key(_URL))
+    with gzip.open(path, 'rb') as f:
+        meta = json.loads(f.readline())
+        body = f.read()
+    meta['stored_at'] = time.time() - 120
+    with gzip.open(path, 'wb') as f:
+        f.write(json.dumps(meta).encode('utf-8') + b'\n' + body)
+    assert cache.get(_URL, None, 2013) is not None
+    assert cache.get(_URL, None, http_cache._current_season()) is None
+
+
+def test_lru_eviction(tmp_path):
+    cache = http_cache.ResponseCache(str(tmp_path), max_bytes=2000)
+    for i in range(10):
+        cache.put(_URL, {'id': i}, _response(os.urandom(400)))
+        path = cache._path(http_cache.cache_key(_URL, {'id': i}))
+        os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+    assert cache.stats()['bytes'] <= 2000
+    assert cache.stats()['evictions'] > 0
+    assert cache.get(_URL, {'id': 9}) is not None
+    assert cache.get(_URL, {'id': 0}) is None
+
+
+def test_scraper_uses_cache(generate_local_server, tmp_path):
+    url = generate_local_server
+    ncaa.enable_cache(str(tmp_path))
+    first = ncaa._get(url, params={'id': '15860'}, season=2022)
+    second = ncaa._get(url, params={'id': '15860'}, season=2022)
+    assert first.text == second.text
+    assert _CountingHandler.calls == 1
+    assert ncaa._last_request_cached()
@@ -0,0 +1,81 @@
+from collegebaseball import download_utils, instrument, replay
+from collegebaseball import ncaa_scraper as ncaa
+import os
+import pandas as pd
+import pytest
+
+
+_FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'html')
+
+
+@ pytest.fixture()
+def generate_cassette():
+    previous = ncaa.set_cache(replay.Cassette(_FIXTURES))
+    yield
+    ncaa.set_cache(previous)
+
+
+def test_disabled_records_nothing():
+    assert instrument.active() is None
+    assert instrument.start() is None
+    instrument.record('fetch', None, 10, 1, 200)
+    assert instrument.timed('parse', len, [1, 2]) == 2
+
+
+def test_scraper_stages(generate_cassette):
+    with instrument.collecting() as timings:
+        ncaa.ncaa_team_game_logs(167, 2021, 'pitching')
+    assert instrument.active() is None
+    df = timings.to_frame()
+    assert set(df.scraper) == {'ncaa_team_game_logs'}
+    assert list(df.stage) == ['cache', 'parse', 'transform', 'metrics']
+    cache = df.loc[df.stage == 'cache'].iloc[0]
+    assert cache.status == 200
+    assert cache.bytes > 0
+    assert (df.loc[df.stage != 'cache', 'rows'] > 0).all()
+    assert (df.seconds >= 0).all()
+
+
+def test_histograms(generate_cassette):
+    with instrument.collecting() as timings:
+        ncaa.ncaa_team_stats_and_totals(167, 2022, 'batting')
+        ncaa.ncaa_team_season_roster(167, 2022)
+    hist = timings.histograms()
+    stats = hist.loc['ncaa_team_stats_and_totals']
+    assert stats.loc['cache', 'count'] == 1
+    assert stats.loc['transform', 'count'] == 2
+    assert hist.loc[('ncaa_team_season_roster', 'parse'), 'rows'] > 0
+    buckets = hist.columns[hist.columns.get_loc('non_200') + 1:]
+    assert (hist[buckets].sum(axis=1) == hist['count']).all()
+    assert (hist['p50'] <= hist['p95']).all()
+
+
+def test_histograms_empty():
+    hist = instrument.Collector().histograms()
+    assert hist.empty
+    assert 'p95' in hist.columns
+
+
+@ pytest.fixture()
+def generate_fake_results(monkeypatch):
+    def fake_team_results(school_id, season):
+        started = instrument.start()
+        df = pd.DataFrame({'school_id': [school_id], 'season': [season]})
+        instrument.record('parse', started, rows=len(df))
+        return df
+    monkeypatch.setattr(ncaa, 'ncaa_team_results', fake_team_results)
+
+
+def test_download_run_exports_histograms(generate_fake_results):
+    exported = []
+    timings = instrument.Collector(
+        export=lambda name, hist: exported.append((name, hist)))
+    with instrument.collecting(timings):
+        res, result = download_utils.download_team_results(
+            2022, division=1, save=False, max_workers=4, rate=None)
+    # records made in the worker threads reach the caller's collector
+    assert len(timings.records) == len(res)
+    assert [name for name, _ in exported] == ['download_team_results']
+    hist = exported[0][1]
+    assert hist['count'].sum() == len(res)
+    assert timings.runs[0][0] == 'download_team_results'
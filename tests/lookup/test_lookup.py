@@ -1,5 +1,6 @@
 from cgitb import lookup
 from collegebaseball import guts, lookup
+import pandas as pd
 import pytest
 
 
@@ -110,3 +111,80 @@ def test_lookup_seasons_played(generate_lookup_seasons_played):
 def test_lookup_school_info(generate_lookup_school_info):
     for i in generate_lookup_school_info:
         assert i is not None
+
+
+@ pytest.fixture()
+def generate_temp_schools(tmp_path, monkeypatch):
+    path = tmp_path / 'schools.csv'
+    pd.DataFrame({'ncaa_name': ['Cornell', 'Cornell'],
+                  'bd_name': [None, 'Big Red'],
+                  'school_id': [167, 168],
+                  'division': [1, 3]}).to_csv(path, index=False)
+    monkeypatch.setattr(guts, 'get_schools_path', lambda: str(path))
+    guts.clear_cache()
+    yield path
+    guts.clear_cache()
+
+
+def test_index_matches_tables():
+    df = guts.get_schools_table().drop_duplicates('ncaa_name')
+    for name, school_id, division in zip(
+            df['ncaa_name'], df['school_id'], df['division']):
+        assert lookup.lookup_school(name) == (school_id, division)
+    rosters = guts.get_rosters_table().drop_duplicates(
+        ['stats_player_seq', 'season']).sample(50)
+    for seq, season, name, school_id in zip(
+            rosters['stats_player_seq'], rosters['season'],
+            rosters['name'], rosters['school_id']):
+        res = lookup.lookup_player_reverse(seq, season)
+        assert (res[0], res[2]) == (name, school_id)
+
+
+def test_index_first_row_wins(generate_temp_schools):
+    assert lookup.lookup_school('Cornell') == (167, 1)
+    assert lookup.lookup_school('Big Red') == (168, 3)
+    assert lookup.lookup_school_reverse(168) == ('Cornell', 3)
+
+
+def test_index_missing_keys(generate_temp_schools):
+    assert lookup.lookup_school('Harvard') == 'could not find school Harvard'
+    assert lookup.lookup_school_reverse(1) == 'could not find school 1'
+    assert lookup.lookup_player_reverse(1, 2019) == \
+        'could not find player 1'
+    with pytest.raises(KeyError):
+        lookup.lookup_season_id(1900)
+
+
+def test_index_rebuilt_after_reload(generate_temp_schools):
+    assert lookup.lookup_school('Cornell') == (167, 1)
+    pd.DataFrame({'ncaa_name': ['Cornell'], 'bd_name': [None],
+                  'school_id': [999], 'division': [2]}).to_csv(
+                      generate_temp_schools, index=False)
+    guts.clear_cache()
+    assert lookup.lookup_school('Cornell') == (999, 2)
+
+
+def test_lookup_schools_reverse():
+    ids = pd.Series([167, -1, 167], index=[10, 11, 12])
+    res = lookup.lookup_schools_reverse(ids)
+    assert list(res.index) == [10, 11, 12]
+    assert res.loc[10, 'ncaa_name'] == lookup.lookup_school_reverse(167)[0]
+    assert res.loc[[11], ['ncaa_name', 'division']].isna().all().all()
+    assert res.loc[12, 'division'] == res.loc[10, 'division']
+
+
+def test_lookup_players_reverse():
+    rosters = guts.get_rosters_table().drop_duplicates(
+        ['stats_player_seq', 'season']).sample(20)
+    ids = list(rosters['stats_player_seq']) + [1]
+    seasons = list(rosters['season']) + [2019]
+    res = lookup.lookup_players_reverse(ids, seasons)
+    assert len(res) == len(ids)
+    assert list(res['school_id'][:-1]) == list(rosters['school_id'])
+    assert res.iloc[-1][['name', 'school', 'school_id']].isna().all()
+
+
+def test_lookup_seasons():
+    res = lookup.lookup_seasons([2019, 1900])
+    assert tuple(res.iloc[0, 1:]) == lookup.lookup_season_ids(2019)
+    assert res.iloc[1, 1:].isna().all()
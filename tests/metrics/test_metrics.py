@@ -0,0 +1,78 @@
+from collegebaseball import metrics
+import numpy as np
+import pandas as pd
+import pytest
+
+
+_BATTING_COLS = ['AB', 'BB', 'SF', 'SH', 'HBP', 'IBB', 'H', '2B', '3B', 'HR',
+                 'K']
+
+
+@ pytest.fixture()
+def generate_batting_stats():
+    rng = np.random.default_rng(0)
+    n = 200
+    data = {'name': ['player'] * n}
+    for col in _BATTING_COLS:
+        data[col] = rng.integers(0, 30, n).astype('int16')
+    data['AB'] = rng.integers(0, 250, n).astype('int16')
+    data['H'] = (data['AB'] // 3).astype('int16')
+    data['2B'] = (data['H'] // 5).astype('int16')
+    data['3B'] = (data['H'] // 20).astype('int16')
+    data['HR'] = (data['H'] // 8).astype('int16')
+    data['IBB'] = (data['BB'] // 10).astype('int16')
+    data['season'] = rng.integers(2013, 2024, n).astype('int16')
+    data['division'] = rng.integers(1, 4, n).astype('int8')
+    return pd.DataFrame(data)
+
+
+def test_batting_metrics_match_manual(generate_batting_stats):
+    res = metrics.add_batting_metrics(generate_batting_stats)
+    for _, row in res.head(25).iterrows():
+        woba = metrics.calculate_woba_manual(
+            row['PA'], row['BB'], row['HBP'], row['1B'], row['2B'],
+            row['3B'], row['HR'], row['season'], row['division'])
+        wrc = metrics.calculate_wrc_manual(
+            row['PA'], row['wOBA'], row['season'], row['division'])
+        assert row['wOBA'] == woba
+        assert row['wRC'] == wrc
+
+
+def test_batting_metrics_unknown_season(generate_batting_stats):
+    df = generate_batting_stats
+    df['season'] = 1999
+    res = metrics.add_batting_metrics(df)
+    assert (res['wOBA'] == 0.00).all()
+    assert (res['wRC'] == 0.00).all()
+
+
+@ pytest.fixture()
+def generate_pitching_stats():
+    rng = np.random.default_rng(1)
+    n = 200
+    data = {'name': ['player'] * n}
+    for col in ['H', 'HR-A', '3B-A', '2B-A', 'BB', 'IBB', 'HB', 'SFA', 'SHA',
+                'SO', 'pitches', 'App', 'GO', 'FO']:
+        data[col] = rng.integers(0, 30, n).astype('int16')
+    data['BF'] = rng.integers(0, 300, n).astype('int16')
+    data['IP'] = np.round(rng.integers(0, 90, n)
+                          + rng.integers(0, 3, n) / 10, 4)
+    data['season'] = rng.integers(2013, 2024, n).astype('int16')
+    data['division'] = rng.integers(1, 4, n).astype('int8')
+    return pd.DataFrame(data)
+
+
+def test_adjust_innings_pitched():
+    df = pd.DataFrame({'IP': [0.0, 5.1, 5.2, 7.0]})
+    res = metrics._adjust_innings_pitched(df)
+    assert list(res) == [0.0, 5.333, 5.667, 7.0]
+
+
+def test_pitching_metrics_match_manual(generate_pitching_stats):
+    res = metrics.add_pitching_metrics(generate_pitching_stats)
+    for _, row in res.loc[res['IP-adj'] > 0].head(25).iterrows():
+        fip = metrics.calculate_fip_manual(
+            row['HR-A'], row['BB'], row['HB'], row['SO'], row['IP-adj'],
+            row['season'], row['division'])
+        assert row['FIP'] == fip
+    assert (res.loc[res['IP-adj'] == 0, 'FIP'] == 0.00).all()
@@ -0,0 +1,118 @@
+from collegebaseball import ncaa_parser
+import os
+import pytest
+
+
+_FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'html')
+
+
+def _fixture(name):
+    with open(os.path.join(_FIXTURES, name)) as f:
+        return f.read()
+
+
+def _cell(html):
+    root = ncaa_parser.parse_document('<table><tr>' + html + '</tr></table>')
+    return root.find('.//td')
+
+
+@ pytest.fixture()
+def generate_team_stats():
+    return ncaa_parser.stat_grid(_fixture('team_stats_batting.html'),
+                                 'tbody', player_links=True)
+
+
+def test_element_string():
+    assert ncaa_parser.element_string(_cell('<td>45</td>')) == '45'
+    assert ncaa_parser.element_string(
+        _cell('<td><a href="/x">Lora, Manny</a></td>')) == 'Lora, Manny'
+    assert ncaa_parser.element_string(_cell('<td></td>')) is None
+    assert ncaa_parser.element_string(
+        _cell('<td>a<b>b</b></td>')) is None
+    assert ncaa_parser.element_text(_cell('<td>a<!-- c --><b>b</b></td>')) \
+        == 'ab'
+
+
+def test_empty_page():
+    assert ncaa_parser.parse_document('') is None
+    assert ncaa_parser.stat_grid('') is None
+    assert ncaa_parser.stat_grid('<html><table></table></html>') is None
+
+
+def test_stat_grid(generate_team_stats):
+    headers, rows = generate_team_stats
+    assert headers[:4] == ['Jersey', 'Player', 'Yr', 'Pos']
+    assert len(rows) == 38
+    # jersey, stats_player_seq, name, then one value per remaining header
+    assert all(len(row) == len(headers) + 1 for row in rows)
+    assert isinstance(rows[0][1], int)
+    assert rows[5][1] == '-'
+
+
+def test_stat_grid_totals():
+    headers, rows = ncaa_parser.stat_grid(
+        _fixture('team_stats_batting.html'), 'tfoot', last=False)
+    assert [row[1] for row in rows] == ['Totals', 'Opponent Totals']
+    assert all(len(row) == len(headers) for row in rows)
+
+
+def test_career_table():
+    headers, rows, last_row = ncaa_parser.career_table(
+        _fixture('career_batting.html'))
+    assert headers[:2] == ['Year', 'Team']
+    assert [row[0] for row in rows] == [
+        '2019-20', '2020-21', '2021-22', '2022-23']
+    assert rows[0][1] == '167'
+    # the career row has no team cell
+    assert last_row[0] == 'Total'
+    assert len(last_row) == len(headers) - 1
+
+
+def test_game_log_rows():
+    rows = ncaa_parser.game_log_rows(
+        _fixture('player_game_logs_batting.html'))
+    # 56 games plus the trailing defensive totals row
+    assert len(rows) == 57
+    assert '/' in ncaa_parser.element_string(rows[0][0])
+
+
+def _edit_game_log(old, new, count=1):
+    text = _fixture('team_game_logs_pitching.html')
+    assert old in text
+    return text.replace(old, new, count)
+
+
+def test_game_log_cells():
+    for name in ['player_game_logs_batting.html',
+                 'team_game_logs_pitching.html']:
+        text = _fixture(name)
+        rows = ncaa_parser.game_log_cells(text)
+        assert len(rows) == len(ncaa_parser.game_log_rows(text))
+    stats, date, opponent_id, opponent, score, game_id = rows[0]
+    assert date == '06/05/2022'
+    assert (opponent_id, opponent) == ('518194', '@ Texas')
+    assert (score, game_id) == ('L 8 - 11', '4186048')
+    assert len(stats) == 33
+
+
+def test_game_log_cells_entities():
+    text = _edit_game_log('>@ Texas<', '>@ Texas A&amp;M&nbsp;&#39;s<')
+    assert ncaa_parser.game_log_cells(text)[0][3] == '@ Texas A&M\xa0\'s'
+
+
+@ pytest.mark.parametrize('old,new', [
+    ('>@ Texas</a>', '>@ Texas</a> <a href="/teams/1">Longhorns</a>'),
+    ('<a href="/teams/518194">', '<a class="x" href=\'/teams/518194\'>'),
+    ('</tr>', '</tr>\r\n</tbody><tbody>'),
+    ('<td>06/05/2022</td>', '<td><!-- x -->06/05/2022</td>'),
+    ('<td>06/05/2022</td>', '<TD>06/05/2022</TD>'),
+    ('<td>06/05/2022</td>', '<td><b>06/05/2022</b></td>'),
+    ('<td>06/05/2022</td>', '<td>06/05/2022'),
+])
+def test_game_log_cells_variants(old, new):
+    # markup the NCAA does not write still reads to the same games
+    expected = ncaa_parser.game_log_cells(
+        _fixture('team_game_logs_pitching.html'))
+    res = ncaa_parser.game_log_cells(_edit_game_log(old, new))
+    assert [row[0] for row in res] == [row[0] for row in expected]
+    assert res[1:] == expected[1:]
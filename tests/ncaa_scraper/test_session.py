@@ -0,0 +1,107 @@
+from collegebaseball import rate_limit
+from collegebaseball import ncaa_scraper as ncaa
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import pytest
+from requests import Response
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    """
+    responds 503 to the first two requests, then 200
+    """
+    protocol_version = 'HTTP/1.1'
+    calls = 0
+
+    def do_GET(self):
+        type(self).calls += 1
+        status = 503 if type(self).calls <= 2 else 200
+        body = b'ok'
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@ pytest.fixture()
+def generate_local_server():
+    _FlakyHandler.calls = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _FlakyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'''http://127.0.0.1:{server.server_address[1]}/'''
+    server.shutdown()
+    server.server_close()
+    ncaa.set_session(None)
+
+
+def test_shared_session_reused():
+    ncaa.set_session(None)
+    assert ncaa.get_session() is ncaa.get_session()
+
+
+def test_retries_with_backoff(generate_local_server):
+    ncaa.set_session(ncaa.create_session(max_retries=3, backoff_factor=0))
+    with ncaa.rate_limited(None):
+        r = ncaa._get(generate_local_server)
+    assert r.status_code == 200
+    assert _FlakyHandler.calls == 3
+
+
+def test_retries_exhausted(generate_local_server):
+    ncaa.set_session(ncaa.create_session(max_retries=1, backoff_factor=0))
+    with ncaa.rate_limited(None):
+        r = ncaa._get(generate_local_server)
+    assert r.status_code == 503
+
+
+class _RecordingLimiter:
+    """
+    records the host of every request instead of waiting
+    """
+
+    def __init__(self):
+        self.hosts = []
+
+    def acquire(self, host):
+        self.hosts.append(host)
+        return 0.0
+
+
+def test_direct_requests_paced(generate_local_server):
+    # single scraper calls are limited without a bulk job around them
+    assert isinstance(ncaa._RATE_LIMITER, rate_limit.HostRateLimiter)
+    assert ncaa._RATE_LIMITER.rate == ncaa._DEFAULT_RATE
+    _FlakyHandler.calls = 2  # past its two 503s
+    limiter = _RecordingLimiter()
+    previous = ncaa.set_rate_limiter(limiter)
+    try:
+        for _ in range(3):
+            assert ncaa._get(generate_local_server).status_code == 200
+    finally:
+        ncaa.set_rate_limiter(previous)
+    assert limiter.hosts == ['127.0.0.1'] * 3
+
+
+def test_retries_paced(generate_local_server):
+    ncaa.set_session(ncaa.create_session(max_retries=3, backoff_factor=0))
+    limiter = _RecordingLimiter()
+    with ncaa.rate_limited(limiter):
+        r = ncaa._get(generate_local_server)
+    assert r.status_code == 200
+    # one token for the request and one for each of its two retries
+    assert limiter.hosts == ['127.0.0.1'] * 3
+
+
+def test_blocked_request_logged(monkeypatch, caplog, capsys):
+    blocked = Response()
+    blocked.status_code = 403
+    monkeypatch.setattr(ncaa, '_get', lambda *args, **kwargs: blocked)
+    with caplog.at_level('WARNING', logger='collegebaseball.ncaa_scraper'):
+        res = ncaa.ncaa_team_stats('Cornell', 2022, 'batting')
+    assert res.empty
+    assert capsys.readouterr().out == ''
+    assert '403 Error: NCAA blocked request' in caplog.text
@@ -0,0 +1,38 @@
+from collegebaseball import ncaa_scraper as ncaa
+import os
+import pandas as pd
+import pytest
+
+
+_FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'html')
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def __init__(self, text):
+        self.text = text
+
+
+@ pytest.fixture()
+def generate_saved_page(monkeypatch):
+    with open(os.path.join(_FIXTURES, 'team_stats_batting.html')) as f:
+        text = f.read()
+    requests = []
+
+    def fake_get(url, params=None, season=None):
+        requests.append((url, params))
+        return _FakeResponse(text)
+    monkeypatch.setattr(ncaa, '_get', fake_get)
+    return requests
+
+
+def test_single_request(generate_saved_page):
+    stats, totals = ncaa.ncaa_team_stats_and_totals(167, 2022, 'batting')
+    assert len(generate_saved_page) == 1
+    pd.testing.assert_frame_equal(
+        stats, ncaa.ncaa_team_stats(167, 2022, 'batting'))
+    pd.testing.assert_frame_equal(
+        totals, ncaa.ncaa_team_totals(167, 2022, 'batting'))
+    assert len(generate_saved_page) == 3
+    assert generate_saved_page[0] == generate_saved_page[1]
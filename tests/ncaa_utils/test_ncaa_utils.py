@@ -0,0 +1,59 @@
+from collegebaseball import ncaa_utils
+import pandas as pd
+import pytest
+
+
+@ pytest.fixture()
+def generate_raw_stats():
+    return pd.DataFrame({
+        'Jersey': ['12', '', '7'],
+        'stats_player_seq': [2486499, '-', 2347964],
+        'Player': ['Gelof, Jake', 'Totals', None],
+        'Yr': ['Sr', None, 'Fr'],
+        'Pos': ['3B', '-', ''],
+        'BA': ['.301', '.250', '-'],
+        'H': ['91', '1,204', '--'],
+        'Pitches': ['1,517', '-', '0'],
+        'ERA': ['3.505555', '', '-'],
+        'extras': ['True', 'False', False],
+        'date': ['02/18/2022', '03/01/2022', '05/20/2022'],
+        'season': [2022, 2022, 2022]})
+
+
+def test_transform_stats_numeric(generate_raw_stats):
+    res = ncaa_utils._transform_stats(generate_raw_stats)
+    assert list(res['H']) == [91, 1204, 0]
+    assert res['H'].dtype == 'int16'
+    assert list(res['pitches']) == [1517, 0, 0]
+    assert res['pitches'].dtype == 'int32'
+    assert list(res['ERA']) == [3.5056, 0.0, 0.0]
+    assert list(res['Jersey']) == [12, 0, 7]
+    assert list(res['stats_player_seq']) == [2486499, 0, 2347964]
+    assert list(res['extras']) == [True, False, False]
+
+
+def test_transform_stats_strings(generate_raw_stats):
+    res = ncaa_utils._transform_stats(generate_raw_stats)
+    assert list(res['name'][:2]) == ['Jake Gelof', 'Totals']
+    assert pd.isna(res['name'][2])
+    assert res['name'].dtype == 'string'
+    # text is kept as parsed rather than turned into 0.0
+    assert list(res['pos']) == ['3B', '-', '']
+    assert list(res['season']) == [2022, 2022, 2022]
+
+
+def test_transform_stats_columns(generate_raw_stats):
+    res = ncaa_utils._transform_stats(generate_raw_stats)
+    assert 'BA' not in res.columns
+    assert list(res.columns) == [
+        'Jersey', 'stats_player_seq', 'name', 'Yr', 'pos', 'H', 'pitches',
+        'ERA', 'extras', 'date', 'season']
+
+
+def test_format_names():
+    assert ncaa_utils._format_names('Blumenfeld, Nathan') == \
+        'Nathan Blumenfeld'
+    res = ncaa_utils._format_name_column(
+        pd.Series(['Blumenfeld, Nathan', 0.0]))
+    assert res[0] == ncaa_utils._format_names('Blumenfeld, Nathan')
+    assert pd.isna(res[1])
@@ -0,0 +1,48 @@
+import subprocess
+import sys
+import pytest
+
+
+# cumulative microseconds `import collegebaseball` may take, as reported
+# by `python -X importtime`. the lazy package imports in ~1ms, the eager
+# one took ~800ms, so this leaves plenty of room for slow CI machines
+_IMPORT_TIME_THRESHOLD_US = 50_000
+_HEAVY_MODULES = ['pandas', 'bs4', 'lxml', 'requests', 'tqdm']
+
+
+def _run(code):
+    return subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          capture_output=True, text=True, check=True)
+
+
+def _cumulative_us(stderr, module):
+    for line in stderr.splitlines():
+        parts = [x.strip() for x in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise ValueError(f'''{module} not found in -X importtime output''')
+
+
+@ pytest.fixture()
+def generate_import_times():
+    return [_cumulative_us(_run('import collegebaseball').stderr,
+                           'collegebaseball') for _ in range(3)]
+
+
+def test_import_time(generate_import_times):
+    assert min(generate_import_times) < _IMPORT_TIME_THRESHOLD_US
+
+
+def test_heavy_dependencies_deferred():
+    code = ('import sys, collegebaseball\n'
+            'from collegebaseball import lookup, win_pct\n'
+            f'''print([m for m in {_HEAVY_MODULES!r} if m in sys.modules])''')
+    assert _run(code).stdout.strip() == '[]'
+
+
+def test_public_names_resolve():
+    import collegebaseball
+    for name in collegebaseball.__all__:
+        assert callable(getattr(collegebaseball, name))
+    with pytest.raises(AttributeError):
+        collegebaseball.not_a_function
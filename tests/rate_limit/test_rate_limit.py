@@ -0,0 +1,32 @@
+from collegebaseball import rate_limit
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+import pytest
+
+
+def test_token_bucket_rate():
+    bucket = rate_limit.TokenBucket(rate=50, burst=1)
+    start = monotonic()
+    for _ in range(11):
+        bucket.acquire()
+    # first token is free, the next ten take 1/50s each
+    assert monotonic() - start >= 0.19
+
+
+def test_token_bucket_threads():
+    bucket = rate_limit.TokenBucket(rate=100, burst=5)
+    start = monotonic()
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: bucket.acquire(), range(25)))
+    assert monotonic() - start >= 0.19
+
+
+def test_hosts_limited_independently():
+    limiter = rate_limit.HostRateLimiter(rate=1, burst=1)
+    assert limiter.acquire('stats.ncaa.org') == 0
+    assert limiter.acquire('www.boydsworld.com') == 0
+
+
+def test_invalid_rate():
+    with pytest.raises(ValueError):
+        rate_limit.TokenBucket(rate=0)
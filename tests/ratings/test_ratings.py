@@ -0,0 +1,80 @@
+from collegebaseball import guts, ratings
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@ pytest.fixture()
+def generate_games():
+    # (season, team, opponent, runs_scored, runs_allowed), one perspective
+    games = [(2019, 'A', 'B', 5, 2), (2019, 'A', 'B', 3, 3),
+             (2019, 'A', 'C', 1, 4), (2019, 'B', 'C', 6, 0),
+             (2019, 'C', 'D', 2, 1), (2019, 'D', 'B', 7, 8),
+             (2019, 'A', 'Club', 9, 0), (2020, 'A', 'B', 1, 0)]
+    rows = []
+    for season, team, opponent, scored, allowed in games:
+        rows.append((season, team, opponent, scored, allowed))
+        if opponent != 'Club':
+            rows.append((season, opponent, team, allowed, scored))
+    return pd.DataFrame(rows, columns=['season', 'school', 'opponent',
+                                       'runs_scored', 'runs_allowed'])
+
+
+def _rpi_by_loops(games):
+    games = games.loc[games.opponent.isin(games.school)]
+    res = {}
+    for season, df in games.groupby('season'):
+        def wp(team, without=None):
+            own = df.loc[(df.school == team) & (df.opponent != without)]
+            if len(own) == 0:
+                return np.nan
+            won = ((own.runs_scored > own.runs_allowed).sum()
+                   + (own.runs_scored == own.runs_allowed).sum() / 2)
+            return won / len(own)
+
+        def owp(team):
+            opponents = df.loc[df.school == team, 'opponent']
+            return np.nanmean([wp(o, without=team) for o in opponents])
+        for team in df.school.unique():
+            opponents = df.loc[df.school == team, 'opponent']
+            oowp = np.nanmean([owp(o) for o in opponents])
+            res[(team, season)] = (wp(team), owp(team), oowp)
+    return res
+
+
+def test_matches_loops(generate_games):
+    res = ratings.calculate_rpi(generate_games)
+    expected = _rpi_by_loops(generate_games)
+    assert len(res) == len(expected)
+    for row in res.itertuples():
+        wp, owp, oowp = expected[(row.school, row.season)]
+        assert row.wp == pytest.approx(wp)
+        assert row.owp == pytest.approx(owp, nan_ok=True)
+        assert row.oowp == pytest.approx(oowp, nan_ok=True)
+        assert row.rpi == pytest.approx(.25 * wp + .5 * owp + .25 * oowp,
+                                        nan_ok=True)
+        assert row.sos == pytest.approx((2 * owp + oowp) / 3, nan_ok=True)
+    a = res.loc[(res.school == 'A') & (res.season == 2019)].iloc[0]
+    # the game against the club team does not count
+    assert (a.games, a.wins, a.ties, a.losses) == (3, 1, 1, 1)
+
+
+def test_update_matches_full_rating():
+    games = guts.get_games_table()
+    last = games.loc[games.season == 2021, 'date'].max()
+    table = ratings.Ratings(games.loc[games.date < last])
+    before = table.table.loc[table.table.season == 2020]
+    res = table.update(games.loc[games.date == last])
+    pd.testing.assert_frame_equal(res, ratings.calculate_rpi(games))
+    pd.testing.assert_frame_equal(res.loc[res.season == 2020], before)
+
+
+def test_other_columns(generate_games):
+    renamed = generate_games.rename(columns={
+        'season': 'season_id', 'school': 'school_id',
+        'opponent': 'opponent_id'})
+    res = ratings.calculate_rpi(renamed, team='school_id',
+                                opponent='opponent_id', season='season_id')
+    expected = ratings.calculate_rpi(generate_games)
+    pd.testing.assert_series_equal(res.rpi, expected.rpi)
+    assert list(res.columns[:2]) == ['school_id', 'season_id']
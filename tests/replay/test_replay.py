@@ -0,0 +1,107 @@
+from collegebaseball import boydsworld_scraper, replay
+from collegebaseball import ncaa_scraper as ncaa
+from requests import Response
+import os
+import pytest
+
+
+_FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'html')
+_PAGES = ['stats', 'career', 'game_by_game', 'roster', 'boydsworld']
+
+
+@ pytest.fixture()
+def generate_cassette():
+    cassette = replay.Cassette(_FIXTURES)
+    previous = (ncaa.set_cache(cassette),
+                boydsworld_scraper.set_cache(cassette))
+    yield cassette
+    ncaa.set_cache(previous[0])
+    boydsworld_scraper.set_cache(previous[1])
+
+
+def test_page_type():
+    assert replay.page_type('https://stats.ncaa.org/team/167/stats') == 'stats'
+    assert replay.page_type(
+        'https://stats.ncaa.org/team/167/roster/15860') == 'roster'
+    assert replay.page_type(
+        'https://stats.ncaa.org/player/game_by_game?') == 'game_by_game'
+    assert replay.page_type('https://stats.ncaa.org/player/index') == 'career'
+    assert replay.page_type(
+        'http://www.boydsworld.com/cgi/scores.pl') == 'boydsworld'
+    assert replay.page_type('https://stats.ncaa.org/teams/531500') == 'other'
+
+
+def test_every_page_type_recorded():
+    cassette = replay.Cassette(_FIXTURES)
+    for page in _PAGES:
+        entries = cassette.entries(page)
+        assert len(entries) > 0
+        for entry in entries:
+            assert len(cassette.body(entry)) > 0
+
+
+def test_replay_miss():
+    cassette = replay.Cassette(_FIXTURES)
+    with pytest.raises(replay.ReplayMiss):
+        cassette.get('https://stats.ncaa.org/team/1/stats', {'id': 1})
+    assert cassette.misses == 1
+
+
+def test_record(tmp_path):
+    url = 'https://stats.ncaa.org/team/167/roster/15860'
+    cassette = replay.Cassette(str(tmp_path), record=True)
+    assert cassette.get(url) is None
+    res = Response()
+    res.status_code = 200
+    res.encoding = 'utf-8'
+    res._content = b'<table></table>'
+    cassette.put(url, {'year': 2022, 'skip': None}, res)
+    reloaded = replay.Cassette(str(tmp_path))
+    r = reloaded.get(url, {'year': '2022'})
+    assert r.status_code == 200
+    assert r.text == '<table></table>'
+    assert reloaded.entries()[0]['file'].startswith('roster_')
+    assert reloaded.hits == 1
+
+
+def test_replay_not_recording(tmp_path):
+    cassette = replay.Cassette(str(tmp_path))
+    cassette.put('https://stats.ncaa.org/team/167/stats', None, Response())
+    assert not os.path.exists(os.path.join(str(tmp_path), 'index.json'))
+
+
+def test_replay_stats_and_totals(generate_cassette):
+    stats, totals = ncaa.ncaa_team_stats_and_totals(167, 2022, 'pitching')
+    assert len(stats) > 0
+    assert len(totals) == 2
+    assert generate_cassette.hits == 1
+
+
+def test_replay_game_logs(generate_cassette):
+    team = ncaa.ncaa_team_game_logs(167, 2021, 'pitching')
+    player = ncaa.ncaa_player_game_logs(2347964, 2022, 'batting')
+    assert len(team) > 0
+    assert len(player) > 0
+    assert (player.stats_player_seq == 2347964).all()
+
+
+def test_replay_career(generate_cassette):
+    df = ncaa.ncaa_career_stats(1416690, 'batting')
+    assert len(df) > 0
+    assert 'wOBA' in df.columns
+
+
+def test_replay_roster(generate_cassette):
+    df = ncaa.ncaa_team_season_roster(167, 2022)
+    assert len(df) > 0
+    assert df.stats_player_seq.dtype == 'int64'
+    assert (df.school_id == 167).all()
+
+
+def test_replay_boydsworld(generate_cassette):
+    # 2019 is in the bundled games table, so request the page directly
+    df = boydsworld_scraper._fetch_team_results('Cornell', 2019, 2019, 'all',
+                                                True)
+    assert len(df) > 0
+    assert set(['runs_scored', 'runs_allowed', 'opponent']) <= set(df.columns)
+    assert generate_cassette.hits == 1
@@ -0,0 +1,106 @@
+from collegebaseball import ncaa_scraper as ncaa
+from collegebaseball import schemas
+import os
+import pytest
+
+
+_FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'html')
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def __init__(self, text):
+        self.text = text
+
+
+@ pytest.fixture()
+def generate_team_game_log_page(monkeypatch):
+    # a 2021 pitching page, with 33 stat columns
+    with open(os.path.join(_FIXTURES, 'team_game_logs_pitching.html')) as f:
+        text = f.read()
+    monkeypatch.setattr(ncaa, '_get', lambda url, params=None,
+                        season=None: _FakeResponse(text))
+
+
+def test_every_schema_compiles():
+    registry = schemas.get_registry()
+    for variant in ['batting', 'pitching', 'fielding']:
+        assert registry.seasons(variant) == list(range(2012, 2024))
+        for season in registry.seasons(variant):
+            team = registry.get('team_game_logs', variant, season)
+            player = registry.get('player_game_logs', variant, season)
+            assert team.meta == tuple(schemas._GAME_META)
+            assert player.meta == team.meta + ('stats_player_seq',)
+            assert player.stats == team.stats
+            assert len(set(team.columns)) == len(team.columns)
+            for col in team.columns:
+                assert (team.stats + team.meta)[team.positions[col]] == col
+
+
+def test_fixed_headers():
+    # these used to be missing a comma, merging two columns into one
+    batting = schemas.get_schema('team_game_logs', 'batting', 2021)
+    assert batting.stats[-1] == 'RBI2out'
+    assert 'fieldseason_id' not in batting.columns
+    pitching = schemas.get_schema('player_game_logs', 'pitching', 2012)
+    assert pitching.stats[-1] == 'KL'
+    assert 'innings_playedextras' not in pitching.columns
+
+
+def test_schemas_are_cached():
+    assert schemas.get_schema('team_game_logs', 'fielding', 2017) is \
+        schemas.get_schema('team_game_logs', 'fielding', 2017)
+
+
+def test_ghost_columns():
+    schema = schemas.get_schema('team_game_logs', 'fielding', 2017)
+    assert schema.stats[:2] == ('G', 'G')
+    assert schema.columns.count('G') == 1
+    assert schema.n_stats == 12
+
+
+def test_unknown_schema():
+    with pytest.raises(schemas.SchemaError, match='2012-2023'):
+        schemas.get_schema('team_game_logs', 'batting', 2011)
+    with pytest.raises(schemas.SchemaError, match='variant'):
+        schemas.get_schema('team_game_logs', 'hitting', 2022)
+    with pytest.raises(schemas.SchemaError, match='source'):
+        schemas.get_schema('team_stats', 'batting', 2022)
+
+
+def test_split_id():
+    registry = schemas.get_registry()
+    assert registry.split_id('batting', 2022, 'two_outs') == '17200'
+    assert registry.split_id('pitching', 2023, 'vs_RH') == '17305'
+    with pytest.raises(schemas.SchemaError):
+        registry.split_id('batting', 2022, 'vs_lefties')
+    with pytest.raises(schemas.SchemaError):
+        registry.split_id('fielding', 2022, 'two_outs')
+
+
+def test_buffer():
+    schema = schemas.get_schema('team_game_logs', 'fielding', 2017)
+    buffer = schema.buffer(3)
+    stats = [str(i) for i in range(schema.n_stats)]
+    assert not buffer.fits(stats[1:])
+    assert buffer.fits(stats)
+    buffer.append(stats, ('02/18/2022', 'home', 15860, '-', 'Rice', '10',
+                          'True', 5, 3, 2, 'win', '2196571', 167))
+    res = buffer.columns()
+    assert list(res) == list(schema.columns)
+    assert list(res['G']) == ['0']
+    assert list(res['PO']) == ['2']
+    assert res['opponent_id'].dtype == 'int32'
+    assert list(res['opponent_id']) == [0]
+    assert list(res['innings_played']) == [10]
+    assert list(res['extras']) == [True]
+    assert list(res['game_id']) == [2196571]
+
+
+def test_page_drift(generate_team_game_log_page):
+    res = ncaa.ncaa_team_game_logs(167, 2021, 'pitching')
+    assert len(res) > 0
+    # 2019 pages had no pickoffs column
+    with pytest.raises(schemas.SchemaError, match='33 stat columns'):
+        ncaa.ncaa_team_game_logs(167, 2019, 'pitching')
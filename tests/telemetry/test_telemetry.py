@@ -0,0 +1,117 @@
+from collegebaseball import download_utils, telemetry
+from collegebaseball import ncaa_scraper as ncaa
+from requests import Response
+import pandas as pd
+import pytest
+
+
+def _response(status_code):
+    res = Response()
+    res.status_code = status_code
+    res.encoding = 'utf-8'
+    res._content = b'<table></table>'
+    return res
+
+
+class _FakeSession:
+    """
+    answers stats.ncaa.org with a 403 for school_ids divisible by 5
+    """
+
+    def get(self, url, params=None, **kwargs):
+        school_id = int(url.split('/')[-2])
+        return _response(403 if school_id % 5 == 0 else 200)
+
+    def close(self):
+        pass
+
+
+@ pytest.fixture()
+def generate_fake_session():
+    ncaa.set_session(_FakeSession())
+    yield
+    ncaa.set_session(None)
+
+
+def test_track_ok():
+    def fn(key):
+        telemetry.log_request(_response(200), 0.25)
+        telemetry.log_request(_response(200), 0.0, cached=True)
+        return key * 2
+    result, error, record = telemetry.track(fn, 3)
+    assert (result, error) == (6, None)
+    assert record.status == 'ok'
+    assert record.http_status == 200
+    assert record.requests == 2
+    assert record.latency == 0.25
+    assert record.seconds >= 0
+
+
+def test_track_failure():
+    def fn(key):
+        telemetry.log_request(_response(403), 0.1)
+        raise KeyError(key)
+    result, error, record = telemetry.track(fn, 3)
+    assert result is None
+    assert isinstance(error, KeyError)
+    assert (record.status, record.error) == ('failed', 'KeyError')
+    assert record.forbidden == 1
+
+
+def test_not_tracking():
+    # outside track() responses are not logged anywhere
+    telemetry.log_request(_response(200), 0.1)
+    assert telemetry._REQUEST_LOG.get() is None
+
+
+def test_summary():
+    result = telemetry.BulkResult()
+    for i, (status, latency) in enumerate([(200, 1.0), (200, 2.0),
+                                           (403, 3.0), (200, 4.0)]):
+        result.add(telemetry.KeyResult(
+            i, 'blocked' if status == 403 else 'ok', status, latency,
+            latency, 1, 0, int(status == 403), None, None))
+    result.skipped(4)
+    summary = result.summary()
+    assert (summary['ok'], summary['blocked'], summary['skipped']) == (3, 1, 1)
+    assert summary['requests'] == 4
+    assert summary['rate_403'] == 0.25
+    assert summary['p50_latency'] == 2.5
+    assert 3.0 < summary['p95_latency'] <= 4.0
+    assert result.failures == [2]
+    assert len(result.to_frame()) == 5
+    assert 'BulkResult(5 keys' in repr(result)
+
+
+def test_extend_prefixes_keys():
+    season = telemetry.BulkResult()
+    season.skipped(167)
+    result = telemetry.BulkResult()
+    result.extend(season, (2022, 1))
+    assert result.records[0].key == (2022, 1, 167)
+
+
+def test_download_reports_blocked(generate_fake_session, monkeypatch):
+    def fake_team_results(school_id, season):
+        ncaa._get(f'''https://stats.ncaa.org/team/{school_id}/roster''')
+        if school_id % 7 == 0:
+            raise ValueError('no data')
+        return pd.DataFrame({'school_id': [school_id]})
+    monkeypatch.setattr(ncaa, 'ncaa_team_results', fake_team_results)
+    res, result = download_utils.download_team_results(
+        2022, division=1, save=False, max_workers=4, rate=None)
+    frame = result.to_frame()
+    schools = download_utils._division_school_ids(1)
+    assert list(frame.key) == list(schools)
+    assert (frame.requests == 1).all()
+    failed = frame.loc[frame.status == 'failed']
+    assert (failed.key % 7 == 0).all()
+    assert set(failed.error) == {'ValueError'}
+    blocked = frame.loc[frame.status == 'blocked']
+    assert (blocked.key % 5 == 0).all()
+    assert (blocked.http_status == 403).all()
+    assert len(failed) + len(blocked) == len(result.failures)
+    summary = result.summary()
+    assert summary['rate_403'] == (frame.http_status == 403).mean()
+    assert summary['errors'] == {'ValueError': len(failed)}
+    assert summary['requests_per_second'] > 0
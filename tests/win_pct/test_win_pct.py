@@ -0,0 +1,60 @@
+from collegebaseball import games, win_pct
+import pandas as pd
+import pytest
+
+
+@ pytest.fixture()
+def generate_games():
+    return pd.DataFrame({
+        'school': ['Cornell'] * 4 + ['Harvard'] * 2 + ['Yale'],
+        'season': [2019, 2019, 2019, 2020, 2019, 2019, 2019],
+        'runs_scored': [5, 2, 3, 4, 1, 6, None],
+        'runs_allowed': [1, 2, 7, 4, 1, 6, 3]})
+
+
+def test_league_matches_single_team():
+    league = win_pct.calculate_league_win_pcts()
+    for school, season in [('Cornell', 2019), ('Texas', 2004),
+                           ('Stanford', 2021)]:
+        team = games.team_results(school, season)
+        row = league.loc[(league.school == school)
+                         & (league.season == season)].iloc[0]
+        actual, wins, ties, losses = win_pct.calculate_actual_win_pct(team)
+        expected, difference = win_pct.calculate_pythagenpat_win_pct(team)
+        assert (row.wins, row.ties, row.losses) == (wins, ties, losses)
+        assert row.games == len(team)
+        assert row.win_pct == pytest.approx(actual, abs=1e-3)
+        assert row.pythagenpat_win_pct == pytest.approx(expected, abs=1e-3)
+        assert row.run_difference == difference
+
+
+def test_league_ties_and_missing_scores(generate_games):
+    res = win_pct.calculate_league_win_pcts(generate_games)
+    assert list(res.columns) == ['school', 'season'] + \
+        win_pct._LEAGUE_COLUMNS
+    assert res[['school', 'season']].values.tolist() == [
+        ['Cornell', 2019], ['Cornell', 2020], ['Harvard', 2019]]
+    cornell = res.iloc[0]
+    assert (cornell.games, cornell.wins, cornell.ties, cornell.losses) == \
+        (3, 1, 1, 1)
+    assert cornell.win_pct == 0.5
+    # all ties
+    assert res.iloc[1].win_pct == 0
+    assert res.iloc[2].ties == 2
+
+
+def test_league_empty(generate_games):
+    res = win_pct.calculate_league_win_pcts(generate_games.iloc[:0])
+    assert res.empty
+    assert list(res.columns) == ['school', 'season'] + \
+        win_pct._LEAGUE_COLUMNS
+
+
+def test_single_team_edge_cases(generate_games):
+    generate_games['run_difference'] = (generate_games.runs_scored
+                                        - generate_games.runs_allowed)
+    assert win_pct.calculate_actual_win_pct(pd.DataFrame()) == (0, 0, 0, 0)
+    assert win_pct.calculate_pythagenpat_win_pct(pd.DataFrame()) == (0, 0)
+    ties = generate_games.iloc[[3]]
+    assert win_pct.calculate_actual_win_pct(ties) == (0, 0, 1, 0)
+    assert win_pct.calculate_pythagenpat_win_pct(ties) == (0.5, 0)